@@ -0,0 +1,207 @@
+#
+
+__title__ = "hfc background import"
+__author__ = "John Wang"
+
+## @package hfcBackground
+#  \ingroup FEM
+#  \brief imports which keep the FreeCAD GUI responsive
+#
+#  An import is split into its read, which parses the file and builds the
+#  FemMesh, and its make, which adds the result mesh and result objects to
+#  the document and recomputes it. With the GUI up the read runs in a
+#  worker thread while a progress bar with a cancel button is shown in the
+#  status bar, a timer in the main thread polls the worker and runs the
+#  make there once the read is done, document objects are only touched by
+#  the main thread. The imports are run one after the other in the order
+#  they were started. Without the GUI, or without ENABLED, both run at once
+#  in the calling thread like before.
+#
+#  importSU2Mesh.open("wing.su2")  # returns at once in the GUI
+#  hfcBackground.ENABLED = False   # open() returns when the objects are made
+
+import os
+import threading
+import traceback
+
+import FreeCAD
+from FreeCAD import Console
+
+
+# open() and insert() of the importers read in a worker thread when the GUI is up
+ENABLED = True
+# milliseconds between two looks of the main thread at the worker
+POLL_INTERVAL = 100
+
+# the imports started and not done yet, the first one is running
+_jobs = []
+
+
+def run(name, filename, doc, read, make):
+    """import filename into doc, in the background when the GUI is up
+
+    read(filename, profile) runs in the worker thread and returns the data
+    of make(doc, data, profile), which runs in the main thread. a cancelled
+    import leaves doc as it was. returns the BackgroundImport, None if the
+    import was done at once
+    """
+    from . import hfcProfile
+    from . import hfcProgress
+
+    if not (ENABLED and FreeCAD.GuiUp):
+        profile = hfcProfile.start(name, filename)
+        try:
+            make(doc, read(filename, profile), profile)
+        except hfcProgress.Cancelled:
+            Console.PrintMessage("Import of {} cancelled.\n".format(filename))
+        finally:
+            profile.finish()
+        return None
+    job = BackgroundImport(name, filename, doc, read, make)
+    _jobs.append(job)
+    if len(_jobs) == 1:
+        job.start()
+    return job
+
+
+def running():
+    "the imports started and not done yet"
+    return list(_jobs)
+
+
+class BackgroundImport(object):
+    """one import with its read in a worker thread
+
+    cancel() may be called at any time, an import waiting for the one
+    before it is dropped, a running read stops at its next progress report
+    """
+
+    def __init__(self, name, filename, doc, read, make):
+        from . import hfcProgress
+
+        self.name = name
+        self.filename = filename
+        self.doc = doc
+        self.read = read
+        self.make = make
+        self.progress = hfcProgress.Progress()
+        self.data = None
+        self.error = None
+        self.done = False
+        self.thread = None
+
+    def start(self):
+        from PySide import QtCore
+        from . import hfcProfile
+
+        # the profile is current in the worker and in _make only, not in
+        # the main thread while the worker runs
+        with hfcProfile.profiling(hfcProfile.current()):
+            self.profile = hfcProfile.start(self.name, self.filename)
+        self.bar = ProgressBar(self.progress, self.filename)
+        self.thread = threading.Thread(
+            target=self._read, name="{} {}".format(self.name, os.path.basename(self.filename))
+        )
+        self.thread.daemon = True
+        self.timer = QtCore.QTimer()
+        self.timer.timeout.connect(self._poll)
+        self.thread.start()
+        self.timer.start(POLL_INTERVAL)
+
+    def cancel(self):
+        self.progress.cancel()
+        if self.thread is None and self in _jobs:
+            _jobs.remove(self)
+            self.done = True
+            Console.PrintMessage("Import of {} cancelled.\n".format(self.filename))
+
+    def _read(self):
+        "the worker thread"
+        from . import hfcProfile
+        from . import hfcProgress
+
+        try:
+            with hfcProgress.reporting(self.progress), hfcProfile.profiling(self.profile):
+                self.data = self.read(self.filename, self.profile)
+        except Exception as e:
+            self.error = (e, traceback.format_exc())
+
+    def _poll(self):
+        "the timer in the main thread"
+        if self.thread.is_alive():
+            self.bar.update()
+            return
+        self.timer.stop()
+        self.bar.close()
+        try:
+            self._make()
+        finally:
+            # also a failed or cancelled import ends its profile
+            self.profile.finish()
+            self.done = True
+            _jobs.remove(self)
+            if _jobs:
+                _jobs[0].start()
+
+    def _make(self):
+        from . import hfcProfile
+        from . import hfcProgress
+
+        if self.error is not None:
+            e, trace = self.error
+            if isinstance(e, hfcProgress.Cancelled):
+                Console.PrintMessage("Import of {} cancelled.\n".format(self.filename))
+            else:
+                Console.PrintError("Import of {} failed:\n{}".format(self.filename, trace))
+            return
+        if self.doc not in FreeCAD.listDocuments().values():
+            Console.PrintWarning(
+                "Import of {} dropped, its document was closed.\n".format(self.filename)
+            )
+            return
+        try:
+            with hfcProgress.reporting(self.progress), hfcProfile.profiling(self.profile):
+                self.make(self.doc, self.data, self.profile)
+        except hfcProgress.Cancelled:
+            Console.PrintMessage("Import of {} cancelled.\n".format(self.filename))
+        except Exception:
+            Console.PrintError(
+                "Import of {} failed:\n{}".format(self.filename, traceback.format_exc())
+            )
+        # the mesh arrays and the FemMesh are in the document now
+        self.data = None
+
+
+class ProgressBar(object):
+    "a progress bar and a cancel button in the status bar of the main window"
+
+    def __init__(self, progress, filename):
+        import FreeCADGui
+        from PySide import QtGui
+
+        self.progress = progress
+        self.name = os.path.basename(filename)
+        self.status = FreeCADGui.getMainWindow().statusBar()
+        self.bar = QtGui.QProgressBar()
+        self.bar.setRange(0, 1000)
+        self.bar.setFormat("{} %p%".format(self.name))
+        self.bar.setMaximumWidth(300)
+        self.button = QtGui.QPushButton("Cancel")
+        self.button.setToolTip("Cancel the import of {}".format(self.name))
+        self.button.clicked.connect(progress.cancel)
+        self.status.addPermanentWidget(self.bar)
+        self.status.addPermanentWidget(self.button)
+
+    def update(self):
+        progress = self.progress
+        self.bar.setValue(int(progress.fraction * 1000))
+        message = "Import {}: {}".format(self.name, progress.message or "reading")
+        if progress.rate:
+            message += ", {:.0f} items/s".format(progress.rate)
+        self.status.showMessage(message)
+
+    def close(self):
+        self.status.clearMessage()
+        for widget in (self.bar, self.button):
+            self.status.removeWidget(widget)
+            widget.deleteLater()
@@ -0,0 +1,259 @@
+#
+
+__title__ = "hfc batch conversion"
+__author__ = "John Wang"
+
+## @package hfcBatch
+#  \ingroup FEM
+#  \brief convert many solver files without the GUI
+#
+#  The inputs are given as paths or glob patterns, the reader is chosen by
+#  the file name and the files are converted in a process pool. Every file
+#  is written to the output directory as .npz of its nodes, elements and
+#  results (hfcCache.read loads it back) or as a FreeCAD document with the
+#  result mesh and result objects. A file which fails is reported, the
+#  batch goes on.
+#
+#  FreeCADCmd -c "from feminout import hfcBatch; hfcBatch.main(['-o', 'out', 'runs/*.out'])"
+#  python -m feminout.hfcBatch -o out "runs/*.out" "meshes/*.su2"
+#  with the FreeCAD lib directory in PYTHONPATH
+
+import glob
+import os
+import sys
+import time
+
+
+# file formats, the reader of the file and the importer writing documents
+FORMATS = {
+    "SU2": ("importSU2Mesh", "read_SU2_mesh", "importSU2Mesh"),
+    "Elmer": ("importElmerMesh", "read_Elmer_mesh", "importElmerMesh"),
+    "Frame3DD": ("importFrame3DDResults", "read_Frame3DD_result", "importFrame3DD"),
+    "Frame3DDCase": ("importFrame3DDCase", "read_Frame3DD_case", "importFrame3DDCase"),
+}
+
+OUTPUT_FORMATS = ("npz", "FCStd")
+
+
+def file_format(path):
+    "the FORMATS name of the reader of path, None if no reader knows it"
+    from .hfcIO import plain_name
+
+    # a compressed file is read like the file without the suffix
+    name = os.path.basename(plain_name(path)).lower()
+    ext = os.path.splitext(name)[1]
+    if ext == ".su2":
+        return "SU2"
+    if ext == ".out":
+        return "Frame3DD"
+    if ext == ".3dd":
+        return "Frame3DDCase"
+    if name == "mesh.header" or (name.startswith("part.") and ext == ".header"):
+        return "Elmer"
+    return None
+
+
+def expand(patterns):
+    """the input files of the paths and glob patterns, in the given order
+
+    an Elmer mesh directory stands for its mesh.header, an ElmerGrid
+    partitioning.N directory for its part.1.header. a .3dd file next
+    to the .out file of the same run is left out, the .out holds its
+    nodes and members together with the results
+    """
+    from .hfcIO import find_input, plain_name
+
+    inputs = []
+    for pattern in patterns:
+        found = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        for path in found:
+            if os.path.isdir(path):
+                for header in ("mesh.header", "part.1.header"):
+                    header = find_input(os.path.join(path, header))
+                    if os.path.isfile(header):
+                        path = header
+            if path not in inputs:
+                inputs.append(path)
+    outs = {os.path.splitext(plain_name(path))[0] for path in inputs if file_format(path) == "Frame3DD"}
+    return [
+        path for path in inputs
+        if not (file_format(path) == "Frame3DDCase" and os.path.splitext(plain_name(path))[0] in outs)
+    ]
+
+
+def output_path(path, out_dir, out_format):
+    "the output file of the input path, Elmer meshes are named by their directory"
+    from .hfcIO import plain_name
+
+    name = os.path.splitext(os.path.basename(plain_name(path)))[0]
+    if file_format(path) == "Elmer":
+        name = os.path.basename(os.path.dirname(os.path.abspath(path))) or name
+    if out_dir is None:
+        out_dir = os.path.dirname(os.path.abspath(path))
+    return os.path.join(out_dir, name + "." + out_format)
+
+
+def read(path, fmt=None):
+    "parse path with the reader of its format, returns a hfcMesh.MeshData"
+    import importlib
+
+    fmt = fmt or file_format(path)
+    module, reader, importer = FORMATS[fmt]
+    module = importlib.import_module("." + module, __package__)
+    # the files are spread over the batch processes, a reader makes no pool of its own
+    if fmt == "Elmer":
+        # volume elements, not the boundary
+        return getattr(module, reader)(path, 0, processes=1)
+    if fmt == "SU2":
+        # with the solutions next to the mesh, like the importer
+        return getattr(module, reader)(path, processes=1, solutions=module.su2_solution_files(path))
+    return getattr(module, reader)(path)
+
+
+def convert(path, out_dir=None, out_format="npz"):
+    """convert one input file, the work of one pool process
+
+    returns a report dict of input, format, output, seconds, nodes,
+    elements, results and error, error is None if all went well
+    """
+    report = {
+        "input": path, "format": file_format(path), "output": None,
+        "seconds": 0.0, "nodes": 0, "elements": 0, "results": 0, "error": None,
+    }
+    start = time.time()
+    try:
+        if report["format"] is None:
+            raise ValueError("no reader for {}".format(path))
+        output = output_path(path, out_dir, out_format)
+        if out_format == "npz":
+            from . import hfcCache
+            m = read(path, report["format"])
+            if not m.node_count:
+                raise ValueError("no nodes found")
+            hfcCache.write(output, m)
+            report["nodes"] = m.node_count
+            report["elements"] = m.element_count
+            report["results"] = len(m.results)
+        else:
+            write_document(path, report["format"], output, report)
+        report["output"] = output
+    except Exception as e:
+        report["error"] = "{}: {}".format(type(e).__name__, e)
+    report["seconds"] = time.time() - start
+    return report
+
+
+def write_document(path, fmt, output, report):
+    "import path into a new FreeCAD document with its importer and save it as output"
+    import importlib
+    import FreeCAD
+
+    module, reader, importer = FORMATS[fmt]
+    module = importlib.import_module("." + module, __package__)
+    doc = FreeCAD.newDocument(os.path.splitext(os.path.basename(output))[0])
+    try:
+        FreeCAD.ActiveDocument = doc
+        getattr(module, importer)(path)
+        for obj in doc.Objects:
+            if obj.isDerivedFrom("Fem::FemResultObject"):
+                report["results"] += 1
+            elif obj.isDerivedFrom("Fem::FemMeshObject"):
+                report["nodes"] += obj.FemMesh.NodeCount
+                report["elements"] += obj.FemMesh.ElementCount
+        doc.saveAs(output)
+    finally:
+        FreeCAD.closeDocument(doc.Name)
+
+
+def run(inputs, out_dir=None, out_format="npz", processes=None, log=None):
+    """convert the input files in a pool of processes
+
+    processes None is one per CPU, one under FreeCADCmd. log is called
+    with the report of every file when it is done, returns the reports
+    in the order of inputs
+    """
+    if out_format not in OUTPUT_FORMATS:
+        raise ValueError("output format {} is not one of {}".format(out_format, OUTPUT_FORMATS))
+    if out_dir is not None and not os.path.isdir(out_dir):
+        os.makedirs(out_dir)
+
+    from .hfcIO import in_freecad, process_pool
+
+    if processes is None:
+        # a pool is what the batch is for, the readers only make one on request
+        processes = 1 if in_freecad() else 0
+    reports = {}
+    pool = process_pool(processes) if len(inputs) > 1 else None
+    if pool is None:
+        for path in inputs:
+            reports[path] = convert(path, out_dir, out_format)
+            if log:
+                log(reports[path])
+    else:
+        from concurrent.futures import as_completed
+        # a process works on one file at a time, one process per file would
+        # start FreeCAD over and over
+        with pool:
+            futures = {pool.submit(convert, path, out_dir, out_format): path for path in inputs}
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    reports[path] = future.result()
+                except Exception as e:
+                    # the process died, like a crash in FreeCAD
+                    reports[path] = {
+                        "input": path, "format": file_format(path), "output": None,
+                        "seconds": 0.0, "nodes": 0, "elements": 0, "results": 0,
+                        "error": "{}: {}".format(type(e).__name__, e),
+                    }
+                if log:
+                    log(reports[path])
+    return [reports[path] for path in inputs]
+
+
+def print_report(report):
+    if report["error"]:
+        sys.stdout.write("FAILED {input} ({seconds:.2f} s): {error}\n".format(**report))
+    else:
+        sys.stdout.write(
+            "ok     {input} -> {output} ({seconds:.2f} s, {nodes} nodes, "
+            "{elements} elements, {results} results)\n".format(**report)
+        )
+    sys.stdout.flush()
+
+
+def main(argv=None):
+    "command line entry, returns 0 if all files were converted, 1 otherwise"
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(
+        prog="hfcBatch",
+        description="convert SU2, Elmer and Frame3DD files without the FreeCAD GUI",
+    )
+    parser.add_argument("inputs", nargs="+", help="input files, directories or glob patterns")
+    parser.add_argument("-o", "--output", default=None, help="output directory, default next to the inputs")
+    parser.add_argument("-f", "--format", default="npz", choices=OUTPUT_FORMATS, help="output file format")
+    parser.add_argument("-j", "--processes", type=int, default=None, help="number of processes, 0 one per CPU, default one per CPU and one under FreeCADCmd")
+    parser.add_argument("--report", default=None, help="write the reports of all files as JSON to this file")
+    args = parser.parse_args(argv)
+
+    inputs = expand(args.inputs)
+    if not inputs:
+        sys.stderr.write("no input files\n")
+        return 1
+    start = time.time()
+    reports = run(inputs, args.output, args.format, args.processes, log=print_report)
+    failed = [report for report in reports if report["error"]]
+    sys.stdout.write(
+        "{} files, {} failed, {:.2f} s\n"
+        .format(len(reports), len(failed), time.time() - start)
+    )
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(reports, f, indent=1)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
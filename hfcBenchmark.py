@@ -0,0 +1,567 @@
+#
+
+__title__ = "hfc reader benchmarks"
+__author__ = "John Wang"
+
+## @package hfcBenchmark
+#  \ingroup FEM
+#  \brief synthetic meshes and timing of the hfc readers
+#
+#  The generators write SU2, Elmer and Frame3DD files of a given number of
+#  nodes. The files of the same arguments are the same on every run, so
+#  the timings of different versions can be compared. Every reader is
+#  timed for nodes/s, elements/s and MB/s and measured for its peak
+#  memory, the results are written as JSON.
+#
+#  python -m feminout.hfcBenchmark --nodes 100000 --json bench.json
+#  with the FreeCAD lib directory in PYTHONPATH
+
+import os
+import sys
+import time
+
+import numpy as np
+
+
+# rows formatted by one % operation each
+WRITE_ROWS = 1 << 16
+
+# element lists of hfcMesh to the Elmer type codes
+ELMER_CODES = {
+    "Seg2Elem": 202,
+    "Tria3Elem": 303,
+    "Quad4Elem": 404,
+    "Tetra4Elem": 504,
+    "Pyra5Elem": 605,
+    "Penta6Elem": 706,
+    "Hexa8Elem": 808,
+}
+# element lists of hfcMesh to the VTK types of SU2
+SU2_CODES = {
+    "Seg2Elem": 3,
+    "Tria3Elem": 5,
+    "Quad4Elem": 9,
+    "Tetra4Elem": 10,
+    "Hexa8Elem": 12,
+    "Penta6Elem": 13,
+    "Pyra5Elem": 14,
+}
+
+# the cells of a grid split into elements, corners numbered as VTK hexahedron
+HEXA_SPLIT = {
+    "Hexa8Elem": [(0, 1, 2, 3, 4, 5, 6, 7)],
+    "Penta6Elem": [(0, 1, 3, 4, 5, 7), (1, 2, 3, 5, 6, 7)],
+    "Tetra4Elem": [(0, 1, 3, 4), (1, 2, 3, 6), (1, 4, 5, 6), (3, 4, 6, 7), (1, 3, 4, 6)],
+    # three pyramids over the faces away from corner 4
+    "Pyra5Elem": [(0, 1, 2, 3, 4), (1, 2, 6, 5, 4), (2, 3, 7, 6, 4)],
+}
+QUAD_SPLIT = {
+    "Quad4Elem": [(0, 1, 2, 3)],
+    "Tria3Elem": [(0, 1, 2), (0, 2, 3)],
+}
+
+
+# ********* grids *********
+def grid_shape(nodes, dim=3):
+    "number of nodes along each axis of a grid of about nodes nodes"
+    n = max(2, int(round(nodes ** (1.0 / dim))))
+    return (n,) * dim
+
+
+def grid(shape, seed=0):
+    """nodes and cells of a structured grid
+
+    the inner nodes are moved a bit by a seeded random generator, so the
+    coordinates have all their digits. returns the (N,3) coordinates and
+    the (C,8) hexahedron or (C,4) quadrilateral cells of 0 based nodes
+    """
+    dim = len(shape)
+    axes = [np.arange(n, dtype=np.float64) for n in shape]
+    mesh = np.meshgrid(*axes, indexing="ij")
+    coords = np.zeros((mesh[0].size, 3))
+    for d in range(dim):
+        coords[:, d] = mesh[d].ravel()
+    coords += np.random.RandomState(seed).uniform(-0.1, 0.1, coords.shape)
+    if dim == 2:
+        coords[:, 2] = 0.0
+
+    index = np.arange(coords.shape[0]).reshape(shape)
+    if dim == 2:
+        i, j = [a.ravel() for a in np.meshgrid(*[np.arange(n - 1) for n in shape], indexing="ij")]
+        cells = np.stack([index[i, j], index[i + 1, j], index[i + 1, j + 1], index[i, j + 1]], axis=1)
+    else:
+        i, j, k = [a.ravel() for a in np.meshgrid(*[np.arange(n - 1) for n in shape], indexing="ij")]
+        bottom = [index[i, j, k], index[i + 1, j, k], index[i + 1, j + 1, k], index[i, j + 1, k]]
+        top = [index[i, j, k + 1], index[i + 1, j, k + 1], index[i + 1, j + 1, k + 1], index[i, j + 1, k + 1]]
+        cells = np.stack(bottom + top, axis=1)
+    return coords, cells
+
+
+def split_cells(cells, mixed=True):
+    """the elements of the cells, {name: (M,k) 0 based connectivity}
+
+    with mixed the cells take turns in the element kinds
+    """
+    split = HEXA_SPLIT if cells.shape[1] == 8 else QUAD_SPLIT
+    names = list(split) if mixed else list(split)[:1]
+    kind = np.arange(len(cells)) % len(names)
+    elements = {}
+    for n, name in enumerate(names):
+        own = cells[kind == n]
+        elements[name] = np.concatenate([own[:, list(corners)] for corners in split[name]])
+    return elements
+
+
+def boundary_faces(cells, shape):
+    "the faces at the first layer of the grid, quadrilaterals in 3D and lines in 2D"
+    if cells.shape[1] == 8:
+        first = cells[::shape[2] - 1]
+        return "Quad4Elem", first[:, :4]
+    first = cells[::shape[1] - 1]
+    return "Seg2Elem", first[:, [0, 1]]
+
+
+def write_rows(f, fmt, rows):
+    "write the rows of a 2D array with the row format fmt"
+    rows = np.asarray(rows)
+    for start in range(0, len(rows), WRITE_ROWS):
+        chunk = rows[start:start + WRITE_ROWS]
+        f.write((fmt * len(chunk)) % tuple(chunk.ravel().tolist()))
+
+
+def row_format(*columns):
+    return " ".join(columns) + "\n"
+
+
+# ********* generators *********
+def write_su2(path, nodes, dim=3, zones=1, mixed=True, seed=0):
+    """write a SU2 mesh of zones grids of about nodes nodes each
+
+    the cells are split into all element kinds of dim with mixed, the
+    first layer of faces is the marker "wall". returns path
+    """
+    shape = grid_shape(nodes, dim)
+    with open(path, "w") as f:
+        if zones > 1:
+            f.write("NZONE= {}\n".format(zones))
+        for zone in range(zones):
+            coords, cells = grid(shape, seed + zone)
+            elements = split_cells(cells, mixed)
+            if zones > 1:
+                f.write("IZONE= {}\n".format(zone + 1))
+            f.write("% synthetic mesh, zone {}\n".format(zone + 1))
+            f.write("NDIME= {}\n".format(dim))
+            f.write("NELEM= {}\n".format(sum(len(conn) for conn in elements.values())))
+            count = 0
+            for name, conn in elements.items():
+                rows = np.empty((len(conn), conn.shape[1] + 2), np.int64)
+                rows[:, 0] = SU2_CODES[name]
+                rows[:, 1:-1] = conn
+                rows[:, -1] = count + np.arange(len(conn))
+                count += len(conn)
+                write_rows(f, row_format(*["%d"] * rows.shape[1]), rows)
+            f.write("NPOIN= {}\n".format(len(coords)))
+            rows = np.column_stack((coords[:, :dim], np.arange(len(coords))))
+            write_rows(f, row_format(*(["%.12g"] * dim + ["%d"])), rows)
+            name, faces = boundary_faces(cells, shape)
+            f.write("NMARK= 1\nMARKER_TAG= wall\nMARKER_ELEMS= {}\n".format(len(faces)))
+            rows = np.column_stack((np.full(len(faces), SU2_CODES[name]), faces))
+            write_rows(f, row_format(*["%d"] * rows.shape[1]), rows)
+    return path
+
+
+def write_elmer(directory, nodes, dim=3, mixed=True, seed=0):
+    """write an Elmer mesh directory with mesh.header, nodes, elements, boundary
+
+    returns the path of mesh.header
+    """
+    shape = grid_shape(nodes, dim)
+    coords, cells = grid(shape, seed)
+    elements = split_cells(cells, mixed)
+    face_name, faces = boundary_faces(cells, shape)
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    prefix = os.path.join(directory, "mesh.")
+
+    with open(prefix + "nodes", "w") as f:
+        rows = np.column_stack((np.arange(1, len(coords) + 1), np.full(len(coords), -1), coords))
+        write_rows(f, row_format("%d", "%d", "%.12g", "%.12g", "%.12g"), rows)
+
+    count = 0
+    with open(prefix + "elements", "w") as f:
+        for name, conn in elements.items():
+            rows = np.empty((len(conn), conn.shape[1] + 3), np.int64)
+            rows[:, 0] = count + 1 + np.arange(len(conn))
+            rows[:, 1] = 1
+            rows[:, 2] = ELMER_CODES[name]
+            rows[:, 3:] = conn + 1
+            count += len(conn)
+            write_rows(f, row_format(*["%d"] * rows.shape[1]), rows)
+
+    with open(prefix + "boundary", "w") as f:
+        rows = np.empty((len(faces), faces.shape[1] + 5), np.int64)
+        rows[:, 0] = 1 + np.arange(len(faces))
+        rows[:, 1] = 1
+        rows[:, 2] = rows[:, 0]
+        rows[:, 3] = 0
+        rows[:, 4] = ELMER_CODES[face_name]
+        rows[:, 5:] = faces + 1
+        write_rows(f, row_format(*["%d"] * rows.shape[1]), rows)
+
+    with open(prefix + "header", "w") as f:
+        f.write("{} {} {}\n".format(len(coords), count, len(faces)))
+        f.write("{}\n".format(len(elements) + 1))
+        for name, conn in elements.items():
+            f.write("{} {}\n".format(ELMER_CODES[name], len(conn)))
+        f.write("{} {}\n".format(ELMER_CODES[face_name], len(faces)))
+    return prefix + "header"
+
+
+def frame(nodes, seed=0):
+    """nodes and members of a 3D frame of about nodes nodes
+
+    the members join the neighbours of a grid along x, y and z,
+    the nodes of the lowest layer are fixed. returns the coordinates,
+    the (M,2) 0 based members and the 0 based fixed nodes
+    """
+    shape = grid_shape(nodes, 3)
+    coords, cells = grid(shape, seed)
+    coords *= 100.0
+    index = np.arange(len(coords)).reshape(shape)
+    members = []
+    for axis in range(3):
+        low = [slice(None)] * 3
+        high = [slice(None)] * 3
+        low[axis] = slice(0, -1)
+        high[axis] = slice(1, None)
+        members.append(np.column_stack((index[tuple(low)].ravel(), index[tuple(high)].ravel())))
+    members = np.concatenate(members)
+    return coords, members, index[:, :, 0].ravel()
+
+
+def write_frame3dd_case(path, nodes, loadcases=2, modes=2, seed=0):
+    """write a Frame3DD .3dd input file of a frame of about nodes nodes
+
+    every load case has gravity, nodal loads, uniform, trapezoidal,
+    internal point and temperature loads and a prescribed displacement,
+    modes > 0 adds the modal analysis. returns path
+    """
+    coords, members, fixed = frame(nodes, seed)
+    random = np.random.RandomState(seed)
+    n_members = len(members)
+    with open(path, "w") as f:
+        f.write("synthetic frame of {} nodes (N,mm,ton)\n\n".format(len(coords)))
+        f.write("# node data ...\n{}\t\t# number of nodes\n".format(len(coords)))
+        f.write("#.node  x       y       z       r\n")
+        rows = np.column_stack((np.arange(1, len(coords) + 1), coords, np.zeros(len(coords))))
+        write_rows(f, row_format("%d", "%.6f", "%.6f", "%.6f", "%.1f"), rows)
+
+        f.write("\n# reaction data ...\n{}\t\t# number of nodes with reactions\n".format(len(fixed)))
+        f.write("#.n     x  y  z xx yy zz          1=fixed, 0=free\n")
+        rows = np.column_stack((fixed + 1, np.ones((len(fixed), 6))))
+        write_rows(f, row_format(*["%d"] * 7), rows)
+
+        f.write("\n# frame element data ...\n{}\t\t# number of frame elements\n".format(n_members))
+        f.write("#.e n1 n2 Ax    Asy     Asz     Jx     Iy     Iz     E       G   roll density\n")
+        rows = np.column_stack((
+            np.arange(1, n_members + 1), members + 1,
+            np.tile([36.0, 20.0, 20.0, 1000.0, 492.0, 492.0, 200000.0, 79300.0, 0.0, 7.85e-9], (n_members, 1)),
+        ))
+        write_rows(f, row_format(*["%d"] * 3 + ["%.6g"] * 10), rows)
+
+        f.write("\n1\t\t# 1: include shear deformation\n")
+        f.write("1\t\t# 1: include geometric stiffness\n")
+        f.write("10.0\t\t# exaggerate static mesh deformations\n")
+        f.write("2.5\t\t# zoom scale for 3D plotting\n")
+        f.write("-1.0\t\t# x-axis increment for internal forces\n\n")
+
+        f.write("{}\t\t# number of static load cases\n".format(loadcases))
+        loaded = np.arange(len(fixed), len(coords))
+        some = np.arange(0, n_members, max(1, n_members // 10))
+        for case in range(loadcases):
+            f.write("\t\t\t# Begin Static Load Case {} of {}\n".format(case + 1, loadcases))
+            f.write("# gravitational acceleration for self-weight loading (global)\n")
+            f.write("0\t0\t-9806.33\n\n")
+            f.write("{}\t\t# number of loaded nodes\n".format(len(loaded)))
+            rows = np.column_stack((loaded + 1, random.uniform(-100.0, 100.0, (len(loaded), 6))))
+            write_rows(f, row_format("%d", *["%.4f"] * 6), rows)
+            f.write("{}\t\t# number of uniform loads\n".format(len(some)))
+            rows = np.column_stack((some + 1, random.uniform(-1.0, 1.0, (len(some), 3))))
+            write_rows(f, row_format("%d", *["%.4f"] * 3), rows)
+            f.write("{}\t\t# number of trapezoidal loads\n".format(len(some)))
+            for member in (some + 1).tolist():
+                f.write("{}\t0 50 -1 -2\n\t0 0 0 0\n\t0 0 0 0\n".format(member))
+            f.write("{}\t\t# number of internal concentrated loads\n".format(len(some)))
+            rows = np.column_stack((some + 1, random.uniform(-10.0, 10.0, (len(some), 3)), np.full(len(some), 50.0)))
+            write_rows(f, row_format("%d", *["%.4f"] * 4), rows)
+            f.write("{}\t\t# number of temperature loads\n".format(len(some)))
+            rows = np.column_stack((some + 1, np.tile([1.2e-5, 10.0, 10.0, 20.0, 10.0, 20.0, 10.0], (len(some), 1))))
+            write_rows(f, row_format("%d", *["%.6g"] * 7), rows)
+            f.write("1\t\t# number of nodes with prescribed displacements\n")
+            f.write("{}\t0 0 -0.1 0 0 0\n".format(fixed[0] + 1))
+            f.write("\t\t\t# End   Static Load Case {} of {}\n\n".format(case + 1, loadcases))
+
+        f.write("{}\t\t# number of desired dynamic modes of vibration\n".format(modes))
+        if modes:
+            f.write("1\t\t# 1: subspace Jacobi     2: Stodola\n")
+            f.write("0\t\t# 0: consistent mass ... 1: lumped mass matrix\n")
+            f.write("1e-9\t\t# mode shape tolerance\n")
+            f.write("0.0\t\t# shift value ... for unrestrained structures\n")
+            f.write("10.0\t\t# exaggerate modal mesh deformations\n")
+            f.write("1\t\t# number of nodes with extra inertia\n")
+            f.write("#.n      Mass   Ixx      Iyy      Izz\n")
+            f.write("{}\t0.1 0 0 0\n".format(len(coords)))
+            f.write("0\t\t# frame elements with extra mass\n")
+            f.write("{}\t\t# number of modes to animate, nA\n".format(modes))
+            f.write(" ".join(str(mode + 1) for mode in range(modes)) + "\t# list of modes to animate\n")
+            f.write("2\t\t# pan rate during animation\n")
+    return path
+
+
+def write_frame3dd_out(path, nodes, loadcases=2, modes=2, seed=0):
+    """write a Frame3DD .out result file of a frame of about nodes nodes
+
+    loadcases displacement tables of the elastic analysis and modes mode
+    shapes, the fixed nodes are left out of the elastic tables as Frame3DD
+    does. returns path
+    """
+    coords, members, fixed = frame(nodes, seed)
+    random = np.random.RandomState(seed)
+    n_nodes = len(coords)
+    n_members = len(members)
+    free = np.setdiff1d(np.arange(n_nodes), fixed)
+    line = "_" * 74 + "\n"
+    with open(path, "w") as f:
+        f.write(line + "FRAME3DD version: 20140514               http://frame3dd.sf.net/\n" + line)
+        f.write("synthetic frame of {} nodes\n".format(n_nodes) + line)
+        f.write("In 2D problems the Y-axis is vertical.  In 3D problems the Z-axis is vertical.\n" + line)
+        f.write("{:5d} NODES {:12d} FIXED NODES {:6d} FRAME ELEMENTS {:3d} LOAD CASES\n".format(
+            n_nodes, len(fixed), n_members, loadcases))
+        f.write("For 1st order analysis\n\n")
+
+        f.write("N O D E   D A T A                                            R E S T R A I N T S\n")
+        f.write("  Node       X              Y              Z         radius  Fx Fy Fz Mx My Mz\n")
+        restraint = np.zeros((n_nodes, 6))
+        restraint[fixed] = 1
+        rows = np.column_stack((np.arange(1, n_nodes + 1), coords, np.zeros(n_nodes), restraint))
+        write_rows(f, row_format("%5d", "%14.6f", "%14.6f", "%14.6f", "%8.3f", *["%2d"] * 6), rows)
+
+        f.write("F R A M E   E L E M E N T   D A T A\t\t\t\t\t(local)\n")
+        f.write("  Elmnt  J1    J2     Ax   Asy   Asz    Jx     Iy     Iz       E       G roll  density\n")
+        rows = np.column_stack((
+            np.arange(1, n_members + 1), members + 1,
+            np.tile([36.0, 20.0, 20.0, 1000.0, 492.0, 492.0, 200000.0, 79300.0, 0.0, 7.85e-9], (n_members, 1)),
+        ))
+        write_rows(f, row_format("%5d", "%5d", "%5d", *["%8.6g"] * 10), rows)
+        f.write("  Neglect shear deformations.\n  Neglect geometric stiffness.\n\n")
+
+        f.write("E L A S T I C   S T I F F N E S S   A N A L Y S I S   via  L D L'  decomposition\n\n")
+        force_rows = np.empty((2 * n_members, 8))
+        force_rows[:, 0] = np.repeat(np.arange(1, n_members + 1), 2)
+        force_rows[:, 1] = (members + 1).ravel()
+        for case in range(loadcases):
+            f.write("L O A D   C A S E {:3d}   O F {:3d}  ... \n\n".format(case + 1, loadcases))
+            f.write("N O D E   D I S P L A C E M E N T S  \t\t\t\t\t(global)\n")
+            f.write("  Node    X-dsp       Y-dsp       Z-dsp       X-rot       Y-rot       Z-rot\n")
+            rows = np.column_stack((free + 1, random.uniform(-0.01, 0.01, (len(free), 6))))
+            write_rows(f, row_format("%5d", *["%11.6f"] * 6), rows)
+            f.write("F R A M E   E L E M E N T   E N D   F O R C E S\t\t\t\t(local)\n")
+            f.write("  Elmnt  Node       Nx          Vy         Vz        Txx        Myy        Mzz\n")
+            force_rows[:, 2:] = random.uniform(-1000.0, 1000.0, (2 * n_members, 6))
+            write_rows(f, row_format("%5d", "%5d", *["%11.3f"] * 6), force_rows)
+            f.write("R E A C T I O N S\t\t\t\t\t\t\t(global)\n")
+            f.write("  Node        Fx          Fy          Fz          Mxx         Myy         Mzz\n")
+            rows = np.column_stack((fixed + 1, random.uniform(-1000.0, 1000.0, (len(fixed), 6))))
+            write_rows(f, row_format("%5d", *["%11.3f"] * 6), rows)
+            f.write("R M S    R E L A T I V E    E Q U I L I B R I U M    E R R O R: 1.169e-16\n\n")
+
+        if modes:
+            f.write("M O D A L   A N A L Y S I S   R E S U L T S\n")
+            f.write("  Total Mass:  1.0e-03\n")
+            for mode in range(modes):
+                frequency = 10.0 * (mode + 1)
+                f.write("  M O D E {:3d}:   f= {:f} Hz,  T= {:f} sec\n".format(mode + 1, frequency, 1.0 / frequency))
+                f.write("\t\tX- modal participation factor =   1.0e-01\n")
+                f.write("  Node    X-dsp       Y-dsp       Z-dsp       X-rot       Y-rot       Z-rot\n")
+                rows = np.column_stack((np.arange(1, n_nodes + 1), random.uniform(-1.0, 1.0, (n_nodes, 6))))
+                write_rows(f, row_format("%5d", *["%11.3e"] * 6), rows)
+            f.write("M A T R I X    I T E R A T I O N S: 3\n")
+    return path
+
+
+# ********* benchmarks *********
+def cases(directory, nodes, loadcases=2, modes=2):
+    """write the benchmark files of about nodes nodes into directory
+
+    files already written by the same arguments are taken over.
+    returns a list of (case name, reader, arguments of the reader)
+    """
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    def target(name):
+        path = os.path.join(directory, name)
+        return path, os.path.exists(path)
+
+    found = []
+    for dim in (2, 3):
+        for zones in (1, 4):
+            name = "su2_{}d_{}zone_{}.su2".format(dim, zones, nodes)
+            path, done = target(name)
+            if not done:
+                write_su2(path, nodes // zones, dim, zones)
+            found.append((name, "read_SU2_mesh", (path,)))
+    for dim in (2, 3):
+        name = "elmer_{}d_{}".format(dim, nodes)
+        header, done = target(os.path.join(name, "mesh.header"))
+        if not done:
+            write_elmer(os.path.join(directory, name), nodes, dim)
+        found.append((name, "read_Elmer_mesh", (header, 0)))
+    name = "frame3dd_{}_{}_{}".format(nodes, loadcases, modes)
+    path, done = target(name + ".3dd")
+    if not done:
+        write_frame3dd_case(path, nodes, loadcases, modes)
+    found.append((name + ".3dd", "read_Frame3DD_case", (path,)))
+    path, done = target(name + ".out")
+    if not done:
+        write_frame3dd_out(path, nodes, loadcases, modes)
+    found.append((name + ".out", "read_Frame3DD_result", (path,)))
+    return found
+
+
+READER_MODULES = {
+    "read_SU2_mesh": "importSU2Mesh",
+    "read_Elmer_mesh": "importElmerMesh",
+    "read_Frame3DD_case": "importFrame3DDCase",
+    "read_Frame3DD_result": "importFrame3DDResults",
+}
+# the readers which take the processes of a pool, see hfcIO.pool_processes
+POOL_READERS = ("read_SU2_mesh", "read_Elmer_mesh")
+
+
+def input_bytes(reader, args):
+    "size of the files a reader reads"
+    path = args[0]
+    if reader == "read_Elmer_mesh":
+        directory = os.path.dirname(path)
+        return sum(os.path.getsize(os.path.join(directory, "mesh." + name))
+                   for name in ("header", "nodes", "elements", "boundary"))
+    return os.path.getsize(path)
+
+
+def measure(reader, args, repeat=3, processes=1):
+    """time reader(*args), the best of repeat runs, and its peak memory
+
+    the SU2 and Elmer readers get processes, 1 times them without a pool.
+    the peak is taken by tracemalloc in one more run, so it does not
+    slow down the timed runs. the output of the reader is dropped
+    """
+    import contextlib
+    import importlib
+    import tracemalloc
+
+    module = importlib.import_module("." + READER_MODULES[reader], __package__)
+    function = getattr(module, reader)
+    kwargs = {"processes": processes} if reader in POOL_READERS else {}
+    seconds = cpu = float("inf")
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for run in range(repeat):
+            start, start_cpu = time.perf_counter(), time.process_time()
+            m = function(*args, **kwargs)
+            seconds = min(seconds, time.perf_counter() - start)
+            cpu = min(cpu, time.process_time() - start_cpu)
+            del m
+        tracemalloc.start()
+        m = function(*args, **kwargs)
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    size = input_bytes(reader, args)
+    return {
+        "reader": reader,
+        "processes": kwargs.get("processes"),
+        "bytes": size,
+        "nodes": m.node_count,
+        "elements": m.element_count,
+        "results": len(m.results),
+        "seconds": seconds,
+        "cpu_seconds": cpu,
+        "nodes_per_s": m.node_count / seconds if seconds else None,
+        "elements_per_s": m.element_count / seconds if seconds else None,
+        "mb_per_s": size / 1e6 / seconds if seconds else None,
+        "peak_bytes": peak,
+        "mesh_bytes": m.nbytes,
+    }
+
+
+def run(directory, nodes=(10000, 100000), loadcases=2, modes=2, repeat=3, only=None, log=None, processes=1):
+    """write the files and time the readers for every size in nodes
+
+    only is a list of reader names to time, None times all four.
+    processes goes to the SU2 and Elmer readers, see measure.
+    returns the report dict, which is written as JSON by main
+    """
+    import platform
+
+    report = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": [],
+    }
+    for size in nodes:
+        for name, reader, args in cases(directory, size, loadcases, modes):
+            if only and reader not in only:
+                continue
+            entry = {"case": name, "size": size}
+            entry.update(measure(reader, args, repeat, processes))
+            report["results"].append(entry)
+            if log:
+                log(entry)
+    return report
+
+
+def print_entry(entry):
+    sys.stderr.write(
+        "{case:32s} {seconds:8.3f} s {nodes_per_s:12.0f} nodes/s "
+        "{elements_per_s:12.0f} elements/s {mb_per_s:8.1f} MB/s "
+        "{peak_mb:8.1f} MB peak\n".format(peak_mb=entry["peak_bytes"] / 1e6, **entry)
+    )
+
+
+def main(argv=None):
+    "command line entry"
+    import argparse
+    import json
+    import tempfile
+
+    parser = argparse.ArgumentParser(prog="hfcBenchmark", description="time the hfc readers on synthetic files")
+    parser.add_argument("--nodes", type=int, nargs="+", default=[10000, 100000], help="sizes in nodes")
+    parser.add_argument("--loadcases", type=int, default=2, help="Frame3DD load cases")
+    parser.add_argument("--modes", type=int, default=2, help="Frame3DD modes")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs, the best is kept")
+    parser.add_argument("--reader", action="append", choices=sorted(READER_MODULES), help="time only this reader")
+    parser.add_argument("-j", "--processes", type=int, default=1,
+                        help="reader pool processes of the SU2 and Elmer readers, 0 one per CPU, default no pool")
+    parser.add_argument("--dir", default=os.path.join(tempfile.gettempdir(), "hfcBenchmark"),
+                        help="directory of the generated files, kept for the next run")
+    parser.add_argument("--json", default=None, help="write the report to this file, default stdout")
+    args = parser.parse_args(argv)
+
+    report = run(
+        args.dir, args.nodes, args.loadcases, args.modes, args.repeat, args.reader,
+        log=print_entry, processes=args.processes
+    )
+    text = json.dumps(report, indent=1)
+    if args.json:
+        with open(args.json, "w") as f:
+            f.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+#
+
+__title__ = "hfc mesh cache"
+__author__ = "John Wang"
+
+## @package hfcCache
+#  \ingroup FEM
+#  \brief persistent cache of parsed meshes
+#
+#  A parsed MeshData is stored as one uncompressed .npz file, loading it
+#  back costs about one read of the arrays. The key covers the path, size,
+#  mtime and a content hash of every input file, so a changed file is
+#  parsed again. The cache is kept below CACHE_SIZE bytes by removing the
+#  least recently used entries.
+
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+
+import numpy as np
+
+
+# the readers use the cache when they are not told otherwise
+ENABLED = False
+# where the cache files go, None is a directory below the FreeCAD user data
+CACHE_DIR = None
+# size cap of all cache files in bytes
+CACHE_SIZE = 4 << 30
+# bytes of the content hash taken at the start, the middle and the end
+# of every file, a full hash would cost as much as reading the text
+HASH_SAMPLE = 1 << 20
+# bump when the stored layout changes
+CACHE_VERSION = 4
+
+
+def cache_dir():
+    if CACHE_DIR:
+        path = CACHE_DIR
+    else:
+        try:
+            import FreeCAD
+            path = os.path.join(FreeCAD.getUserAppDataDir(), "hfcCache")
+        except (ImportError, AttributeError):
+            path = os.path.join(os.path.expanduser("~"), ".cache", "hfcImporter")
+    if not os.path.isdir(path):
+        os.makedirs(path)
+    return path
+
+
+def content_hash(path):
+    "hash of the start, the middle and the end of a file"
+    h = hashlib.sha1()
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        for start in sorted({0, max(0, size // 2 - HASH_SAMPLE // 2), max(0, size - HASH_SAMPLE)}):
+            f.seek(start)
+            h.update(f.read(HASH_SAMPLE))
+    return h.hexdigest()
+
+
+def cache_key(paths, reader, options=()):
+    """key of the inputs paths read by reader with options
+
+    files which do not exist are part of the key as missing
+    """
+    h = hashlib.sha1()
+    h.update(repr((CACHE_VERSION, reader, tuple(options))).encode())
+    for path in paths:
+        path = os.path.abspath(path)
+        if os.path.exists(path):
+            st = os.stat(path)
+            h.update(repr((path, st.st_size, st.st_mtime_ns, content_hash(path))).encode())
+        else:
+            h.update(repr((path, None)).encode())
+    return h.hexdigest()
+
+
+def cache_file(key):
+    return os.path.join(cache_dir(), key + ".npz")
+
+
+def load(paths, reader, options=()):
+    "the cached MeshData of the inputs, None if not in the cache"
+    path = cache_file(cache_key(paths, reader, options))
+    if not os.path.exists(path):
+        return None
+    try:
+        m = read(path)
+    except (OSError, EOFError, KeyError, ValueError, ImportError, zipfile.BadZipFile):
+        # a broken or old entry is parsed again, like a truncated one or
+        # one with vectors when FreeCAD can not be imported
+        return None
+    # last use for the LRU eviction
+    os.utime(path, None)
+    return m
+
+
+def store(paths, reader, m, options=()):
+    "put the MeshData m of the inputs into the cache"
+    path = cache_file(cache_key(paths, reader, options))
+    # write aside and rename, a reader never sees half a file. every
+    # writer has a file of its own, batch processes may store the same key
+    fd, tmp = tempfile.mkstemp(dir=cache_dir(), suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp, m)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    evict()
+
+
+def write(path, m):
+    "write the nodes, elements, results, boundary groups, file numbers and merge statistics of the MeshData m as .npz to path"
+    arrays = {"node_ids": m.node_ids, "coords": m.coords}
+    if m.file_ids is not None:
+        arrays["file_ids"] = m.file_ids
+    for name, (ids, conn) in m.elements.items():
+        arrays["ids_" + name] = ids
+        arrays["conn_" + name] = conn
+    results = []
+    for i, result_set in enumerate(m.results):
+        results.append(_store_result_set(arrays, i, result_set))
+    groups = []
+    for i, (tag, group) in enumerate(m.groups.items()):
+        for name, conn in group.elements.items():
+            arrays["group{}_{}".format(i, name)] = conn
+        groups.append([tag, list(group.elements)])
+    info = {"result_index": m.result_index, "results": results, "groups": groups, "merge_stats": m.merge_stats}
+    arrays["info"] = np.array(json.dumps(info))
+    with open(path, "wb") as f:
+        np.savez(f, **arrays)
+
+
+def read(path):
+    "the MeshData of a .npz file of write()"
+    from . import hfcMesh
+
+    with np.load(path, allow_pickle=False) as data:
+        m = hfcMesh.MeshData(data["node_ids"], data["coords"])
+        if "file_ids" in data:
+            m.file_ids = data["file_ids"]
+        for name in hfcMesh.NUMBER_OF_NODES:
+            if "ids_" + name in data:
+                m.add_elements(name, data["ids_" + name], data["conn_" + name])
+        info = json.loads(str(data["info"]))
+        m.result_index = info["result_index"]
+        m.merge_stats = info.get("merge_stats")
+        m.results = [_load_result_set(data, i, keys) for i, keys in enumerate(info["results"])]
+        for i, (tag, names) in enumerate(info.get("groups", [])):
+            m.groups[tag] = hfcMesh.BoundaryGroup(
+                tag, {name: data["group{}_{}".format(i, name)] for name in names}
+            )
+    return m
+
+
+def evict(size=None):
+    "remove the least recently used cache files until they fit into size"
+    if size is None:
+        size = CACHE_SIZE
+    directory = cache_dir()
+    entries = []
+    for name in os.listdir(directory):
+        if name.endswith(".npz"):
+            try:
+                st = os.stat(os.path.join(directory, name))
+            except OSError:
+                # removed by another process meanwhile
+                continue
+            entries.append((st.st_mtime, st.st_size, name))
+    total = sum(entry[1] for entry in entries)
+    for mtime, nbytes, name in sorted(entries):
+        if total <= size:
+            break
+        try:
+            os.remove(os.path.join(directory, name))
+        except OSError:
+            pass
+        total -= nbytes
+
+
+def clear():
+    evict(0)
+
+
+# a result set is a dict of numbers, of {node: FreeCAD.Vector or number}
+# and of arrays like the fields of a SU2 solution. the info of a key is
+# {"kind": "array"} or {"kind": "dict"} for the ones in the .npz and
+# {"kind": "value", "value": value} for the others
+def _store_result_set(arrays, i, result_set):
+    keys = {}
+    for key, value in result_set.items():
+        prefix = "result{}_{}_".format(i, key)
+        if isinstance(value, np.ndarray):
+            arrays[prefix + "array"] = value
+            keys[key] = {"kind": "array"}
+        elif isinstance(value, dict) and value and isinstance(next(iter(value)), int):
+            arrays[prefix + "ids"] = np.array(list(value), np.int64)
+            arrays[prefix + "values"] = np.array([tuple(v) if hasattr(v, "__len__") else v for v in value.values()])
+            keys[key] = {"kind": "dict"}
+        else:
+            keys[key] = {"kind": "value", "value": value}
+    return keys
+
+
+def _load_result_set(data, i, keys):
+    result_set = {}
+    for key, info in keys.items():
+        prefix = "result{}_{}_".format(i, key)
+        if info["kind"] == "value":
+            result_set[key] = info["value"]
+            continue
+        if info["kind"] == "array":
+            result_set[key] = data[prefix + "array"]
+            continue
+        values = data[prefix + "values"]
+        if values.ndim == 2:
+            # vectors, FreeCAD is only needed for them
+            import FreeCAD
+            values = [FreeCAD.Vector(*v) for v in values.tolist()]
+        else:
+            values = values.tolist()
+        result_set[key] = dict(zip(data[prefix + "ids"].tolist(), values))
+    return result_set
@@ -0,0 +1,739 @@
+#
+
+__title__ = "hfc input library"
+__author__ = "John Wang"
+
+## @package hfcIO
+#  \ingroup FEM
+#  \brief block parsing of the numeric tables in mesh files
+#
+#  A block is a run of data lines like the NPOIN or NELEM table of SU2.
+#  It is handed to numpy as one piece of text and parsed in C,
+#  instead of calling split(), int() and float() for every token.
+
+import io
+import mmap
+import os
+import re
+import warnings
+from itertools import islice
+
+import numpy as np
+
+
+# number of lines parsed in one numpy call, bounds the text held in memory
+BLOCK_LINES = 1 << 20
+# bytes searched for line ends in one numpy call
+SCAN_BYTES = 1 << 24
+# compression extensions of the input files, decompressed while reading
+COMPRESSED = (".gz", ".xz", ".bz2", ".zst")
+# bytes read from a file in one call
+READ_BUFFER = 1 << 16
+# files of this size and more have their big blocks parsed in chunks of
+# about CHUNK_BYTES in a process pool when a pool is asked for, see parse_chunks
+PARALLEL_BYTES = 1 << 28
+CHUNK_BYTES = 1 << 24
+# processes of the reader pools when a reader is not told, None is no
+# pool and 0 one per CPU, see pool_processes
+PROCESSES = None
+# how the pool processes are started, None is forkserver where there is
+# one, else spawn. never fork, the GUI and hfcBackground run threads
+START_METHOD = None
+# the python interpreter of the pool processes inside FreeCAD, where
+# sys.executable is the FreeCAD binary. None looks next to that binary
+PYTHON = None
+
+
+def compression(path):
+    "the compression extension of path like .gz, None for a plain file"
+    ext = os.path.splitext(path)[1].lower()
+    return ext if ext in COMPRESSED else None
+
+
+def plain_name(path):
+    "path without its compression extension, mesh.su2.gz gives mesh.su2"
+    return path[:-len(compression(path))] if compression(path) else path
+
+
+def find_input(path):
+    "path if it exists, else the compressed file of path which exists, like path.gz"
+    if os.path.exists(path):
+        return path
+    for ext in COMPRESSED:
+        if os.path.exists(path + ext):
+            return path + ext
+    return path
+
+
+def open_input(path, mode="r"):
+    """open an input file for reading, as text with "r" and bytes with "rb"
+
+    .gz, .xz, .bz2 and .zst files are decompressed while they are read.
+    the bytes read go to the hfcProgress.Progress of the running import,
+    for a compressed file its compressed bytes
+    """
+    from . import hfcProgress
+
+    progress = hfcProgress.current()
+    if progress is hfcProgress.NO_PROGRESS:
+        if compression(path) is None:
+            return open(path, mode)
+        f = io.FileIO(path, "r")
+    else:
+        f = hfcProgress.ProgressFile(path, progress)
+    if compression(path) is not None:
+        f = DecompressedFile(f, compression(path))
+    f = io.BufferedReader(f, READ_BUFFER)
+    if "b" in mode:
+        return f
+    return io.TextIOWrapper(f)
+
+
+def read_head(path, n):
+    "the first n bytes of path, decompressed, without progress"
+    if compression(path) is None:
+        with open(path, "rb") as f:
+            return f.read(n)
+    with DecompressedFile(io.FileIO(path, "r"), compression(path)) as f:
+        head = b""
+        while len(head) < n:
+            chunk = f.read(n - len(head))
+            if not chunk:
+                break
+            head += chunk
+        return head
+
+
+class DecompressedFile(io.RawIOBase):
+    """the decompressed bytes of the compressed raw file f, for io.BufferedReader
+
+    tell() and seek() count decompressed bytes, seek() forward reads up
+    to the offset if the decompressor can not seek. closing it closes f
+    """
+
+    def __init__(self, f, ext):
+        self._file = f
+        try:
+            self._stream = _decompressor(f, ext)
+        except Exception:
+            f.close()
+            raise
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, b):
+        return self._stream.readinto(b)
+
+    def tell(self):
+        return self._stream.tell()
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.tell()
+        elif whence != io.SEEK_SET:
+            raise io.UnsupportedOperation("compressed files can not seek from their end")
+        if offset < self.tell() or getattr(self._stream, "seekable", lambda: False)():
+            return self._stream.seek(offset)
+        while self.tell() < offset:
+            if not self._stream.read(min(offset - self.tell(), READ_BUFFER)):
+                break
+        return self.tell()
+
+    def close(self):
+        if not self.closed:
+            try:
+                self._stream.close()
+            finally:
+                self._file.close()
+        io.RawIOBase.close(self)
+
+
+def _decompressor(f, ext):
+    "a file object reading the decompressed bytes of f"
+    if ext == ".gz":
+        import gzip
+        return gzip.GzipFile(fileobj=f, mode="rb")
+    if ext == ".xz":
+        import lzma
+        return lzma.LZMAFile(f)
+    if ext == ".bz2":
+        import bz2
+        return bz2.BZ2File(f)
+    try:
+        # Python 3.14
+        from compression import zstd
+        return zstd.ZstdFile(f)
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("reading .zst files needs the zstandard module")
+    return zstandard.ZstdDecompressor().stream_reader(f)
+
+
+def blocks(lines, n, size=None):
+    "take the next n lines of the iterator lines, as lists of at most size lines, None takes BLOCK_LINES"
+    if size is None:
+        size = BLOCK_LINES
+    while n > 0:
+        block = list(islice(lines, min(n, size)))
+        if not block:
+            raise EOFError("file ends inside a data block")
+        n -= len(block)
+        yield block
+
+
+def text_blocks(lines, n, size=None):
+    """take the next n lines of lines as texts of at most size lines
+
+    None takes BLOCK_LINES. yields (text, number of lines), lines is a MappedLines or any
+    iterator of stripped lines
+    """
+    if isinstance(lines, (MappedLines, FileLines)):
+        for item in lines.blocks(n, size):
+            yield item
+    else:
+        for block in blocks(lines, n, size):
+            yield join_lines(block), len(block)
+
+
+def read_chunks(f, size=None):
+    """yield the bytes of the binary file f in pieces of about size bytes
+
+    None takes SCAN_BYTES. every piece ends at a line end, so each one
+    can be parsed by itself
+    """
+    if size is None:
+        size = SCAN_BYTES
+    rest = b""
+    while True:
+        data = f.read(size)
+        if not data:
+            if rest:
+                yield rest
+            return
+        data = rest + data
+        cut = data.rfind(b"\n") + 1
+        rest = data[cut:]
+        if cut:
+            yield data[:cut]
+
+
+def in_freecad():
+    "True in the FreeCAD and FreeCADCmd applications, their sys.executable is no python"
+    import sys
+    return not os.path.basename(sys.executable).lower().startswith("python")
+
+
+def pool_processes(processes=None):
+    """the processes of a reader pool, 1 for no pool
+
+    None takes PROCESSES, if that is None as well there is no pool. a pool
+    is only made on request, its processes are started by the caller's
+    main module, which needs the if __name__ == "__main__" guard then.
+    0 is one process per CPU
+    """
+    if processes is None:
+        processes = PROCESSES
+    if processes is None:
+        return 1
+    if processes == 0:
+        return os.cpu_count() or 1
+    return max(processes, 1)
+
+
+def python_executable():
+    "the python of the pool processes inside FreeCAD, None if there is none"
+    import sys
+    if PYTHON:
+        return PYTHON
+    directory = os.path.dirname(sys.executable)
+    for name in ("python.exe", "python3", "python"):
+        path = os.path.join(directory, name)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def process_pool(processes=None):
+    """a ProcessPoolExecutor of the readers, None if pool_processes gives 1
+
+    the processes are started by START_METHOD and run the python of
+    python_executable inside FreeCAD, without one there is no pool
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    processes = pool_processes(processes)
+    if processes == 1:
+        return None
+    method = START_METHOD
+    if method is None:
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    context = multiprocessing.get_context(method)
+    if in_freecad():
+        python = python_executable()
+        if python is None:
+            from FreeCAD import Console
+            Console.PrintLog("no python found for the pool processes, set hfcIO.PYTHON\n")
+            return None
+        context.set_executable(python)
+    return ProcessPoolExecutor(max_workers=processes, mp_context=context)
+
+
+def chunk_pool(paths, processes=None):
+    """a process pool for parse_chunks, None if the files are not worth it
+
+    the largest plain file of paths has to have PARALLEL_BYTES, without
+    processes or with only compressed or small files no pool is made
+    """
+    if pool_processes(processes) == 1:
+        return None
+    sizes = [
+        os.path.getsize(path) for path in paths
+        if compression(path) is None and os.path.exists(path)
+    ]
+    if not sizes or max(sizes) < PARALLEL_BYTES:
+        return None
+    return process_pool(processes)
+
+
+def parse_chunks(pool, path, ranges, parse, args=()):
+    """parse the byte ranges of path by parse(text, *args) in the process pool
+
+    every process reads its range itself, only the parsed arrays come
+    back. yields the results in the order of ranges, the bytes go to the
+    progress as the results come in
+    """
+    from . import hfcProgress
+
+    progress = hfcProgress.current()
+    futures = [pool.submit(_parse_range, path, start, end, parse, args) for start, end in ranges]
+    try:
+        for future, (start, end) in zip(futures, ranges):
+            result = future.result()
+            progress.read(end - start)
+            yield result
+    finally:
+        # an error or a cancel leaves the rest undone
+        for future in futures:
+            future.cancel()
+
+
+def _parse_range(path, start, end, parse, args):
+    "parse_chunks in the pool processes"
+    with open(path, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start)
+    return parse(text, *args)
+
+
+def count_lines(text):
+    "number of lines of text, the last one may lack its line end"
+    newline = b"\n" if isinstance(text, bytes) else "\n"
+    return text.count(newline) + (len(text) > 0 and not text.endswith(newline))
+
+
+def first_columns(text):
+    "number of columns of the first line of text"
+    newline = b"\n" if isinstance(text, bytes) else "\n"
+    return len(text.split(newline, 1)[0].split())
+
+
+def join_lines(block):
+    "one text out of a list of lines"
+    if isinstance(block[0], bytes):
+        return b"\n".join(block)
+    return "\n".join(block)
+
+
+def parse_float_rows(text, ncols):
+    """parse a block of float rows with ncols columns each
+
+    returns a (n,ncols) float64 array, None if the rows are not regular
+    """
+    if not text.strip():
+        return np.empty((0, ncols))
+    values = np.fromstring(text, dtype=np.float64, sep=" ")
+    if values.size % ncols:
+        return None
+    return values.reshape(-1, ncols)
+
+
+def parse_floats(text):
+    "the whitespace separated floats of text as flat array, None if one is no number"
+    if not text.strip():
+        # numpy reads blank text as one -1
+        return np.empty(0)
+    with warnings.catch_warnings():
+        # numpy stops at the first bad token with a warning only
+        warnings.simplefilter("error")
+        try:
+            return np.fromstring(text, dtype=np.float64, sep=" ")
+        except (ValueError, DeprecationWarning):
+            return None
+
+
+def parse_int_table(text, n):
+    """parse a block of n integer rows, like parse_float_rows
+
+    returns a (n,k) int64 array with k the columns of the first row,
+    None if the rows are not all that long
+    """
+    k = first_columns(text)
+    values = np.fromstring(text, dtype=np.int64, sep=" ")
+    if not n or values.size != n * k:
+        return None
+    return values.reshape(n, k)
+
+
+def parse_int_rows(text):
+    """parse a block of rows of non negative integers of any length
+
+    every line gets a -1 appended as row end marker, so one numpy call
+    reads the whole block and the row borders are found from the markers.
+    returns the flat values and the start and length of every row
+    """
+    if isinstance(text, bytes):
+        text = text.replace(b"\n", b" -1\n") + b" -1"
+    else:
+        text = text.replace("\n", " -1\n") + " -1"
+    values = np.fromstring(text, dtype=np.int64, sep=" ")
+    ends = np.flatnonzero(values < 0)
+    starts = np.empty_like(ends)
+    starts[:1] = 0
+    starts[1:] = ends[:-1] + 1
+    lengths = ends - starts
+    # blank lines give empty rows
+    keep = lengths > 0
+    if not keep.all():
+        starts = starts[keep]
+        lengths = lengths[keep]
+    return values, starts, lengths
+
+
+def check_rows(name, n, rows):
+    "raise ValueError if a block of n rows gave another number of rows"
+    if rows != n:
+        raise ValueError("{} block of {} rows gave {} rows".format(name, n, rows))
+
+
+def take_columns(values, starts, first, k):
+    "the columns first ... first+k-1 of the rows starting at starts as (n,k) array"
+    return values[starts[:, None] + (first + np.arange(k))]
+
+
+class FileLines(object):
+    """the lines of an open text file
+
+    iterating gives the stripped header lines, blank and comment lines
+    are skipped. blocks() reads runs of data lines straight from the
+    file into one text each, without a Python step per line, a block
+    with blank or comment lines is filtered line by line.
+    """
+
+    def __init__(self, f, comment="%"):
+        self.file = f
+        self.comment = comment
+        # a blank or comment line after a line end
+        self._skipped = re.compile(r"\n[ \t\r]*(\n|{})".format(re.escape(comment)))
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        for line in self.file:
+            line = line.strip()
+            if len(line) == 0 or line.startswith(self.comment):
+                continue
+            return line
+        raise StopIteration
+
+    next = __next__
+
+    def blocks(self, n, size=None):
+        "yield (text, number of lines) of the next n lines, size lines at most, None takes BLOCK_LINES"
+        if size is None:
+            size = BLOCK_LINES
+        while n > 0:
+            k = min(n, size)
+            block = list(islice(self.file, k))
+            if not block:
+                raise EOFError("file ends inside a data block")
+            text = "".join(block)
+            if self._skipped.match("\n" + block[0]) or self._skipped.search(text):
+                block = [line for line in block if line.strip() and not line.lstrip().startswith(self.comment)]
+                while len(block) < k:
+                    line = next(self, None)
+                    if line is None:
+                        raise EOFError("file ends inside a data block")
+                    block.append(line + "\n")
+                text = "".join(block)
+            n -= k
+            yield text, k
+
+
+class MappedLines(object):
+    """the lines of a memory mapped file
+
+    iterating gives the stripped header lines as str, blank and comment
+    lines are skipped. blocks() hands out runs of data lines as one bytes
+    slice of the mapped buffer each, no str object is made per line and
+    nothing is decoded. a block with blank or comment lines is filtered
+    line by line like in FileLines.
+    """
+
+    def __init__(self, path, offset=0, comment=b"%"):
+        from . import hfcProgress
+        self.progress = hfcProgress.current()
+        self.path = path
+        self._file = open(path, "rb")
+        self.size = os.fstat(self._file.fileno()).st_size
+        self.buf = None
+        self._bytes = np.empty(0, np.uint8)
+        if self.size:
+            self.buf = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._bytes = np.frombuffer(self.buf, np.uint8)
+        self.pos = offset
+        self.comment = comment
+        # a blank or comment line after a line end
+        self._skipped = re.compile(rb"\n[ \t\r]*(?:\n|" + re.escape(comment) + rb")")
+
+    def close(self):
+        # the numpy view has to go before the map can be closed
+        self._bytes = None
+        if self.buf is not None:
+            self.buf.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        while self.pos < self.size:
+            end = self.buf.find(b"\n", self.pos)
+            if end < 0:
+                end = self.size
+            line = self.buf[self.pos:end].strip()
+            self.progress.read(end + 1 - self.pos)
+            self.pos = end + 1
+            if len(line) == 0 or line.startswith(self.comment):
+                continue
+            return line.decode()
+        raise StopIteration
+
+    next = __next__
+
+    def _skip_lines(self, n):
+        "position after the next n lines"
+        pos = self.pos
+        while n > 0:
+            window = self._bytes[pos:pos + SCAN_BYTES] == 10
+            if window.size == 0:
+                raise EOFError("file ends inside a data block")
+            # counting is cheaper than listing the line ends of every window
+            count = int(np.count_nonzero(window))
+            if count >= n:
+                return pos + int(np.flatnonzero(window)[n - 1]) + 1
+            n -= count
+            pos += window.size
+            if pos >= self.size and n == 1:
+                # last line without line end
+                return self.size
+        return pos
+
+    def _clean(self, start, end):
+        "True if the lines from start to end hold no blank or comment line"
+        # the line end in front of start finds a blank first line
+        return self._skipped.search(self.buf, max(start - 1, 0), end) is None
+
+    def blocks(self, n, size=None):
+        "yield (bytes, number of lines) of the next n lines, size lines at most, None takes BLOCK_LINES"
+        if size is None:
+            size = BLOCK_LINES
+        while n > 0:
+            k = min(n, size)
+            end = self._skip_lines(k)
+            text = self.buf[self.pos:end]
+            clean = self._clean(self.pos, end)
+            self.progress.read(end - self.pos)
+            self.pos = end
+            if not clean:
+                # the lines skipped are made up by the lines after the block
+                block = [
+                    line for line in text.splitlines(True)
+                    if line.strip() and not line.lstrip().startswith(self.comment)
+                ]
+                while len(block) < k:
+                    line = next(self, None)
+                    if line is None:
+                        raise EOFError("file ends inside a data block")
+                    block.append(line.encode() + b"\n")
+                text = b"".join(block)
+            n -= k
+            yield text, k
+
+    def ranges(self, n, size=None):
+        """the byte ranges of the next n lines for parse_chunks
+
+        the ranges are about size bytes, None takes CHUNK_BYTES, and end
+        at line ends. the lines
+        are passed over here and parsed by the pool processes. None if
+        the lines hold blank or comment lines, they are read by blocks()
+        """
+        if size is None:
+            size = CHUNK_BYTES
+        end = self._skip_lines(n)
+        if not self._clean(self.pos, end):
+            return None
+        ranges = []
+        start = self.pos
+        while start < end:
+            cut = end
+            if start + size < end:
+                cut = self.buf.find(b"\n", start + size - 1, end) + 1 or end
+            ranges.append((start, cut))
+            start = cut
+        self.pos = end
+        return ranges
+
+
+class TokenStream(object):
+    """the values of a text file as one stream of tokens
+
+    for free format files like the Frame3DD .3dd, where a value may
+    follow on the same or on any later line. blank lines, comment lines
+    and inline comments starting with one of comments are skipped. lines
+    is any iterator of lines, like an open file, it is read as the tokens
+    are taken, so only the current line and the table being parsed are
+    held in memory.
+    """
+
+    def __init__(self, lines, comments="#%"):
+        self.lines = iter(lines)
+        self.comments = comments
+        # the tokens of the current line not taken yet
+        self._tokens = []
+
+    def split(self, line):
+        "the tokens of line without its inline comment"
+        for mark in self.comments:
+            if mark in line:
+                line = line.split(mark, 1)[0]
+        return line.split()
+
+    def line(self):
+        "the next line as it is, stripped, like a title, the rest of the current line is dropped"
+        self._tokens = []
+        line = next(self.lines, None)
+        if line is None:
+            raise EOFError("file ends before its first line")
+        return line.strip()
+
+    def _fill(self):
+        "read lines until there is a token, False at the end of the file"
+        while not self._tokens:
+            line = next(self.lines, None)
+            if line is None:
+                return False
+            self._tokens = self.split(line)[::-1]
+        return True
+
+    def at_end(self):
+        return not self._fill()
+
+    def token(self):
+        if not self._fill():
+            raise EOFError("file ends before the next value")
+        return self._tokens.pop()
+
+    def count(self):
+        "the next token as int, like the number of rows of a table"
+        return int(self.token())
+
+    def floats(self, k):
+        "the next k tokens as list of floats"
+        return [float(self.token()) for i in range(k)]
+
+    def table(self, n, ncols):
+        """the next n*ncols tokens as (n,ncols) float64 array
+
+        a row may be spread over several lines or share a line with the
+        next row. runs of lines without comments are parsed in one numpy
+        call, no str object is made per token
+        """
+        need = n * ncols
+        parts = []
+        have = 0
+        if self._tokens:
+            tokens = self._tokens[::-1]
+            self._tokens = tokens[need:][::-1]
+            parts.append(np.array(tokens[:need], np.float64))
+            have = parts[0].size
+        while have < need:
+            # at most one line per row left, so only the last line may hold values after the table
+            chunk = list(islice(self.lines, max(1, (need - have) // ncols)))
+            if not chunk:
+                raise EOFError("file ends inside a table")
+            values = self._parse_lines(chunk)
+            extra = have + values.size - need
+            if extra > 0:
+                # the tokens after the table stay for the next value
+                tail = []
+                for line in reversed(chunk):
+                    tail = self.split(line) + tail
+                    if len(tail) >= extra:
+                        break
+                self._tokens = tail[-extra:][::-1]
+                values = values[:-extra]
+            parts.append(values)
+            have += values.size
+        if not parts:
+            return np.empty((0, ncols))
+        return np.concatenate(parts).reshape(n, ncols)
+
+    def _parse_lines(self, lines):
+        "the numbers of lines as flat array, the runs of lines without comments in one numpy call"
+        text = "".join(lines)
+        if not any(mark in text for mark in self.comments):
+            return self._parse_run(text, lines)
+        # the lines with a comment, found in the text and not line by line
+        offsets = np.zeros(len(lines) + 1, np.int64)
+        np.cumsum([len(line) for line in lines], out=offsets[1:])
+        marked = set()
+        for mark in self.comments:
+            pos = text.find(mark)
+            while pos >= 0:
+                k = int(np.searchsorted(offsets, pos, side="right")) - 1
+                marked.add(k)
+                pos = text.find(mark, int(offsets[k + 1]))
+        parts = []
+        start = 0
+        for end in sorted(marked) + [len(lines)]:
+            if end > start:
+                parts.append(self._parse_run(text[offsets[start]:offsets[end]], lines[start:end]))
+            if end < len(lines):
+                parts.append(np.array(self.split(lines[end]), np.float64))
+            start = end + 1
+        return np.concatenate(parts)
+
+    def _parse_run(self, text, lines):
+        values = parse_floats(text)
+        if values is None:
+            # a token which is no number, float() names it in the error
+            tokens = []
+            for line in lines:
+                tokens += self.split(line)
+            values = np.array(tokens, np.float64)
+        return values
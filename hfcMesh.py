@@ -0,0 +1,646 @@
+#
+
+__title__ = "hfc mesh data"
+__author__ = "John Wang"
+
+## @package hfcMesh
+#  \ingroup FEM
+#  \brief compact mesh container shared by the hfc readers
+#
+#  The readers keep node coordinates and element connectivity in numpy
+#  arrays instead of dicts of FreeCAD.Vector and tuples. The old
+#  {"Nodes": ..., "Tria3Elem": ...} dict shape is built only when a caller
+#  asks for it, so importToolsFem.make_femmesh keeps working unchanged.
+
+from array import array
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    # Python2
+    from collections import Mapping
+
+import numpy as np
+
+
+# element lists of importToolsFem.make_femmesh and their number of nodes
+ELEMENT_NODES = (
+    ("Seg2Elem", 2),
+    ("Seg3Elem", 3),
+    ("Tria3Elem", 3),
+    ("Tria6Elem", 6),
+    ("Quad4Elem", 4),
+    ("Quad8Elem", 8),
+    ("Tetra4Elem", 4),
+    ("Tetra10Elem", 10),
+    ("Hexa8Elem", 8),
+    ("Hexa20Elem", 20),
+    ("Penta6Elem", 6),
+    ("Penta15Elem", 15),
+)
+# make_femmesh has no pyramid list, FemMesh.addVolume makes a pyramid out of
+# five nodes, so in the dict shape pyramids are handed over as Tetra4Elem
+PYRAMID = "Pyra5Elem"
+NUMBER_OF_NODES = dict(ELEMENT_NODES)
+NUMBER_OF_NODES[PYRAMID] = 5
+
+ID_TYPE = np.int64
+CONNECTIVITY_TYPE = np.int32
+
+
+class MeshData(Mapping):
+    """nodes, elements and results of one imported mesh
+
+    node_ids    (N,) int array of the node numbers
+    coords      (N,3) float64 array of the node coordinates
+    elements    {"Tetra4Elem": (ids, connectivity), ...} with (M,) int ids
+                and (M,k) int32 connectivity holding node numbers
+    results     list of result sets as used by fill_femresult_mechanical
+    result_index    where the result sets are found in the file, for the
+                readers which load them on demand
+    model       the solver input model of the readers which have one,
+                like the Frame3DD case, None otherwise
+    groups      {name: BoundaryGroup} of the named boundaries, like the
+                markers of SU2
+    file_ids    the node numbers in the file of a mesh renumbered by
+                compact(), None if the numbers are the ones of the file
+    merge_stats the statistics of merge_coincident, None if the mesh
+                did not go through it
+    """
+
+    def __init__(self, node_ids=None, coords=None, elements=None, results=None):
+        if node_ids is None:
+            node_ids = np.empty(0, ID_TYPE)
+            coords = np.empty((0, 3))
+        self.node_ids = np.asarray(node_ids, ID_TYPE)
+        self.coords = np.asarray(coords, np.float64).reshape(-1, 3)
+        self.elements = {}
+        self._dict_cache = {}
+        if elements:
+            for name in elements:
+                self.add_elements(name, *elements[name])
+        self.results = [] if results is None else results
+        self.result_index = []
+        self.model = None
+        self.groups = {}
+        self.file_ids = None
+        self.merge_stats = None
+
+    @property
+    def node_count(self):
+        return len(self.node_ids)
+
+    @property
+    def element_count(self):
+        return sum(len(ids) for ids, conn in self.elements.values())
+
+    @property
+    def nbytes(self):
+        n = self.node_ids.nbytes + self.coords.nbytes
+        for ids, conn in self.elements.values():
+            n += ids.nbytes + conn.nbytes
+        return n
+
+    def add_nodes(self, node_ids, coords):
+        self.node_ids = np.concatenate((self.node_ids, np.asarray(node_ids, ID_TYPE)))
+        self.coords = np.concatenate((self.coords, np.asarray(coords, np.float64).reshape(-1, 3)))
+        self._dict_cache.clear()
+
+    def add_elements(self, name, ids, connectivity):
+        ids = np.asarray(ids, ID_TYPE)
+        connectivity = np.asarray(connectivity, CONNECTIVITY_TYPE).reshape(
+            len(ids), NUMBER_OF_NODES[name]
+        )
+        if name in self.elements:
+            old_ids, old_conn = self.elements[name]
+            ids = np.concatenate((old_ids, ids))
+            connectivity = np.concatenate((old_conn, connectivity))
+        self.elements[name] = (ids, connectivity)
+        self._dict_cache.clear()
+
+    # ********* dict shape of importToolsFem *********
+    def _keys(self):
+        return ["Nodes"] + [name for name, k in ELEMENT_NODES] + ["Results"]
+
+    def __iter__(self):
+        return iter(self._keys())
+
+    def __len__(self):
+        return len(self._keys())
+
+    def __getitem__(self, key):
+        if key == "Results":
+            return self.results
+        if key not in self._dict_cache:
+            if key == "Nodes":
+                self._dict_cache[key] = self._nodes_dict()
+            elif key in NUMBER_OF_NODES and key != PYRAMID:
+                self._dict_cache[key] = self._elements_dict(key)
+            else:
+                raise KeyError(key)
+        return self._dict_cache[key]
+
+    def _nodes_dict(self):
+        import FreeCAD
+        return {
+            nid: FreeCAD.Vector(x, y, z)
+            for nid, (x, y, z) in zip(self.node_ids.tolist(), self.coords.tolist())
+        }
+
+    def _elements_dict(self, name):
+        elements = {}
+        names = [name, PYRAMID] if name == "Tetra4Elem" else [name]
+        for n in names:
+            if n in self.elements:
+                ids, conn = self.elements[n]
+                elements.update(zip(ids.tolist(), map(tuple, conn.tolist())))
+        return elements
+
+    def to_dict(self):
+        "the {'Nodes': ..., 'Tria3Elem': ..., 'Results': ...} dict of importToolsFem"
+        return {key: self[key] for key in self._keys()}
+
+
+class MeshBuilder(object):
+    """collects nodes and elements in compact typed buffers
+
+    the line by line parsers add one item at a time, the block parsers
+    add whole arrays. build() joins everything once into a MeshData.
+    """
+
+    def __init__(self):
+        self.node_ids = array("q")
+        self.coords = array("d")
+        self.elements = {}
+        self._node_parts = []
+        self._element_parts = {}
+        self._group_parts = {}
+
+    @property
+    def node_count(self):
+        return len(self.node_ids) + sum(len(ids) for ids, coords in self._node_parts)
+
+    def add_node(self, node_id, x, y, z):
+        self.node_ids.append(node_id)
+        self.coords.extend((x, y, z))
+
+    def add_element(self, name, element_id, nodes):
+        if name not in self.elements:
+            self.elements[name] = (array("q"), array("i"))
+        ids, conn = self.elements[name]
+        ids.append(element_id)
+        conn.extend(nodes)
+
+    def add_nodes(self, node_ids, coords):
+        self._flush_nodes()
+        self._node_parts.append((
+            np.asarray(node_ids, ID_TYPE),
+            np.asarray(coords, np.float64).reshape(-1, 3)
+        ))
+
+    def add_elements(self, name, ids, connectivity):
+        self._flush_elements(name)
+        self._element_parts.setdefault(name, []).append((
+            np.asarray(ids, ID_TYPE),
+            np.asarray(connectivity, CONNECTIVITY_TYPE).reshape(len(ids), NUMBER_OF_NODES[name])
+        ))
+
+    def add_group(self, group, name=None, connectivity=None):
+        """add boundary elements of the list name to the BoundaryGroup named group
+
+        without name only the group is made, a boundary may be empty
+        """
+        found = self._group_parts.setdefault(group, {})
+        if name is not None:
+            found.setdefault(name, []).append(
+                np.asarray(connectivity, CONNECTIVITY_TYPE).reshape(-1, NUMBER_OF_NODES[name])
+            )
+
+    def add_mesh(self, m, node_offset=0, element_offset=0):
+        """add the nodes, elements and groups of the MeshData m
+
+        node_offset is added to the node numbers and the connectivity,
+        element_offset to the element numbers, like for the zones of a
+        file parsed by themselves
+        """
+        if m.node_count:
+            self.add_nodes(m.node_ids + node_offset, m.coords)
+        for name, (ids, conn) in m.elements.items():
+            self.add_elements(name, ids + element_offset, conn + node_offset)
+        for group, found in m.groups.items():
+            self.add_group(group)
+            for name, conn in found.elements.items():
+                self.add_group(group, name, conn + node_offset)
+
+    # the single items collected so far go in front of the next block
+    def _flush_nodes(self):
+        if len(self.node_ids):
+            self._node_parts.append((
+                np.array(self.node_ids, ID_TYPE),
+                np.array(self.coords, np.float64).reshape(-1, 3)
+            ))
+            self.node_ids = array("q")
+            self.coords = array("d")
+
+    def _flush_elements(self, name):
+        if name in self.elements:
+            ids, conn = self.elements.pop(name)
+            self._element_parts.setdefault(name, []).append((
+                np.array(ids, ID_TYPE),
+                np.array(conn, CONNECTIVITY_TYPE).reshape(len(ids), NUMBER_OF_NODES[name])
+            ))
+
+    def build(self, results=None):
+        self._flush_nodes()
+        for name in list(self.elements):
+            self._flush_elements(name)
+        if self._node_parts:
+            node_ids = np.concatenate([ids for ids, coords in self._node_parts])
+            coords = np.concatenate([coords for ids, coords in self._node_parts])
+        else:
+            node_ids = coords = None
+        elements = {}
+        for name, parts in self._element_parts.items():
+            elements[name] = (
+                np.concatenate([ids for ids, conn in parts]),
+                np.concatenate([conn for ids, conn in parts]),
+            )
+        m = MeshData(node_ids, coords, elements, results)
+        for group, found in self._group_parts.items():
+            m.groups[group] = BoundaryGroup(
+                group, {name: np.concatenate(parts) for name, parts in found.items()}
+            )
+        return m
+
+
+def used_nodes(connectivities):
+    "sorted unique node numbers of the connectivity arrays"
+    conn = [np.asarray(c).ravel() for c in connectivities if np.size(c)]
+    if not conn:
+        return np.empty(0, ID_TYPE)
+    conn = np.concatenate(conn)
+    top = int(conn.max())
+    if conn.min() >= 0 and top < 4 * len(conn) + 1024:
+        # dense numbers, a mask is linear where unique sorts
+        used = np.zeros(top + 1, bool)
+        used[conn] = True
+        return np.flatnonzero(used).astype(ID_TYPE)
+    return np.unique(conn).astype(ID_TYPE)
+
+
+class BoundaryGroup(object):
+    """a named set of boundary elements, like a SU2 marker
+
+    elements    {"Tria3Elem": connectivity, ...} with (M,k) int32
+                connectivity holding node numbers, the elements of a
+                boundary have no numbers of their own
+    nodes       sorted unique int array of the node numbers used, so a
+                lookup is a binary search and no scan of the mesh
+    """
+
+    def __init__(self, name, elements):
+        self.name = name
+        self.elements = elements
+        self.nodes = used_nodes(elements.values())
+
+    @property
+    def element_count(self):
+        return sum(len(conn) for conn in self.elements.values())
+
+    def contains(self, node_ids):
+        "bool array, True for the node numbers node_ids found in the group"
+        node_ids = np.asarray(node_ids, ID_TYPE)
+        if not len(self.nodes):
+            return np.zeros(node_ids.shape, bool)
+        pos = np.searchsorted(self.nodes, node_ids)
+        return self.nodes[np.minimum(pos, len(self.nodes) - 1)] == node_ids
+
+
+
+# element lists added to FemMesh without reordering the nodes
+# and the FemMesh method adding them
+FEMMESH_ADD = {
+    "Seg2Elem": "addEdge",
+    "Tria3Elem": "addFace",
+    "Quad4Elem": "addFace",
+    "Tetra4Elem": "addVolume",
+    "Pyra5Elem": "addVolume",
+    "Penta6Elem": "addVolume",
+    "Hexa8Elem": "addVolume",
+}
+
+
+def make_femmesh(m):
+    """build a Fem.FemMesh straight from the arrays of the MeshData m
+
+    the node and element numbers are taken over. the values come out of
+    the arrays by one tolist() per block, so the loops only call the
+    FemMesh methods, no int() or float() or Vector per item. meshes with
+    second order elements go through importToolsFem.make_femmesh,
+    which knows their node order
+    """
+    import Fem
+    from FreeCAD import Console
+
+    for name in m.elements:
+        if name not in FEMMESH_ADD:
+            from . import importToolsFem
+            return importToolsFem.make_femmesh(m)
+
+    mesh = Fem.FemMesh()
+    addNode = mesh.addNode
+    for nid, (x, y, z) in zip(m.node_ids.tolist(), m.coords.tolist()):
+        addNode(x, y, z, nid)
+    for name, (ids, conn) in m.elements.items():
+        add = getattr(mesh, FEMMESH_ADD[name])
+        for eid, nodes in zip(ids.tolist(), conn.tolist()):
+            add(nodes, eid)
+
+    Console.PrintLog(
+        "imported mesh: {} nodes, {} elements\n"
+        .format(m.node_count, m.element_count)
+    )
+    return mesh
+
+def merge_by_id(parts):
+    """join MeshData parts which share nodes and elements by number
+
+    like the partitions of one mesh, a node or element found in more
+    than one part is kept once. returns the MeshData and the number
+    of nodes dropped as duplicates
+    """
+    parts = [part for part in parts if part.node_count or part.elements]
+    if not parts:
+        return MeshData(), 0
+    node_ids = np.concatenate([part.node_ids for part in parts])
+    coords = np.concatenate([part.coords for part in parts])
+    unique_ids, first = np.unique(node_ids, return_index=True)
+    elements = {}
+    for name in NUMBER_OF_NODES:
+        found = [part.elements[name] for part in parts if name in part.elements]
+        if found:
+            ids = np.concatenate([ids for ids, conn in found])
+            conn = np.concatenate([conn for ids, conn in found])
+            ids, keep = np.unique(ids, return_index=True)
+            elements[name] = (ids, conn[keep])
+    m = MeshData(unique_ids, coords[first], elements)
+    return m, len(node_ids) - len(unique_ids)
+
+
+# the readers merge coincident nodes with this tolerance when they are
+# not told otherwise, None leaves the nodes as they are in the file
+MERGE_TOLERANCE = None
+# cell size of the merge grid in tolerances, the bigger the fewer nodes
+# lie near a cell face, but the cell has to stay well below the spacing
+# of the mesh nodes
+MERGE_CELL = 16
+
+
+def merge_coincident(m, tolerance):
+    """merge the nodes of the MeshData m closer than tolerance
+
+    like the interface nodes of the zones of a SU2 file or of the
+    partitions of an Elmer mesh. a chain of close nodes is merged into
+    one. the first node of every cluster is kept with its number, the
+    elements and boundary groups are remapped to it and the rows of the
+    others are dropped from result sets with node_ids arrays.
+    returns the new MeshData and a dict of the merge statistics, which
+    is kept in its merge_stats as well
+    """
+    import time
+    from FreeCAD import Console
+
+    if not tolerance > 0:
+        raise ValueError("merge tolerance {} is not positive".format(tolerance))
+    start = time.time()
+    n = m.node_count
+    first, second = coincident_pairs(m.coords, tolerance)
+    keep = np.ones(n, bool)
+    stats = {
+        "nodes": n, "merged": 0, "clusters": 0,
+        "collapsed_elements": 0, "tolerance": float(tolerance), "seconds": 0.0,
+    }
+    if len(first):
+        # the lowest index of a cluster is its first node in file order
+        cluster = _clusters(n, first, second)
+        merged = np.flatnonzero(cluster != np.arange(n))
+        keep[merged] = False
+        old_ids = m.node_ids[merged]
+        new_ids = m.node_ids[cluster[merged]]
+        order = np.argsort(old_ids)
+        old_ids = old_ids[order]
+        new_ids = new_ids[order]
+        renumber = _renumbering(m.node_ids, old_ids, new_ids)
+        elements = {}
+        for name, (ids, conn) in m.elements.items():
+            conn, hit = renumber(conn)
+            stats["collapsed_elements"] += int(_collapsed(conn, hit))
+            elements[name] = (ids, conn)
+        merged_m = MeshData(m.node_ids[keep], m.coords[keep], elements, m.results)
+        merged_m.result_index = m.result_index
+        merged_m.model = m.model
+        for tag, group in m.groups.items():
+            merged_m.groups[tag] = BoundaryGroup(
+                tag, {name: renumber(conn)[0] for name, conn in group.elements.items()}
+            )
+        for result_set in m.results:
+            ids = result_set.get("node_ids")
+            if isinstance(ids, np.ndarray) and isinstance(result_set.get("values"), np.ndarray):
+                rows = ~np.isin(ids, old_ids)
+                result_set["node_ids"] = ids[rows]
+                result_set["values"] = result_set["values"][rows]
+        m = merged_m
+        stats["merged"] = len(merged)
+        kept = np.zeros(n, bool)
+        kept[cluster[merged]] = True
+        stats["clusters"] = int(np.count_nonzero(kept))
+    stats["seconds"] = time.time() - start
+    Console.PrintLog(
+        "merged {merged} of {nodes} nodes within {tolerance} into {clusters} nodes, "
+        "{collapsed_elements} elements collapsed, {seconds:.3f} s\n".format(**stats)
+    )
+    m.merge_stats = stats
+    return m, stats
+
+
+def coincident_pairs(coords, tolerance):
+    """the index pairs of the (N,3) coords closer than tolerance
+
+    the nodes are hashed into a uniform grid of cells of MERGE_CELL
+    tolerances, a close pair is in the same cell unless both lie near
+    a cell face. for the faces the near nodes alone are hashed again
+    into grids shifted by half a cell on those axes, so every close
+    pair shares a cell in one of the grids. expected linear in N
+    apart from the sort of the cell keys
+    """
+    coords = np.asarray(coords, np.float64)
+    if len(coords) < 2:
+        return np.empty(0, np.int64), np.empty(0, np.int64)
+    size = MERGE_CELL * tolerance
+    scaled = (coords - coords.min(axis=0)) / size
+    cells = np.floor(scaled).astype(np.int64)
+    # a little more than tolerance, the rounding must not lose a pair
+    margin = 1.01 / MERGE_CELL
+    fraction = scaled - cells
+    near = (fraction < margin) | (fraction > 1 - margin)
+    pairs = [_cell_pairs(coords, np.arange(len(coords)), cells, tolerance)]
+    for shift in range(1, 8):
+        axes = [axis for axis in range(3) if shift >> axis & 1]
+        index = np.flatnonzero(near[:, axes].all(axis=1))
+        if len(index) < 2:
+            continue
+        keys = cells[index]
+        keys[:, axes] = np.floor(scaled[index][:, axes] + 0.5)
+        pairs.append(_cell_pairs(coords, index, keys, tolerance))
+    first = np.concatenate([a for a, b in pairs])
+    second = np.concatenate([b for a, b in pairs])
+    return first, second
+
+
+def _cell_pairs(coords, index, cells, tolerance):
+    "the pairs of the nodes index closer than tolerance with equal (M,3) cells"
+    # a hash of the three cell numbers, two cells with the same hash
+    # only give pairs which the distance test drops
+    keys = cells[:, 0] * 73856093 ^ cells[:, 1] * 19349663 ^ cells[:, 2] * 83492791
+    order = np.argsort(keys)
+    keys = keys[order]
+    index = index[order]
+    first = []
+    second = []
+    # the nodes k places apart in the sorted keys, while any share a cell
+    rows = np.arange(len(keys) - 1)
+    k = 1
+    while len(rows):
+        rows = rows[keys[rows] == keys[rows + k]]
+        a = index[rows]
+        b = index[rows + k]
+        close = ((coords[a] - coords[b]) ** 2).sum(axis=1) <= tolerance * tolerance
+        first.append(a[close])
+        second.append(b[close])
+        k += 1
+        rows = rows[rows + k < len(keys)]
+    if not first:
+        return np.empty(0, np.int64), np.empty(0, np.int64)
+    return np.concatenate(first), np.concatenate(second)
+
+
+def _clusters(n, first, second):
+    """the lowest node index of the cluster of each of the n nodes
+
+    the clusters are the connected node pairs, the lowest index is
+    spread over the pairs until both nodes of every pair have it
+    """
+    label = np.arange(n)
+    while True:
+        low = np.minimum(label[first], label[second])
+        if (label[first] == low).all() and (label[second] == low).all():
+            return label
+        np.minimum.at(label, first, low)
+        np.minimum.at(label, second, low)
+        # pointer jumping, a label may point at a node with a lower one
+        label[first] = label[label[first]]
+        label[second] = label[label[second]]
+
+
+def _renumbering(node_ids, old_ids, new_ids):
+    """a function replacing the sorted node numbers old_ids by new_ids in a connectivity
+
+    it returns the new connectivity and the mask of the replaced entries.
+    node_ids are all numbers which can be found, dense ones are looked
+    up in a table, others by a binary search. numbers of no node in a
+    connectivity are kept as they are
+    """
+    def search(conn):
+        pos, hit = _positions(old_ids, conn)
+        new = conn.copy()
+        new[hit] = new_ids[pos[hit]]
+        return new, hit
+
+    top = int(node_ids.max()) if len(node_ids) else 0
+    if not (len(node_ids) and node_ids.min() >= 0 and top < 4 * len(node_ids) + 1024):
+        return search
+    table = np.arange(top + 1, dtype=CONNECTIVITY_TYPE)
+    table[old_ids] = new_ids
+
+    def renumber(conn):
+        if conn.size and (conn.min() < 0 or conn.max() > top):
+            # a number past the table, like an element node the file has not
+            return search(conn)
+        new = table[conn]
+        return new, new != conn
+
+    return renumber
+
+
+def _positions(sorted_ids, ids):
+    "the positions of ids in the sorted array sorted_ids and the mask of the ids found"
+    pos = np.searchsorted(sorted_ids, ids)
+    pos[pos == len(sorted_ids)] = 0
+    return pos, sorted_ids[pos] == ids if len(sorted_ids) else np.zeros(np.shape(ids), bool)
+
+
+def _collapsed(conn, hit):
+    "the number of rows of conn using a node twice, only the rows with a hit can"
+    rows = np.sort(conn[hit.any(axis=1)], axis=1)
+    return int((rows[:, 1:] == rows[:, :-1]).any(axis=1).sum())
+
+
+def compact(m):
+    """the MeshData m with only the nodes its elements use, numbered from 1
+
+    in the order of their numbers in the file, which is the FemMesh
+    restools.compact_result would make of it, so the importers need no
+    mesh rebuild. the result sets are renumbered alike and the nodes
+    left out are dropped from them. file_ids of the new MeshData holds
+    the number in the file of every node. a mesh without elements or
+    numbered from 1 without gaps already is returned as it is
+    """
+    if not m.elements:
+        return m
+    conn = [conn for ids, conn in m.elements.values()]
+    for group in m.groups.values():
+        conn.extend(group.elements.values())
+    used = used_nodes(conn)
+    # numbers an element uses but no node has stay out
+    order = np.argsort(m.node_ids, kind="stable")
+    pos, found = _positions(m.node_ids[order], used)
+    used = used[found]
+    if len(used) == m.node_count and np.array_equal(m.node_ids, np.arange(1, len(used) + 1)):
+        return m
+    renumber = _renumbering(used, used, np.arange(1, len(used) + 1))
+    elements = {name: (ids, renumber(conn)[0]) for name, (ids, conn) in m.elements.items()}
+    results = [compact_result_set(result_set, used) for result_set in m.results]
+    c = MeshData(np.arange(1, len(used) + 1), m.coords[order[pos[found]]], elements, results)
+    c.result_index = m.result_index
+    c.model = m.model
+    for tag, group in m.groups.items():
+        c.groups[tag] = BoundaryGroup(
+            tag, {name: renumber(conn)[0] for name, conn in group.elements.items()}
+        )
+    c.file_ids = used
+    c.merge_stats = m.merge_stats
+    return c
+
+
+def compact_result_set(result_set, file_ids):
+    """the result set renumbered for a mesh of compact()
+
+    file_ids are the sorted numbers in the file of the nodes of the mesh.
+    the {node: value} dicts and the node_ids array with its values rows
+    get the new numbers, the nodes not in file_ids are dropped
+    """
+    from itertools import compress
+
+    compacted = {}
+    for key, value in result_set.items():
+        if isinstance(value, dict) and value and isinstance(next(iter(value)), int):
+            pos, found = _positions(file_ids, np.fromiter(value, ID_TYPE, len(value)))
+            compacted[key] = dict(zip((pos[found] + 1).tolist(), compress(value.values(), found.tolist())))
+        else:
+            compacted[key] = value
+    ids = result_set.get("node_ids")
+    if isinstance(ids, np.ndarray) and isinstance(result_set.get("values"), np.ndarray):
+        pos, found = _positions(file_ids, ids)
+        compacted["node_ids"] = (pos[found] + 1).astype(ID_TYPE)
+        compacted["values"] = result_set["values"][found]
+    return compacted
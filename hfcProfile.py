@@ -0,0 +1,253 @@
+#
+
+__title__ = "hfc import profile"
+__author__ = "John Wang"
+
+## @package hfcProfile
+#  \ingroup FEM
+#  \brief per phase timing and memory of the imports
+#
+#  An import is split into phases like reading the file, make_femmesh,
+#  filling the result objects, the compaction and the stress values.
+#  With ENABLED every phase records its wall time, CPU time, the RSS at
+#  its end, the RSS it added, how far it raised the peak RSS of the
+#  process and the counts of the items it handled. The
+#  report of an import is written by Console.PrintLog and kept in reports.
+#  Without ENABLED phase() hands out one shared object which does nothing.
+#  The running import is kept per thread like the hfcProgress, a reader in
+#  a worker thread records into the profile given by profiling().
+#
+#  from feminout import hfcProfile
+#  hfcProfile.enable()
+#  importSU2Mesh.importSU2Mesh("wing.su2")
+#  hfcProfile.reports[-1]["phases"]
+
+import threading
+import time
+
+try:
+    import resource
+except ImportError:
+    # Windows
+    resource = None
+
+
+ENABLED = False
+# the reports of the finished imports, oldest first
+reports = []
+
+# the profile of the running import of each thread, phases outside of an import are dropped
+_local = threading.local()
+
+
+def enable(on=True):
+    global ENABLED
+    ENABLED = on
+
+
+def disable():
+    enable(False)
+
+
+def peak_rss():
+    "peak resident set size of the process since its start in bytes, None if unknown"
+    if resource is None:
+        return None
+    import sys
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def current_rss():
+    "resident set size of the process now in bytes, None if unknown"
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        # no /proc, like on Windows and macOS
+        return None
+    import os
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def _difference(end, start):
+    return end - start if end is not None and start is not None else None
+
+
+class NoPhase(object):
+    "the phase of a disabled profile, costs a call and nothing else"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def count(self, **items):
+        pass
+
+    def finish(self):
+        return None
+
+    def phase(self, name):
+        return self
+
+
+NO_PHASE = NoPhase()
+
+
+class Phase(object):
+    "one timed phase of a Profile"
+
+    def __init__(self, profile, name):
+        self.profile = profile
+        self.name = name
+        self.items = {}
+
+    def __enter__(self):
+        self.profile._stack.append(self.name)
+        self.path = "/".join(self.profile._stack)
+        self.rss = current_rss()
+        self.peak = peak_rss()
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        return self
+
+    def __exit__(self, *args):
+        seconds = time.perf_counter() - self.wall
+        cpu = time.process_time() - self.cpu
+        rss = current_rss()
+        # the peak of the process only tells about the phase when it rose in it
+        peak_growth = _difference(peak_rss(), self.peak)
+        rss_growth = _difference(rss, self.rss)
+        self.profile._stack.pop()
+        # a phase run again, like once per result set, adds to its entry
+        entry = self.profile._entries.get(self.path)
+        if entry is None:
+            entry = {
+                "phase": self.path, "calls": 0, "seconds": 0.0, "cpu_seconds": 0.0,
+                "rss": None, "rss_growth": None, "peak_rss_growth": None,
+            }
+            self.profile._entries[self.path] = entry
+            self.profile.phases.append(entry)
+        entry["calls"] += 1
+        entry["seconds"] += seconds
+        entry["cpu_seconds"] += cpu
+        entry["rss"] = rss
+        for key, value in (("rss_growth", rss_growth), ("peak_rss_growth", peak_growth)):
+            if value is not None:
+                entry[key] = (entry[key] or 0) + value
+        for key, value in self.items.items():
+            entry[key] = entry.get(key, 0) + value
+        return False
+
+    def count(self, **items):
+        "add item counts, like nodes=n, to the phase"
+        for key, value in items.items():
+            self.items[key] = self.items.get(key, 0) + value
+
+
+class Profile(object):
+    """the phases of one import
+
+    the phases are listed in the order they first end, nested phases
+    are named by the path of the phases they run in like read/nodes
+    """
+
+    def __init__(self, name, filename=None):
+        self.name = name
+        self.filename = filename
+        self.phases = []
+        self._entries = {}
+        self._stack = []
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+
+    def phase(self, name):
+        return Phase(self, name)
+
+    def report(self):
+        "the structured report, a dict of import, file, phases and totals"
+        return {
+            "import": self.name,
+            "file": self.filename,
+            "seconds": time.perf_counter() - self.wall,
+            "cpu_seconds": time.process_time() - self.cpu,
+            "process_peak_rss": peak_rss(),
+            "phases": [dict(entry) for entry in self.phases],
+        }
+
+    def finish(self):
+        "end the import, log the report and keep it in reports"
+        if current() is self:
+            _local.profile = None
+        report = self.report()
+        reports.append(report)
+        log(report)
+        return report
+
+
+def start(name, filename=None):
+    """the profile of an import which starts now
+
+    NO_PHASE without ENABLED, its phase() and finish() do nothing
+    """
+    if not ENABLED:
+        return NO_PHASE
+    _local.profile = Profile(name, filename)
+    return _local.profile
+
+
+def current():
+    "the Profile of the import running in this thread, None if none"
+    return getattr(_local, "profile", None)
+
+
+def phase(name):
+    "a phase of the running import, for the readers which do not hold the profile"
+    profile = current()
+    if profile is None:
+        return NO_PHASE
+    return profile.phase(name)
+
+
+class profiling(object):
+    "with profiling(profile): the phases of the readers in the block go to profile"
+
+    def __init__(self, profile):
+        # the NO_PHASE of a disabled profile records nothing
+        self.profile = profile if isinstance(profile, Profile) else None
+
+    def __enter__(self):
+        self.outer = current()
+        _local.profile = self.profile
+        return self.profile
+
+    def __exit__(self, *args):
+        _local.profile = self.outer
+        return False
+
+
+def log(report):
+    from FreeCAD import Console
+
+    Console.PrintLog(
+        "{import} {file}: {seconds:.3f} s, {cpu_seconds:.3f} s CPU, {peak} process peak RSS\n".format(
+            peak=_megabytes(report["process_peak_rss"]), **report
+        )
+    )
+    for entry in report["phases"]:
+        items = ", ".join(
+            "{} {}".format(value, key) for key, value in entry.items()
+            if key not in ("phase", "calls", "seconds", "cpu_seconds", "rss", "rss_growth", "peak_rss_growth")
+        )
+        line = "  {:28s} {:9.3f} s {:9.3f} s CPU {:>10s} RSS {:>10s} added {:>10s} peak rise  {}".format(
+            entry["phase"], entry["seconds"], entry["cpu_seconds"], _megabytes(entry["rss"]),
+            _megabytes(entry["rss_growth"]), _megabytes(entry["peak_rss_growth"]), items
+        )
+        Console.PrintLog(line.rstrip() + "\n")
+
+
+def _megabytes(nbytes):
+    return "{:.1f} MB".format(nbytes / 1e6) if nbytes is not None else "-"
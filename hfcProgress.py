@@ -0,0 +1,177 @@
+#
+
+__title__ = "hfc import progress"
+__author__ = "John Wang"
+
+## @package hfcProgress
+#  \ingroup FEM
+#  \brief progress report and cancel of the imports
+#
+#  The readers report the bytes of the input they have read and the nodes,
+#  elements and result rows they have parsed to the Progress of the running
+#  import. The Progress calls its callback at most once per interval with
+#  the fraction done, the items per second and a message. Without a
+#  Progress nothing is reported, which is the default in batch use.
+#
+#  Cancel is cooperative: Progress.cancel() may be called from any thread,
+#  the reader raises Cancelled at its next report. The importers check it
+#  before they add objects to the document, so a cancelled import leaves
+#  the document as it was.
+#
+#  progress = hfcProgress.Progress(lambda f, rate, msg: print(f, rate, msg))
+#  with hfcProgress.reporting(progress):
+#      importSU2Mesh.importSU2Mesh("wing.su2")
+
+import io
+import threading
+import time
+
+
+class Cancelled(Exception):
+    "raised inside a reader when its import is cancelled"
+    pass
+
+
+class Progress(object):
+    """progress of one import
+
+    callback(fraction, rate, message) is called at most once per interval
+    seconds, fraction is the part of the input bytes read, 0 to 1, and
+    rate the items parsed per second
+    """
+
+    def __init__(self, callback=None, interval=0.25):
+        self.callback = callback
+        self.interval = interval
+        self.total = 0
+        self.done = 0
+        self.items = 0
+        self.message = ""
+        self.cancelled = False
+        self.start_time = time.time()
+        self._next = 0.0
+
+    def start(self, total, message=""):
+        "a new input of total bytes starts, like the files of an Elmer mesh"
+        self.total += total
+        self.message = message
+        self._report(True)
+
+    def read(self, n):
+        "n more bytes of the input are read"
+        self.done += n
+        self._report(False)
+
+    def add(self, n, message=None):
+        "n more items are parsed"
+        self.items += n
+        if message is not None:
+            self.message = message
+        self._report(False)
+
+    def finish(self):
+        self.done = self.total
+        self._report(True)
+
+    @property
+    def fraction(self):
+        if not self.total:
+            return 0.0
+        return min(1.0, float(self.done) / self.total)
+
+    @property
+    def rate(self):
+        "items per second"
+        seconds = time.time() - self.start_time
+        return self.items / seconds if seconds > 0 else 0.0
+
+    def cancel(self):
+        "ask the import to stop, from any thread"
+        self.cancelled = True
+
+    def check(self):
+        if self.cancelled:
+            raise Cancelled("import cancelled")
+
+    def _report(self, force):
+        self.check()
+        if self.callback is None:
+            return
+        now = time.time()
+        if force or now >= self._next:
+            self._next = now + self.interval
+            self.callback(self.fraction, self.rate, self.message)
+
+
+class NoProgress(object):
+    "the Progress when none is set, every report costs a call"
+
+    cancelled = False
+    fraction = 0.0
+    rate = 0.0
+
+    def start(self, total, message=""):
+        pass
+
+    def read(self, n):
+        pass
+
+    def add(self, n, message=None):
+        pass
+
+    def finish(self):
+        pass
+
+    def cancel(self):
+        pass
+
+    def check(self):
+        pass
+
+
+NO_PROGRESS = NoProgress()
+
+# one import per thread, an import in a worker thread has its own Progress
+_local = threading.local()
+
+
+def current():
+    "the Progress of the import running in this thread, NO_PROGRESS if none"
+    return getattr(_local, "progress", NO_PROGRESS)
+
+
+class reporting(object):
+    "with reporting(progress): the imports in the block report to progress"
+
+    def __init__(self, progress):
+        self.progress = progress
+
+    def __enter__(self):
+        self.outer = current()
+        _local.progress = self.progress
+        return self.progress
+
+    def __exit__(self, *args):
+        _local.progress = self.outer
+        return False
+
+
+class ProgressFile(io.FileIO):
+    "a raw file reporting the bytes read to a Progress"
+
+    def __init__(self, path, progress):
+        io.FileIO.__init__(self, path, "r")
+        self.progress = progress
+
+    def readinto(self, b):
+        n = io.FileIO.readinto(self, b)
+        if n:
+            self.progress.read(n)
+        return n
+
+    def read(self, size=-1):
+        # the decompressors read the compressed file by read()
+        data = io.FileIO.read(self, size)
+        if data:
+            self.progress.read(len(data))
+        return data
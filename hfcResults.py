@@ -0,0 +1,148 @@
+#
+
+__title__ = "hfc result library"
+__author__ = "John Wang"
+
+## @package hfcResults
+#  \ingroup FEM
+#  \brief batched post-processing of imported result objects
+#
+#  The complementary result values of femresult.resulttools, that is
+#  DisplacementLengths, vonMises, the principal stresses, MaxShear and the
+#  Stats, are computed for all result objects of an import together. The
+#  fields of all result sets are stacked into arrays, computed in one
+#  numpy pass and written back to the result objects.
+
+import numpy as np
+
+
+def postprocess(res_objs):
+    """fill the complementary values of all result objects in res_objs
+
+    same values as restools.add_disp_apps, add_von_mises,
+    add_principal_stress_std and fill_femresult_stats. result objects
+    in an analysis with a reinforced material get their principal
+    stresses from restools.add_principal_stress_reinforced.
+    returns res_objs
+    """
+    if not res_objs:
+        return res_objs
+
+    disp = _stack([res_obj.DisplacementVectors for res_obj in res_objs], 3)
+    stress = _stack([
+        np.array([
+            res_obj.NodeStressXX, res_obj.NodeStressYY, res_obj.NodeStressZZ,
+            res_obj.NodeStressXY, res_obj.NodeStressXZ, res_obj.NodeStressYZ
+        ], np.float64).T
+        for res_obj in res_objs
+    ], 6)
+
+    disp_abs = np.sqrt((disp[0] ** 2).sum(axis=1))
+    von_mises = von_mises_stress(stress[0])
+    principal = principal_stress_std(stress[0])
+
+    reinforced = [has_reinforced_material(res_obj) for res_obj in res_objs]
+    for i, res_obj in enumerate(res_objs):
+        d = slice(disp[1][i], disp[1][i + 1])
+        s = slice(stress[1][i], stress[1][i + 1])
+        res_obj.DisplacementLengths = disp_abs[d].tolist()
+        principal_obj = principal[s]
+        if s.stop > s.start:
+            res_obj.vonMises = von_mises[s].tolist()
+            if reinforced[i]:
+                import femresult.resulttools as restools
+                restools.add_principal_stress_reinforced(res_obj)
+                # the Stats of the values the object shows
+                principal_obj = np.array([
+                    res_obj.PrincipalMax, res_obj.PrincipalMed,
+                    res_obj.PrincipalMin, res_obj.MaxShear
+                ], np.float64).T
+            else:
+                res_obj.PrincipalMax = principal[s, 0].tolist()
+                res_obj.PrincipalMed = principal[s, 1].tolist()
+                res_obj.PrincipalMin = principal[s, 2].tolist()
+                res_obj.MaxShear = principal[s, 3].tolist()
+        if hasattr(res_obj, "Stats"):
+            res_obj.Stats = stats(res_obj, disp[0][d], disp_abs[d], von_mises[s], principal_obj)
+    return res_objs
+
+
+def _stack(fields, ncols):
+    """stack the per result set rows in fields into one array
+
+    a field is an array or a sequence of rows, like a list of
+    FreeCAD.Vector, which numpy converts in one call.
+    returns the (n,ncols) array and the row offsets of the result sets
+    """
+    counts = [len(field) for field in fields]
+    offsets = np.concatenate(([0], np.cumsum(counts))).astype(int)
+    data = np.empty((offsets[-1], ncols))
+    for field, start, stop in zip(fields, offsets[:-1], offsets[1:]):
+        if stop > start:
+            data[start:stop] = np.asarray(field, np.float64).reshape(-1, ncols)
+    return data, offsets
+
+
+def von_mises_stress(stress):
+    "von Mises stress of (n,6) stress rows xx, yy, zz, xy, xz, yz"
+    xx, yy, zz, xy, xz, yz = stress.T
+    return np.sqrt(
+        0.5 * ((xx - yy) ** 2 + (yy - zz) ** 2 + (zz - xx) ** 2)
+        + 3.0 * (xy ** 2 + yz ** 2 + xz ** 2)
+    )
+
+
+def principal_stress_std(stress):
+    """principal stresses and max shear of (n,6) stress rows
+
+    returns (n,4) rows of PrincipalMax, PrincipalMed, PrincipalMin, MaxShear
+    """
+    n = len(stress)
+    tensor = np.empty((n, 3, 3))
+    tensor[:, 0, 0] = stress[:, 0]
+    tensor[:, 1, 1] = stress[:, 1]
+    tensor[:, 2, 2] = stress[:, 2]
+    tensor[:, 0, 1] = tensor[:, 1, 0] = stress[:, 3]
+    tensor[:, 0, 2] = tensor[:, 2, 0] = stress[:, 4]
+    tensor[:, 1, 2] = tensor[:, 2, 1] = stress[:, 5]
+    principal = np.empty((n, 4))
+    if n:
+        # eigvalsh gives them ascending
+        principal[:, :3] = np.linalg.eigvalsh(tensor)[:, ::-1]
+    principal[:, 3] = (principal[:, 0] - principal[:, 2]) / 2.0
+    return principal
+
+
+def stats(res_obj, disp, disp_abs, von_mises, principal):
+    """the Stats list of restools.fill_femresult_stats
+
+    min, avg and max of the x, y, z displacement, the displacement length,
+    von Mises, the three principal stresses, MaxShear, Peeq, Temperature,
+    MassFlowRate and NetworkPressure, zero for empty values
+    """
+    columns = [
+        disp[:, 0], disp[:, 1], disp[:, 2], disp_abs, von_mises,
+        principal[:, 0], principal[:, 1], principal[:, 2], principal[:, 3],
+    ]
+    for name in ("Peeq", "Temperature", "MassFlowRate", "NetworkPressure"):
+        columns.append(np.asarray(getattr(res_obj, name, []), np.float64))
+    values = []
+    for column in columns:
+        if len(column):
+            values += [float(column.min()), float(column.mean()), float(column.max())]
+        else:
+            values += [0.0, 0.0, 0.0]
+    return values
+
+
+def has_reinforced_material(res_obj):
+    "True if the analysis of res_obj holds a reinforced material"
+    if not res_obj.getParentGroup():
+        # if a pure result file was opened no analysis and thus no parent group
+        return False
+    import femtools.femutils as femutils
+    for obj in res_obj.getParentGroup().Group:
+        if obj.isDerivedFrom("App::MaterialObjectPython") \
+                and femutils.is_of_type(obj, "Fem::MaterialReinforced"):
+            return True
+    return False
@@ -20,6 +20,150 @@ def moveon(fp):
 			return line
 
 
+# files of an Elmer mesh directory, mesh.header, mesh.nodes, ...
+ELMER_MESH_FILES = ("header", "nodes", "elements", "boundary")
+
+# element type code of Elmer to the element lists of importToolsFem
+ELMER_ELEMENTS = {
+    202: "Seg2Elem",
+    203: "Seg2Elem",
+    303: "Tria3Elem",
+    306: "Tria3Elem",
+    404: "Quad4Elem",
+    408: "Quad4Elem",
+    504: "Tetra4Elem",
+    510: "Tetra4Elem",
+    605: "Pyra5Elem",
+    706: "Penta6Elem",
+    715: "Penta6Elem",
+    808: "Hexa8Elem",
+    820: "Hexa8Elem",
+}
+
+
+def elmer_lines(Elmer_file):
+    "yield the stripped lines of a Elmer mesh file, blank and % comment lines are skipped"
+    for line in Elmer_file:
+        line = line.strip()
+        if len(line) == 0 or line[0] == '%':
+            continue
+        yield line
+
+
+def elmer_file(prefix, name):
+    """the file name of a mesh or partition, prefix is path/mesh. or path/part.N.
+
+    a compressed file like mesh.nodes.gz is taken if the plain one is not there
+    """
+    from . import hfcIO
+    return hfcIO.find_input(prefix + name)
+
+
+def elmer_open(path, use_mmap=False):
+    "open a Elmer mesh file as text file or as hfcIO.MappedLines, compressed files are streamed"
+    from . import hfcIO
+    if use_mmap and hfcIO.compression(path) is None:
+        return hfcIO.MappedLines(path)
+    return hfcIO.open_input(path, "r")
+
+
+def elmer_part_bytes(prefix, iBND):
+    "size of the header, node and element files of a mesh or partition, for the progress"
+    names = ("header", "nodes", "boundary" if iBND == 1 else "elements")
+    paths = [elmer_file(prefix, name) for name in names]
+    return sum(os.path.getsize(path) for path in paths if os.path.exists(path))
+
+
+def elmer_chunked(pool, path, n):
+    "True if the n rows of the file path are parsed in chunks in the process pool"
+    from . import hfcIO
+    return pool is not None and n > hfcIO.BLOCK_LINES and hfcIO.compression(path) is None
+
+
+def elmer_source(Elmer_file):
+    "the lines of a file opened by elmer_open"
+    from . import hfcIO
+    if isinstance(Elmer_file, hfcIO.MappedLines):
+        return Elmer_file
+    return elmer_lines(Elmer_file)
+
+
+def elmer_node_block(mesh, text):
+    """add a block of mesh.nodes rows to the MeshBuilder mesh
+
+    id partition x y z, read in one numpy call,
+    returns the number of rows read
+    """
+    import numpy as np
+    from . import hfcIO
+
+    data = hfcIO.parse_float_rows(text, 5)
+    if data is None:
+        data = [[float(x) for x in line.split()[:5]] for line in text.splitlines() if line.strip()]
+        data = np.array(data, np.float64).reshape(-1, 5)
+    mesh.add_nodes(data[:, 0], data[:, 2:5])
+    return len(data)
+
+
+def elmer_element_block(mesh, text, iType, memStart, iBND):
+    """add a block of mesh.elements or mesh.boundary rows to the MeshBuilder mesh
+
+    the rows are read in one numpy call and grouped by the type code
+    in column iType, the nodes follow the type code. element numbers
+    count from memStart, with None the numbers of column 0 are kept.
+    returns the number of rows read
+    """
+    import numpy as np
+    from . import hfcMesh
+    from . import hfcIO
+
+    if iBND != 1 and ("/" in text if isinstance(text, str) else b"/" in text):
+        # halo elements of partitions are written as id/owner
+        import re
+        halo = r"/\d+" if isinstance(text, str) else rb"/\d+"
+        text = re.sub(halo, text[:0], text)
+    values, starts, lengths = hfcIO.parse_int_rows(text)
+    types = values[starts + iType]
+    for elem in np.unique(types).tolist():
+        rows = np.flatnonzero(types == elem)
+        if elem not in ELMER_ELEMENTS:
+            Console.PrintWarning(
+                "Elmer element type {} not supported yet, {} elements skipped.\n"
+                .format(elem, len(rows))
+            )
+            continue
+        name = ELMER_ELEMENTS[elem]
+        if iBND==1 and name != "Seg2Elem":
+            # only the boundary lines of 2D meshes are shown
+            continue
+        # higher order elements are shown by their corner nodes
+        k = hfcMesh.NUMBER_OF_NODES[name]
+        conn = hfcIO.take_columns(values, starts[rows], iType + 1, k)
+        if memStart is None:
+            ids = values[starts[rows]]
+        else:
+            ids = memStart + rows + 1
+        mesh.add_elements(name, ids, conn)
+    return len(starts)
+
+
+def elmer_chunk(text, iType=None, iBND=0, keep_ids=False):
+    """parse a chunk of mesh.nodes rows, or with iType of element rows,
+    runs in the processes of hfcIO.parse_chunks
+
+    element numbers count from 1 in the chunk unless keep_ids,
+    returns the MeshData and the number of rows read
+    """
+    from . import hfcMesh
+
+    mesh = hfcMesh.MeshBuilder()
+    if iType is None:
+        n = elmer_node_block(mesh, text)
+    else:
+        n = elmer_element_block(mesh, text, iType, None if keep_ids else 0, iBND)
+    return mesh.build(), n
+
+
 # ********* generic FreeCAD import and export methods *********
 if open.__module__ == "__builtin__":
     # because we'll redefine open below (Python2)
@@ -45,34 +189,76 @@ def insert(
     except NameError:
         doc = FreeCAD.newDocument(docname)
     FreeCAD.ActiveDocument = doc
-    importElmerMesh(filename)
-	
+    from . import hfcBackground
+    # with the GUI up the mesh is read in a worker thread
+    hfcBackground.run("importElmerMesh", filename, doc, read_Elmer_import, make_Elmer_objects)
+
 # ********* module specific methods *********
 def importElmerMesh(
     filename,
     analysis=None,
     result_name_prefix=""
 ):
+    from . import hfcProfile
+
+    profile = hfcProfile.start("importElmerMesh", filename)
+    try:
+        data = read_Elmer_import(filename, profile)
+        make_Elmer_objects(FreeCAD.ActiveDocument, data, profile, analysis, result_name_prefix)
+    finally:
+        profile.finish()
+
+
+def read_Elmer_import(
+    filename,
+    profile
+):
+    """the part of importElmerMesh without the document, may run in a worker thread
+
+    returns the MeshData and its FemMesh, which is None without nodes
+    """
+    from . import hfcMesh
+
+    with profile.phase("read") as phase:
+        m = read_Elmer_mesh(filename, 0, compact=True)
+        phase.count(nodes=m.node_count, elements=m.element_count, result_sets=len(m.results))
+    mesh = None
+    if m.node_count > 0:
+        with profile.phase("make_femmesh"):
+            mesh = hfcMesh.make_femmesh(m)
+    return m, mesh
+
+
+def make_Elmer_objects(
+    doc,
+    data,
+    profile,
+    analysis=None,
+    result_name_prefix=""
+):
+    "the objects of importElmerMesh in doc, data from read_Elmer_import, runs in the main thread"
     from . import importToolsFem
+    from . import hfcProgress
     import ObjectsFem
 
-    m = read_Elmer_mesh(filename,0)
+    m, mesh = data
     result_mesh_object = None
-    if len(m["Nodes"]) > 0:
-        mesh = importToolsFem.make_femmesh(m)
+    if m.node_count > 0:
+        # last point to cancel, nothing is in the document yet
+        hfcProgress.current().check()
         result_mesh_object = ObjectsFem.makeMeshResult(
-            FreeCAD.ActiveDocument,
+            doc,
             "Mesh"
         )
         result_mesh_object.FemMesh = mesh
-        res_mesh_is_compacted = False
-        nodenumbers_for_compacted_mesh = []
 
         number_of_increments = len(m["Results"])
         Console.PrintLog(
             "Increments: " + str(number_of_increments) + "\n"
         )
         if len(m["Results"]) > 0:
+            from . import hfcResults
+            res_objs = []
             for result_set in m["Results"]:
                 if "number" in result_set:
                     eigenmode_number = result_set["number"]
@@ -96,47 +282,23 @@ def importElmerMesh(
                         .format(result_name_prefix)
                     )
 
-                res_obj = ObjectsFem.makeResultMechanical(FreeCAD.ActiveDocument, results_name)
-                res_obj.Mesh = result_mesh_object
-                res_obj = importToolsFem.fill_femresult_mechanical(res_obj, result_set)
+                with profile.phase("fill_femresult") as phase:
+                    res_obj = ObjectsFem.makeResultMechanical(doc, results_name)
+                    res_obj.Mesh = result_mesh_object
+                    res_obj = importToolsFem.fill_femresult_mechanical(res_obj, result_set)
+                    phase.count(result_sets=1)
                 if analysis:
                     analysis.addObject(res_obj)
 
-                # complementary result object calculations
-                import femresult.resulttools as restools
-                import femtools.femutils as femutils
-                if not res_obj.MassFlowRate:
-                    if res_mesh_is_compacted is False:
-                        # first result set, compact FemMesh and NodeNumbers
-                        res_obj = restools.compact_result(res_obj)
-                        res_mesh_is_compacted = True
-                        nodenumbers_for_compacted_mesh = res_obj.NodeNumbers
-                    else:
-                        # all other result sets, do not compact FemMesh, only set NodeNumbers
-                        res_obj.NodeNumbers = nodenumbers_for_compacted_mesh
-
-                # fill DisplacementLengths
-                res_obj = restools.add_disp_apps(res_obj)
-                # fill StressValues
-                res_obj = restools.add_von_mises(res_obj)
-                if res_obj.getParentGroup():
-                    has_reinforced_mat = False
-                    for obj in res_obj.getParentGroup().Group:
-                        if obj.isDerivedFrom("App::MaterialObjectPython") \
-                                and femutils.is_of_type(obj, "Fem::MaterialReinforced"):
-                            has_reinforced_mat = True
-                            restools.add_principal_stress_reinforced(res_obj)
-                            break
-                    if has_reinforced_mat is False:
-                        # fill PrincipalMax, PrincipalMed, PrincipalMin, MaxShear
-                        res_obj = restools.add_principal_stress_std(res_obj)
-                else:
-                    # if a pure Elmer file was opened no analysis and thus no parent group
-                    # fill PrincipalMax, PrincipalMed, PrincipalMin, MaxShear
-                    res_obj = restools.add_principal_stress_std(res_obj)
-                # fill Stats
-                res_obj = restools.fill_femresult_stats(res_obj)
-                return res_obj
+                # the reader compacted the mesh and the result sets,
+                # so there is no restools.compact_result
+                res_objs.append(res_obj)
+
+            # DisplacementLengths, vonMises, principal stresses and Stats
+            # of all result sets in one pass
+            with profile.phase("postprocess") as phase:
+                hfcResults.postprocess(res_objs)
+                phase.count(result_sets=len(res_objs))
 
 
         else:
@@ -151,7 +313,8 @@ def importElmerMesh(
             if analysis:
                 import FemGui
                 FemGui.setActiveAnalysis(analysis)
-            FreeCAD.ActiveDocument.recompute()
+            with profile.phase("recompute"):
+                doc.recompute()
 
     else:
         Console.PrintError(
@@ -159,249 +322,272 @@ def importElmerMesh(
         )
 
 
-# read a Elmer result file and extract the nodes
-# displacement vectors and stress values.
+# read a Elmer mesh directory and extract the nodes and elements
+# with use_mmap the files are memory mapped and the blocks are parsed from the bytes
+# with processes the partitions of a partitioned mesh are read in a process pool,
+# and files of hfcIO.PARALLEL_BYTES and more are memory mapped and their blocks
+# are parsed in chunks in it. None takes hfcIO.PROCESSES, which is no pool by
+# default, 0 is one process per CPU, see hfcIO.pool_processes
+# with cache the parsed mesh is kept on disk by hfcCache, None takes hfcCache.ENABLED
+# with merge_tolerance the nodes closer than it are merged, like nodes of two
+# partitions which have no global number in common, None takes hfcMesh.MERGE_TOLERANCE
+# and the numbers of the merge are kept in merge_stats of the mesh
+# with compact the nodes no element uses are left out and the nodes are
+# numbered from 1 without gaps, see hfcMesh.compact
+# returns a hfcMesh.MeshData, m["Nodes"] and so on give the dicts of importToolsFem
 def read_Elmer_mesh(
     Elmer_input,
-	iBND
+    iBND,
+    use_mmap=False,
+    cache=None,
+    processes=None,
+    merge_tolerance=None,
+    compact=False
 ):
     Console.PrintMessage(
         "Read Elmer mesh from Elmer file: {}\n"
         .format(Elmer_input)
     )
-	
-    nodes = {}
-    elements_hexa8 = {}
-    elements_penta6 = {}
-    elements_tetra4 = {}
-    elements_tetra10 = {}
-    elements_penta15 = {}
-    elements_hexa20 = {}
-    elements_tria3 = {}
-    elements_tria6 = {}
-    elements_quad4 = {}
-    elements_quad8 = {}
-    elements_seg2 = {}
-    elements_seg3 = {}
+
+    from . import hfcMesh
+    from . import hfcIO
+    from . import hfcCache
+    from . import hfcProfile
+    from . import hfcProgress
+
+    mesh = hfcMesh.MeshBuilder()
     results = []
-    mode_results = {}
-    mode_results["number"] = float("NaN")
-    mode_results["time"] = float("NaN")
-    mode_disp = {}
-    mode_stress = {}
-    mode_strain = {}
-    mode_peeq = {}
-    mode_temp = {}
-    mode_massflow = {}
-    mode_networkpressure = {}
-
-    nodes_found = False
-    elements_found = False
-    mode_time_found = False
-    mode_disp_found = False
-    mode_stress_found = False
-    mode_strain_found = False
-    mode_peeq_found = False
-    mode_temp_found = False
-    mode_massflow_found = False
-    mode_networkpressure_found = False
-    end_of_section_found = False
-    end_of_Elmer_data_found = False
-    input_continues = False
-    mode_eigen_changed = False
-    mode_time_changed = False
-
-    eigenmode = 0
-    eigentemp = 0
-    elem = -1
-    elemType = 0
-    timestep = 0
-    timetemp = 0
-	
-    print ('Input = '+Elmer_input)
-	
-	#get path
-    data=Elmer_input.split("/")
-    n=len(data)
-    path=""
-    for i in range(n-1):
-        path=path+data[i]+"/"
-	
-    print ('path = '+path)
-	#1111111111111111111111111111111111111111111111111111
-    Elmer_header_file = pyopen(path+"mesh.header","r")
-	
+
+    # the mesh directory with a trailing separator, the files are path + "mesh.nodes" and so on
+    path = os.path.join(os.path.dirname(Elmer_input), "")
+
+    Console.PrintLog("Elmer mesh directory: {}\n".format(path))
+    partitioned = os.path.basename(os.path.dirname(path)).startswith("partitioning.")
+
+    if cache is None:
+        cache = hfcCache.ENABLED
+    if merge_tolerance is None:
+        merge_tolerance = hfcMesh.MERGE_TOLERANCE
+    options = (iBND,) + ((merge_tolerance, compact) if merge_tolerance or compact else ())
+    if cache:
+        # the mesh comes out of all four files, a change in any of them counts
+        if partitioned:
+            import glob
+            inputs = sorted(glob.glob(path + "part.*"))
+        else:
+            inputs = [elmer_file(path + "mesh.", name) for name in ELMER_MESH_FILES]
+        m = hfcCache.load(inputs, "Elmer", options)
+        if m is not None:
+            Console.PrintLog("Elmer mesh taken from the cache\n")
+            return m
+
+    if partitioned:
+        m = read_Elmer_partitions(path, iBND, processes, use_mmap)
+    else:
+        progress = hfcProgress.current()
+        progress.start(elmer_part_bytes(path + "mesh.", iBND), "Elmer mesh")
+        pool = hfcIO.chunk_pool(
+            [elmer_file(path + "mesh.", name) for name in ELMER_MESH_FILES], processes
+        )
+        if pool is None:
+            numNode, numMember = elmer_read_part(mesh, path + "mesh.", iBND, use_mmap, memStart=0)
+        else:
+            with pool:
+                numNode, numMember = elmer_read_part(mesh, path + "mesh.", iBND, memStart=0, pool=pool)
+        progress.finish()
+        Console.PrintLog("numNode = {}, numMember = {}\n".format(numNode, numMember))
+        m = mesh.build(results)
+        if not m.node_count:
+            Console.PrintError("FEM: No nodes found in Elmer file.\n")
+
+    if merge_tolerance and m.node_count:
+        with hfcProfile.phase("merge") as phase:
+            m, stats = hfcMesh.merge_coincident(m, merge_tolerance)
+            phase.count(merged_nodes=stats["merged"])
+    if compact and m.node_count:
+        with hfcProfile.phase("compact") as phase:
+            m = hfcMesh.compact(m)
+            phase.count(nodes=m.node_count)
+    if cache and m.node_count:
+        hfcCache.store(inputs, "Elmer", m, options)
+
+    return m
+
+
+def elmer_read_part(
+    mesh,
+    prefix,
+    iBND,
+    use_mmap=False,
+    memStart=None,
+    pool=None
+):
+    """read prefix + header, nodes and elements or boundary into the MeshBuilder mesh
+
+    prefix is path/mesh. of a serial mesh or path/part.N. of a partition.
+    element numbers count from memStart, with None the numbers
+    of the file are kept. with a process pool the files of more than
+    hfcIO.BLOCK_LINES rows are parsed in chunks.
+    returns the number of nodes and elements
+    """
+    from . import hfcIO
+    from . import hfcProfile
+    from . import hfcProgress
+
+    progress = hfcProgress.current()
+
+    #1111111111111111111111111111111111111111111111111111
+    Elmer_header_file = hfcIO.open_input(elmer_file(prefix, "header"), "r")
+
     line = Elmer_header_file.readline().strip()
     data=line.split()
     numNode=int(data[0])
     numMember=int(data[1])
     numBC=int(data[2])
-	
-    print ("numNode = "+str(numNode))
-    print ("numMember = "+str(numMember))
-	
-    #line = Elmer_header_file.readline().strip()
-    #NDIME=data[0]
 
     Elmer_header_file.close()
 
-	#node 22222222222222222222222222222222222222222222222222222222222222222222
-    Elmer_node_file = pyopen(path+"mesh.nodes","r")
-	#NPOIN= 52
-    tline=[]
-    for line in Elmer_node_file:
-        aline=line.strip()	
-        if len(aline)==0 or aline[0]=='%':
-            continue
-        else:		
-            tline.append(line.strip())
-		
-    Elmer_node_file.close()
-	
-    for idN in range(numNode): # node
-        #1 -1 0 1 0
-        dataNode = tline[idN].split()
-
-        nodes_x = float(dataNode[2])
-        nodes_y = float(dataNode[3])
-        nodes_z = float(dataNode[4])	
-        nodes[idN+1] = FreeCAD.Vector(nodes_x, nodes_y, nodes_z)
-		#print (str(nodes_x))
-
-
-		
-	#member 333333333333333333333333333
+    #node 22222222222222222222222222222222222222222222222222222222222222222222
+    #1 -1 0 1 0
+    with hfcProfile.phase("nodes") as phase:
+        rows = 0
+        if elmer_chunked(pool, elmer_file(prefix, "nodes"), numNode):
+            Elmer_node_file = hfcIO.MappedLines(elmer_file(prefix, "nodes"))
+            ranges = Elmer_node_file.ranges(numNode)
+        else:
+            Elmer_node_file = elmer_open(elmer_file(prefix, "nodes"), use_mmap)
+            ranges = None
+        with Elmer_node_file:
+            if ranges is not None:
+                for part, n in hfcIO.parse_chunks(pool, Elmer_node_file.path, ranges, elmer_chunk):
+                    mesh.add_mesh(part)
+                    rows += n
+                    phase.count(nodes=n)
+                    progress.add(n, "nodes")
+            else:
+                # also the chunks of a file with blank or comment lines
+                for text, n in hfcIO.text_blocks(elmer_source(Elmer_node_file), numNode):
+                    rows += elmer_node_block(mesh, text)
+                    phase.count(nodes=n)
+                    progress.add(n, "nodes")
+        hfcIO.check_rows("mesh.nodes", numNode, rows)
+
+    #member 333333333333333333333333333
+    # mesh.elements: id body type n1 n2 ...
+    # mesh.boundary: id boundary parent1 parent2 type n1 n2 ...
     if iBND==1:
-        Elmer_member_file = pyopen(path+"mesh.boundary","r")
+        Elmer_member_input = elmer_file(prefix, "boundary")
+        iType = 4
+        numMember = numBC
     else:
-        Elmer_member_file = pyopen(path+"mesh.elements","r")
-		
-    tline=[]
-    for line in Elmer_member_file:
-        aline=line.strip()	
-        if len(aline)==0 or aline[0]=='%':
-            continue
-        else:		
-            tline.append(line.strip())
-			
-    Elmer_member_file.close()
-	
-    nodeStart=0
-    memStart=0
-	
-    if iBND==1:
-        numMember=numBC	
-	
-    for idM in range(numMember): # Member
-        #print (tline[i])
-        #1 1 408 1 21 23 3 14 22 15 2
-		#
-        dataNode = tline[idM].split()
-        if iBND==1:
-            elem = int(dataNode[4])
+        Elmer_member_input = elmer_file(prefix, "elements")
+        iType = 2
+
+    with hfcProfile.phase("elements") as phase:
+        rows = 0
+        if elmer_chunked(pool, Elmer_member_input, numMember):
+            Elmer_member_file = hfcIO.MappedLines(Elmer_member_input)
+            ranges = Elmer_member_file.ranges(numMember)
         else:
-            elem = int(dataNode[2])
-		
-        if (elem==202 or elem==203 ):  #quadratic line
-			# 3   109  110
-            if iBND==1:
-                nd1 = int(dataNode[5])
-                nd2 = int(dataNode[6])
-                elements_seg2[memStart+idM+1] = (nodeStart+nd1, nodeStart+nd2)
-            else:
-                nd1 = int(dataNode[1])
-                nd2 = int(dataNode[2])
-                elements_seg2[memStart+idM+1] = (nodeStart+nd1, nodeStart+nd2)
-        elif (elem==303 or elem==306 ):  #triangle
-            if iBND==1:
-				#nd1 = int(dataNode[5])
-				#nd2 = int(dataNode[6])
-				#nd3 = int(dataNode[7])
-				#elements_tria3[memStart+idM+1] = (nodeStart+nd1, nodeStart+nd2, nodeStart+nd3)
-                continue
-            else:
-                nd1 = int(dataNode[5])
-                nd2 = int(dataNode[6])
-                nd3 = int(dataNode[7])
-                elements_tria3[memStart+idM+1] = (nodeStart+nd1, nodeStart+nd2, nodeStart+nd3)
-
-        elif (elem==404 or elem==408): #Quadrilateral
-		
-            if iBND==1:
-				#nd1 = int(dataNode[3])
-				#nd2 = int(dataNode[4])
-				#nd3 = int(dataNode[5])
-				#nd4 = int(dataNode[6])
-				#print (str(nd1))
-				#elements_quad4[memStart+idM+1] = (nodeStart+nd1, nodeStart+nd2, nodeStart+nd3, nodeStart+nd4)
-                continue
-            else:
-                nd1 = int(dataNode[3])
-                nd2 = int(dataNode[4])
-                nd3 = int(dataNode[5])
-                nd4 = int(dataNode[6])
-                #print (str(nd1))
-                elements_quad4[memStart+idM+1] = (nodeStart+nd1, nodeStart+nd2, nodeStart+nd3, nodeStart+nd4)
-			
-			
-        elif (elem==510): #Tetrahedral
-            if iBND==1:
-                continue
-            else:
-				#10	17331	102263	102225	102187	36
-                nd1 = int(dataNode[3])
-                nd2 = int(dataNode[4])
-                nd3 = int(dataNode[5])
-                nd4 = int(dataNode[6])
-                elements_tetra4[memStart+idM+1] = (nodeStart+nd1, nodeStart+nd2, nodeStart+nd3, nodeStart+nd4)
-			
-        elif (elem==808): #Hexahedral
-            if iBND==1:
-                continue
+            Elmer_member_file = elmer_open(Elmer_member_input, use_mmap)
+            ranges = None
+        with Elmer_member_file:
+            if ranges is not None:
+                for part, n in hfcIO.parse_chunks(
+                    pool, Elmer_member_file.path, ranges, elmer_chunk,
+                    (iType, iBND, memStart is None)
+                ):
+                    mesh.add_mesh(part, element_offset=memStart or 0)
+                    if memStart is not None:
+                        memStart += n
+                    rows += n
+                    phase.count(elements=n)
+                    progress.add(n, "elements")
             else:
-				#12	0	1	21	20	800	801	821	820	0
-                nd1 = int(dataNode[3])
-                nd2 = int(dataNode[4])
-                nd3 = int(dataNode[5])
-                nd4 = int(dataNode[6])
-                nd5 = int(dataNode[7])
-                nd6 = int(dataNode[8])
-                nd7 = int(dataNode[9])
-                nd8 = int(dataNode[10])
-                elements_hexa8[memStart+idM+1] = (nodeStart+nd1, nodeStart+nd2, nodeStart+nd3, nodeStart+nd4, nodeStart+nd5, nodeStart+nd6, nodeStart+nd7, nodeStart+nd8)
-        elif (elem==13): #Prism
+                for text, n in hfcIO.text_blocks(elmer_source(Elmer_member_file), numMember):
+                    #1 1 408 1 21 23 3 14 22 15 2
+                    n = elmer_element_block(mesh, text, iType, memStart, iBND)
+                    if memStart is not None:
+                        memStart += n
+                    rows += n
+                    phase.count(elements=n)
+                    progress.add(n, "elements")
+        hfcIO.check_rows(os.path.basename(hfcIO.plain_name(Elmer_member_input)), numMember, rows)
+
+    return numNode, numMember
+
+
+def read_Elmer_part(
+    prefix,
+    iBND,
+    use_mmap=False
+):
+    "read one partition of a partitioned mesh, runs in the worker processes"
+    from . import hfcMesh
+
+    mesh = hfcMesh.MeshBuilder()
+    elmer_read_part(mesh, prefix, iBND, use_mmap)
+    return mesh.build()
+
+
+# read a ElmerGrid partitioned mesh directory partitioning.N
+# the part.*.header / nodes / elements / boundary files are read in
+# a process pool with processes, see hfcIO.pool_processes, nodes on the
+# partition interfaces are in several parts and are kept once by their
+# global number
+# returns a hfcMesh.MeshData
+def read_Elmer_partitions(
+    partition_dir,
+    iBND=0,
+    processes=None,
+    use_mmap=False
+):
+    import glob
+    from . import hfcMesh
+    from . import hfcIO
+    from . import hfcProgress
+
+    Console.PrintMessage(
+        "Read Elmer partitioned mesh from: {}\n"
+        .format(partition_dir)
+    )
+    prefixes = set()
+    for header in glob.glob(os.path.join(partition_dir, "part.*.header*")):
+        # part.N.header or a compressed part.N.header.gz
+        header = hfcIO.plain_name(header)
+        if not header.endswith(".header"):
             continue
-        elif (elem==14): #Pyramid
-            if iBND==1:
-                continue
-            else:
-				#10	17331	102263	102225	102187	36
-                nd1 = int(dataNode[1])
-                nd2 = int(dataNode[2])
-                nd3 = int(dataNode[3])
-                nd4 = int(dataNode[4])
-                nd5 = int(dataNode[5])
-                elements_tetra4[memStart+idM+1] = (nodeStart+nd1+1, nodeStart+nd2+1, nodeStart+nd3+1, nodeStart+nd4+1, nodeStart+nd5+1)
-        else:
-            print ("elem=")+str(elem)+" not supprot yet."			
-	
-
-    if not nodes:
-        Console.PrintError("FEM: No nodes found in Elmer file.\n")
-
-    return {
-        "Nodes": nodes,
-        "Seg2Elem": elements_seg2,
-        "Seg3Elem": elements_seg3,
-        "Tria3Elem": elements_tria3,
-        "Tria6Elem": elements_tria6,
-        "Quad4Elem": elements_quad4,
-        "Quad8Elem": elements_quad8,
-        "Tetra4Elem": elements_tetra4,
-        "Tetra10Elem": elements_tetra10,
-        "Hexa8Elem": elements_hexa8,
-        "Hexa20Elem": elements_hexa20,
-        "Penta6Elem": elements_penta6,
-        "Penta15Elem": elements_penta15,
-        "Results": results
-    }
+        prefix = header[:-len("header")]
+        prefixes.add((int(prefix.rsplit(".", 2)[-2]), prefix))
+    prefixes = [prefix for number, prefix in sorted(prefixes)]
+    Console.PrintLog("partitions = {}\n".format(len(prefixes)))
+    progress = hfcProgress.current()
+    progress.start(sum(elmer_part_bytes(prefix, iBND) for prefix in prefixes), "Elmer partitions")
+
+    pool = hfcIO.process_pool(processes) if len(prefixes) > 1 else None
+    if pool is None:
+        parts = [read_Elmer_part(prefix, iBND, use_mmap) for prefix in prefixes]
+    else:
+        with pool:
+            parts = []
+            # the workers can not reach the progress, it moves on per partition
+            for prefix, part in zip(prefixes, pool.map(
+                read_Elmer_part,
+                prefixes,
+                [iBND] * len(prefixes),
+                [use_mmap] * len(prefixes)
+            )):
+                parts.append(part)
+                progress.read(elmer_part_bytes(prefix, iBND))
+                progress.add(part.node_count + part.element_count, "partitions")
+    progress.finish()
+
+    m, shared_nodes = hfcMesh.merge_by_id(parts)
+    Console.PrintLog(
+        "numNode = {}, shared interface nodes = {}, numMember = {}\n"
+        .format(m.node_count, shared_nodes, m.element_count)
+    )
+    if not m.node_count:
+        Console.PrintError("FEM: No nodes found in Elmer partitions.\n")
+
+    return m
@@ -12,6 +12,25 @@ from FreeCAD import Console
 import os
 
 
+# columns of the member property table of the case model
+FRAME3DD_MEMBER_PROPERTIES = ("Ax", "Asy", "Asz", "Jx", "Iy", "Iz", "E", "G", "roll", "density")
+# the settings lines after the members, in file order
+FRAME3DD_SETTINGS = ("shear", "geometric_stiffness", "exaggerate_static", "zoom_scale", "dx")
+# the loads of a static load case after the gravity values, in file order:
+# name, columns with the node or member number in front, parts of a row,
+# a trapezoidal load has one part x1 x2 w1 w2 for each local axis
+FRAME3DD_LOADS = (
+    ("nodal_loads", 7, 1),               # node Fx Fy Fz Mxx Myy Mzz
+    ("uniform_loads", 4, 1),             # member Ux Uy Uz
+    ("trapezoidal_loads", 13, 3),        # member, x1 x2 w1 w2 for local x, y and z
+    ("point_loads", 5, 1),               # member Px Py Pz x
+    ("temperature_loads", 8, 1),         # member a hy hz Ty+ Ty- Tz+ Tz-
+    ("prescribed_displacements", 7, 1),  # node Dx Dy Dz Dxx Dyy Dzz
+)
+# the modal settings lines after the number of modes, in file order
+FRAME3DD_MODAL_SETTINGS = ("method", "lump", "tolerance", "shift", "exaggerate_modal")
+
+
 # ********* generic FreeCAD import and export methods *********
 if open.__module__ == "__builtin__":
     # because we'll redefine open below (Python2)
@@ -37,34 +56,76 @@ def insert(
     except NameError:
         doc = FreeCAD.newDocument(docname)
     FreeCAD.ActiveDocument = doc
-    importFrame3DDCase(filename)
-	
+    from . import hfcBackground
+    # with the GUI up the case file is read in a worker thread
+    hfcBackground.run("importFrame3DDCase", filename, doc, read_Frame3DD_case_import, make_Frame3DD_case_objects)
+
 # ********* module specific methods *********
 def importFrame3DDCase(
     filename,
     analysis=None,
     result_name_prefix=""
 ):
+    from . import hfcProfile
+
+    profile = hfcProfile.start("importFrame3DDCase", filename)
+    try:
+        data = read_Frame3DD_case_import(filename, profile)
+        make_Frame3DD_case_objects(FreeCAD.ActiveDocument, data, profile, analysis, result_name_prefix)
+    finally:
+        profile.finish()
+
+
+def read_Frame3DD_case_import(
+    filename,
+    profile
+):
+    """the part of importFrame3DDCase without the document, may run in a worker thread
+
+    returns the MeshData and its FemMesh, which is None without nodes
+    """
+    from . import hfcMesh
+
+    with profile.phase("read") as phase:
+        m = read_Frame3DD_case(filename, compact=True)
+        phase.count(nodes=m.node_count, elements=m.element_count, result_sets=len(m.results))
+    mesh = None
+    if m.node_count > 0:
+        with profile.phase("make_femmesh"):
+            mesh = hfcMesh.make_femmesh(m)
+    return m, mesh
+
+
+def make_Frame3DD_case_objects(
+    doc,
+    data,
+    profile,
+    analysis=None,
+    result_name_prefix=""
+):
+    "the objects of importFrame3DDCase in doc, data from read_Frame3DD_case_import, runs in the main thread"
     from . import importToolsFem
+    from . import hfcProgress
     import ObjectsFem
 
-    m = read_Frame3DD_case(filename)
+    m, mesh = data
     result_mesh_object = None
-    if len(m["Nodes"]) > 0:
-        mesh = importToolsFem.make_femmesh(m)
+    if m.node_count > 0:
+        # last point to cancel, nothing is in the document yet
+        hfcProgress.current().check()
         result_mesh_object = ObjectsFem.makeMeshResult(
-            FreeCAD.ActiveDocument,
+            doc,
             "ResultMesh"
         )
         result_mesh_object.FemMesh = mesh
-        res_mesh_is_compacted = False
-        nodenumbers_for_compacted_mesh = []
 
         number_of_increments = len(m["Results"])
         Console.PrintLog(
             "Increments: " + str(number_of_increments) + "\n"
         )
         if len(m["Results"]) > 0:
+            from . import hfcResults
+            res_objs = []
             for result_set in m["Results"]:
                 if "number" in result_set:
                     eigenmode_number = result_set["number"]
@@ -88,58 +149,25 @@ def importFrame3DDCase(
                         .format(result_name_prefix)
                     )
 
-                res_obj = ObjectsFem.makeResultMechanical(FreeCAD.ActiveDocument, results_name)
-                res_obj.Mesh = result_mesh_object
-                res_obj = importToolsFem.fill_femresult_mechanical(res_obj, result_set)
+                with profile.phase("fill_femresult") as phase:
+                    res_obj = ObjectsFem.makeResultMechanical(doc, results_name)
+                    res_obj.Mesh = result_mesh_object
+                    res_obj = importToolsFem.fill_femresult_mechanical(res_obj, result_set)
+                    phase.count(result_sets=1)
                 if analysis:
                     analysis.addObject(res_obj)
 
-                # complementary result object calculations
-                import femresult.resulttools as restools
-                import femtools.femutils as femutils
-                if not res_obj.MassFlowRate:
-                    # information 1:
-                    # only compact result if not Flow 1D results
-                    # compact result object, workaround for bug 2873
-                    # https://www.freecadweb.org/tracker/view.php?id=2873
-                    # information 2:
-                    # if the result data has multiple result sets there will be multiple result objs
-                    # they all will use one mesh obj
-                    # on the first res obj fill the mesh obj will be compacted, thus
-                    # it does not need to be compacted on further result sets
-                    # but NodeNumbers need to be compacted for every result set (res object fill)
-                    # example Frame3DD file: https://forum.freecadweb.org/viewtopic.php?t=32649#p274291
-                    if res_mesh_is_compacted is False:
-                        # first result set, compact FemMesh and NodeNumbers
-                        res_obj = restools.compact_result(res_obj)
-                        res_mesh_is_compacted = True
-                        nodenumbers_for_compacted_mesh = res_obj.NodeNumbers
-                    else:
-                        # all other result sets, do not compact FemMesh, only set NodeNumbers
-                        res_obj.NodeNumbers = nodenumbers_for_compacted_mesh
-
-                # fill DisplacementLengths
-                res_obj = restools.add_disp_apps(res_obj)
-                # fill StressValues
-                res_obj = restools.add_von_mises(res_obj)
-                if res_obj.getParentGroup():
-                    has_reinforced_mat = False
-                    for obj in res_obj.getParentGroup().Group:
-                        if obj.isDerivedFrom("App::MaterialObjectPython") \
-                                and femutils.is_of_type(obj, "Fem::MaterialReinforced"):
-                            has_reinforced_mat = True
-                            restools.add_principal_stress_reinforced(res_obj)
-                            break
-                    if has_reinforced_mat is False:
-                        # fill PrincipalMax, PrincipalMed, PrincipalMin, MaxShear
-                        res_obj = restools.add_principal_stress_std(res_obj)
-                else:
-                    # if a pure Frame3DD file was opened no analysis and thus no parent group
-                    # fill PrincipalMax, PrincipalMed, PrincipalMin, MaxShear
-                    res_obj = restools.add_principal_stress_std(res_obj)
-                # fill Stats
-                res_obj = restools.fill_femresult_stats(res_obj)
-                return res_obj
+                # the reader compacted the mesh and the result sets, the
+                # workaround for bug 2873 without a restools.compact_result
+                # https://www.freecadweb.org/tracker/view.php?id=2873
+                # all result objects use the one compacted mesh object
+                res_objs.append(res_obj)
+
+            # DisplacementLengths, vonMises, principal stresses and Stats
+            # of all result sets in one pass
+            with profile.phase("postprocess") as phase:
+                hfcResults.postprocess(res_objs)
+                phase.count(result_sets=len(res_objs))
 
 
         else:
@@ -158,7 +186,8 @@ def importFrame3DDCase(
             if analysis:
                 import FemGui
                 FemGui.setActiveAnalysis(analysis)
-            FreeCAD.ActiveDocument.recompute()
+            with profile.phase("recompute"):
+                doc.recompute()
 
     else:
         Console.PrintError(
@@ -166,17 +195,25 @@ def importFrame3DDCase(
         )
 
 
-# read a Frame3DD result file and extract the nodes
-# displacement vectors and stress values.
+# read a Frame3DD case file and extract the nodes and members
+# and the complete model as column arrays in m.model: node radius, restraints,
+# member properties, settings, static load cases and modal settings
+# with compact the nodes no member uses are left out and the nodes are
+# numbered from 1 without gaps, see hfcMesh.compact, m.model keeps the
+# node numbers of the file, m.file_ids maps them
+# returns a hfcMesh.MeshData, m["Nodes"] and so on give the dicts of importToolsFem
 def read_Frame3DD_case(
-    Frame3DD_input
+    Frame3DD_input,
+    compact=False
 ):
     Console.PrintMessage(
         "Read Frame3DD results from Frame3DD file: {}\n"
         .format(Frame3DD_input)
     )
+    from . import hfcIO
+
     inout_nodes = []
-    inout_nodes_file = Frame3DD_input.rsplit(".", 1)[0] + "_inout_nodes.txt"
+    inout_nodes_file = hfcIO.plain_name(Frame3DD_input).rsplit(".", 1)[0] + "_inout_nodes.txt"
     if os.path.exists(inout_nodes_file):
         Console.PrintMessage(
             "Read special 1DFlow nodes data form: {}\n".format(inout_nodes_file)
@@ -188,217 +225,65 @@ def read_Frame3DD_case(
             inout_nodes.append(a)
         f.close()
         Console.PrintMessage("{}\n".format(inout_nodes))
-    Frame3DD_file = pyopen(Frame3DD_input, "r")
-    nodes = {}
-    elements_hexa8 = {}
-    elements_penta6 = {}
-    elements_tetra4 = {}
-    elements_tetra10 = {}
-    elements_penta15 = {}
-    elements_hexa20 = {}
-    elements_tria3 = {}
-    elements_tria6 = {}
-    elements_quad4 = {}
-    elements_quad8 = {}
-    elements_seg2 = {}
-    elements_seg3 = {}
-    results = []
-    mode_results = {}
-    mode_results["number"] = float("NaN")
-    mode_results["time"] = float("NaN")
-    mode_disp = {}
-    mode_stress = {}
-    mode_strain = {}
-    mode_peeq = {}
-    mode_temp = {}
-    mode_massflow = {}
-    mode_networkpressure = {}
-
-    nodes_found = False
-    elements_found = False
-    mode_time_found = False
-    mode_disp_found = False
-    mode_stress_found = False
-    mode_strain_found = False
-    mode_peeq_found = False
-    mode_temp_found = False
-    mode_massflow_found = False
-    mode_networkpressure_found = False
-    end_of_section_found = False
-    end_of_Frame3DD_data_found = False
-    input_continues = False
-    mode_eigen_changed = False
-    mode_time_changed = False
-
-    eigenmode = 0
-    eigentemp = 0
-    elem = -1
-    elemType = 0
-    timestep = 0
-    timetemp = 0
-
-    tline=[]
-    for line in Frame3DD_file:
-        tline.append(line.strip())
-		
-    i=1	
-    #Console.PrintError(tline[i]+'\n')
-		
-	#node 1111111111111111111111111111111111111111111111111111111
-    while 1:
-        i=i+1
-        #print (tline[i])
-        if len(tline[i])==0 or tline[i][0]=='#':
-            continue
-        else:
-            break
+    import numpy as np
+    from . import hfcMesh
+    from . import hfcIO
+    from . import hfcProfile
+    from . import hfcProgress
 
+    progress = hfcProgress.current()
+    progress.start(os.path.getsize(Frame3DD_input), "Frame3DD case")
+    Frame3DD_file = hfcIO.open_input(Frame3DD_input, "r")
 
-    print ("")			
-    data = tline[i].split()
-    numNode =  int(data[0])
-    print ("numNode: "+str(numNode))
+    mesh = hfcMesh.MeshBuilder()
+    results = []
 
+    # the file is read as one stream of values, Frame3DD allows any
+    # line breaks between them and comments after # or %, line 0 is the title
+    tokens = hfcIO.TokenStream(Frame3DD_file)
+    model = {"title": tokens.line()}
 
-    while 1:
-        i=i+1
-        #print (tline[i])
-        if len(tline[i])==0 or tline[i][0]=='#':
-            continue
-        else:
-            break
-
-    print (tline[i])
-    dataNode = tline[i].split()
-
-    elem = int(dataNode[0])
-    nodes_x = float(dataNode[1])
-    nodes_y = float(dataNode[2])
-    nodes_z = float(dataNode[3])
-    nodes[elem] = FreeCAD.Vector(nodes_x, nodes_y, nodes_z)
-
-    for id in range(1,numNode): # node
-	    #1       0.000000       0.000000       0.000000    0.000   1  1  1  1  1  0
-        while 1:
-            i=i+1
-            #print (tline[i])
-            if len(tline[i])==0 or tline[i][0]=='#':
-                continue
-            else:
-                break
-        print (tline[i])
-        dataNode = tline[i].split()
-
-        elem = int(dataNode[0])
-        nodes_x = float(dataNode[1])
-        nodes_y = float(dataNode[2])
-        nodes_z = float(dataNode[3])
-        nodes[elem] = FreeCAD.Vector(nodes_x, nodes_y, nodes_z)
+    #node 1111111111111111111111111111111111111111111111111111111
+    #.node  x       y       z       r
+    numNode = tokens.count()
+    data = tokens.table(numNode, 5)
+    mesh.add_nodes(data[:, 0], data[:, 1:4])
+    model["node_radius"] = data[:, 4]
+    Console.PrintLog("numNode: {}\n".format(numNode))
 
     #number of nodes with reactions 22222222222222222222222222222222222222222
-    while 1:
-        i=i+1
-        #print (tline[i])
-        if len(tline[i])==0 or tline[i][0]=='#':
-            continue
-        else:
-            break
-
-
-    print ("")			
-    data = tline[i].split()
-    numReaction =  int(data[0])
-    print ("numReaction: "+str(numReaction))
-
-    if (numReaction>0):
-        while 1:
-            i=i+1
-            #print (tline[i])
-            if len(tline[i])==0 or tline[i][0]=='#':
-                continue
-            else:
-                break
-
-
-        print (tline[i])
-        dataReaction = tline[i].split()
-
-        #elem = int(dataReaction[0])
-        #nodes_x = float(dataReaction[1])
-        #nodes_y = float(dataReaction[2])
-        #nodes_z = float(dataReaction[3])
-        #nodes[elem] = FreeCAD.Vector(nodes_x, nodes_y, nodes_z)
-
-        for id in range(1,numReaction): # node
-            #1       0.000000       0.000000       0.000000    0.000   1  1  1  1  1  0
-            #i=i+1
-            while 1:
-                i=i+1
-                #print (tline[i])
-                if len(tline[i])==0 or tline[i][0]=='#':
-                    continue
-                else:
-                    break
-            print (tline[i])
-            #dataNode = tline[i].split()
-
-            #elem = int(dataNode[0])
-            #nodes_x = float(dataNode[1])
-            #nodes_y = float(dataNode[2])
-            #nodes_z = float(dataNode[3])
-            #nodes[elem] = FreeCAD.Vector(nodes_x, nodes_y, nodes_z)
-	
-	
+    #.n     x  y  z xx yy zz          1=fixed, 0=free
+    numReaction = tokens.count()
+    data = tokens.table(numReaction, 7)
+    model["restraints"] = {
+        "ids": data[:, 0].astype(hfcMesh.ID_TYPE),
+        "flags": data[:, 1:7].astype(np.int8),
+    }
+    Console.PrintLog("numReaction: {}\n".format(numReaction))
+
     #Member 333333333333333333333333333333333333333333333333333333
-    while 1:
-        i=i+1
-        #print (tline[i])
-        if len(tline[i])==0 or tline[i][0]=='#':
-            continue
-        else:
-            break
-
-    print ("")			
-    data = tline[i].split()
-    numMember =  int(data[0])
-    print ("numMember: "+str(numMember))
-
-    while 1:
-        i=i+1
-        #print (tline[i])
-        if len(tline[i])==0 or tline[i][0]=='#':
-            continue
-        else:
-            break
-		
-    print (tline[i])
-    dataNode = tline[i].split()
-    elem = int(dataNode[0])
-    nd1 = int(dataNode[1])
-    nd2 = int(dataNode[2])
-    elements_seg2[elem] = (nd1, nd2)
-    for id in range(1,numMember): # Member
-        #i=i+1
-        while 1:
-            i=i+1
-            #print (tline[i])
-            if len(tline[i])==0 or tline[i][0]=='#':
-                continue
-            else:
-                break
-        print (tline[i])
-        dataNode = tline[i].split()
-        elem = int(dataNode[0])
-        nd1 = int(dataNode[1])
-        nd2 = int(dataNode[2])
-        elements_seg2[elem] = (nd1, nd2)
-
-
-        # here we are in the indent of loop for every line in Frame3DD file
-        # do not add a print here :-)
-
-    # close Frame3DD file if loop over all lines is finished
+    #.e n1 n2 Ax    Asy     Asz     Jx     Iy     Iz     E       G   roll density
+    numMember = tokens.count()
+    data = tokens.table(numMember, 3 + len(FRAME3DD_MEMBER_PROPERTIES))
+    mesh.add_elements("Seg2Elem", data[:, 0], data[:, 1:3])
+    model["members"] = {"ids": data[:, 0].astype(hfcMesh.ID_TYPE), "properties": data[:, 3:]}
+    Console.PrintLog("numMember: {}\n".format(numMember))
+    progress.add(numNode + numMember, "members")
+
+    # older files end after the members
+    if not tokens.at_end():
+        for name in FRAME3DD_SETTINGS:
+            model[name] = tokens.floats(1)[0]
+        model["load_cases"] = []
+        numLC = tokens.count()
+        for lc in range(numLC):
+            model["load_cases"].append(frame3dd_load_case(tokens))
+        Console.PrintLog("numLC: {}\n".format(numLC))
+        model["modal"] = frame3dd_modal(tokens)
+
+    # close Frame3DD file if all values are read
     Frame3DD_file.close()
+    progress.finish()
 
     """
     # debug prints and checks with the read data
@@ -415,22 +300,65 @@ def read_Frame3DD_case(
                 Console.PrintError(
                     "We have mflow or npressure, but no inout_nodes file.\n"
                 )
-    if not nodes:
+    m = mesh.build(results)
+    m.model = model
+    if not m.node_count:
         Console.PrintError("FEM: No nodes found in Frame3DD file.\n")
+    elif compact:
+        with hfcProfile.phase("compact") as phase:
+            m = hfcMesh.compact(m)
+            phase.count(nodes=m.node_count)
 
-    return {
-        "Nodes": nodes,
-        "Seg2Elem": elements_seg2,
-        "Seg3Elem": elements_seg3,
-        "Tria3Elem": elements_tria3,
-        "Tria6Elem": elements_tria6,
-        "Quad4Elem": elements_quad4,
-        "Quad8Elem": elements_quad8,
-        "Tetra4Elem": elements_tetra4,
-        "Tetra10Elem": elements_tetra10,
-        "Hexa8Elem": elements_hexa8,
-        "Hexa20Elem": elements_hexa20,
-        "Penta6Elem": elements_penta6,
-        "Penta15Elem": elements_penta15,
-        "Results": results
-    }
+    return m
+
+
+def frame3dd_load_case(tokens):
+    """the next static load case of the hfcIO.TokenStream tokens
+
+    returns {"gravity": (3,), "nodal_loads": {"ids": ..., "values": ...}, ...}
+    with the loads of FRAME3DD_LOADS
+    """
+    import numpy as np
+    from . import hfcMesh
+
+    load_case = {"gravity": np.array(tokens.floats(3))}
+    for name, ncols, parts in FRAME3DD_LOADS:
+        n = tokens.count()
+        data = tokens.table(n, ncols)
+        values = data[:, 1:]
+        if parts > 1:
+            values = values.reshape(n, parts, (ncols - 1) // parts)
+        load_case[name] = {"ids": data[:, 0].astype(hfcMesh.ID_TYPE), "values": values}
+    return load_case
+
+
+def frame3dd_modal(tokens):
+    """the modal analysis settings of the hfcIO.TokenStream tokens
+
+    returns None if no modes are wanted, else a dict of the number of modes,
+    FRAME3DD_MODAL_SETTINGS, the extra node inertia (mass Ixx Iyy Izz) and
+    extra member mass tables and the modes to animate
+    """
+    from . import hfcMesh
+
+    if tokens.at_end():
+        return None
+    modes = tokens.count()
+    if modes == 0:
+        return None
+    modal = {"modes": modes}
+    for name in FRAME3DD_MODAL_SETTINGS:
+        modal[name] = tokens.floats(1)[0]
+    for name, ncols in (("extra_node_inertia", 5), ("extra_member_mass", 2)):
+        n = tokens.count()
+        data = tokens.table(n, ncols)
+        modal[name] = {"ids": data[:, 0].astype(hfcMesh.ID_TYPE), "values": data[:, 1:]}
+    modal["animate"] = []
+    if not tokens.at_end():
+        # the list of modes is left out if no mode is animated
+        animate = tokens.count()
+        if animate:
+            modal["animate"] = [int(x) for x in tokens.floats(animate)]
+    if not tokens.at_end():
+        modal["pan_rate"] = tokens.floats(1)[0]
+    return modal
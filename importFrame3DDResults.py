@@ -10,21 +10,23 @@ __author__ = "John Wang based on importCcxFrdResults.py"
 import FreeCAD
 from FreeCAD import Console
 import os
-import Fem
-
-class Node:
-    def __init__(self, id , x,y,z):
-        self.x = x
-        self.y = y
-        self.z = z
-        self.id = str(id)
-
-# elmnt n1     n2    Ax     Asy     Asz     Jx     Iy     Iz     E     G     roll  density
-class Member:
-    def __init__(self, id , n1,n2):
-        self.n1 = n1
-        self.n2 = n2
-        self.id = str(id)
+import re
+from itertools import islice
+
+
+# section headers of the Frame3DD output file, matched at the start of the stripped lines
+# the file is read as bytes, the numbers are parsed by int() and float() from bytes
+FRAME3DD_SECTIONS = re.compile(
+    rb"(?P<counts>In 2D problems the Y-axis is vertical)"
+    rb"|(?P<nodes>N O D E   D A T A)"
+    rb"|(?P<members>F R A M E   E L E M E N T   D A T A)"
+    rb"|(?P<elastic>E L A S T I C   S T I F F N E S S   A N A L Y S I S)"
+    rb"|(?P<modal>M O D A L   A N A L Y S I S   R E S U L T S)"
+    rb"|(?P<mode>M O D E +\d+:)"
+    rb"|(?P<disp>Node +X-dsp +Y-dsp +Z-dsp)"
+    rb"|(?P<forces>F R A M E   E L E M E N T   E N D   F O R C E S)"
+    rb"|(?P<reactions>R E A C T I O N S)"
+)
 
 # ********* generic FreeCAD import and export methods *********
 if open.__module__ == "__builtin__":
@@ -51,200 +53,114 @@ def insert(
     except NameError:
         doc = FreeCAD.newDocument(docname)
     FreeCAD.ActiveDocument = doc
-    importFrame3DD(filename)
-	
+    from . import hfcBackground
+    # with the GUI up the output file is read in a worker thread
+    hfcBackground.run("importFrame3DD", filename, doc, read_Frame3DD_import, make_Frame3DD_objects)
+
 # ********* module specific methods *********
 def importFrame3DD(
     filename,
     analysis=None,
+    result_name_prefix="",
+    loadcases=None,
+    modes=None
+):
+    from . import hfcProfile
+
+    profile = hfcProfile.start("importFrame3DD", filename)
+    try:
+        data = read_Frame3DD_import(filename, profile, loadcases, modes)
+        return make_Frame3DD_objects(FreeCAD.ActiveDocument, data, profile, analysis, result_name_prefix)
+    finally:
+        profile.finish()
+
+
+def read_Frame3DD_import(
+    filename,
+    profile,
+    loadcases=None,
+    modes=None
+):
+    """the part of importFrame3DD without the document, may run in a worker thread
+
+    returns the MeshData and its FemMesh, which is None without nodes
+    """
+    from . import hfcMesh
+
+    # one pass over the output file gives the mesh and the result sets,
+    # loadcases and modes select them by number, None imports all
+    with profile.phase("read") as phase:
+        m = read_Frame3DD_result(filename, loadcases, modes, compact=True)
+        phase.count(nodes=m.node_count, elements=m.element_count, result_sets=len(m.results))
+    femmesh = None
+    if m.node_count:
+        with profile.phase("make_femmesh"):
+            femmesh = hfcMesh.make_femmesh(m)
+    return m, femmesh
+
+
+def make_Frame3DD_objects(
+    doc,
+    data,
+    profile,
+    analysis=None,
     result_name_prefix=""
 ):
+    """the objects of importFrame3DD in doc, data from read_Frame3DD_import, runs in the main thread
+
+    returns the result objects
+    """
     from . import importToolsFem
-    #from . import Fem.feminout.importToolsFem
+    from . import hfcProgress
     import ObjectsFem
 
-	#import result mesh only
-    Console.PrintMessage(
-        "Read Frame3DD results from Frame3DD file: {}\n"
-        .format(filename)
-    )
-    Frame3DD_file = pyopen(filename, "r")
-    nodes = {}
-
-    elem = -1
-    elemType = 0
-	
-    nDisp=0
-	
-    numNode =  0
-    numFixedNode =  0
-    numMember =  0
-    numLC =  0
-	
-    isDebug=0
-		
-    NodeList = {}
-    MemberList = {}                                  
-	
-    tline=[]
-    for line in Frame3DD_file:
-        tline.append(line.strip())
-		
-    for i in range(len(tline)):
-	
-        #Console.PrintError(tline[i])
-        tStrNode="In 2D problems the Y-axis is vertical.  In 3D problems the Z-axis is vertical."	
-        if tline[i].strip() == tStrNode:
-            #Console.PrintError("FEM: nodes found.\n")
-			
-            i=i+1
-            i=i+1
-            data = tline[i].split()
-            #12 NODES             12 FIXED NODES       21 FRAME ELEMENTS   2 LOAD CASES   
-            numNode =  int(data[0])
-            numFixedNode =  int(data[2])
-            numMember =  int(data[5])
-            numLC =  int(data[8])
-	
-            i=i+1 # = fp.readline().strip()
-            i=i+1 # = fp.readline().strip()
-            i=i+1 # = fp.readline().strip()
-			
-            #print ("")			
-            #print ("numNode: "+str(numNode))
-            for id in range(numNode): # node
-                #1       0.000000       0.000000       0.000000    0.000   1  1  1  1  1  0
-                i=i+1
-                #print (tline[i])
-                dataNode = tline[i].split()
-			
-                elem = int(dataNode[0])
-                nodes_x = float(dataNode[1])
-                nodes_y = float(dataNode[2])
-                nodes_z = float(dataNode[3])
-                nodes[elem] = FreeCAD.Vector(nodes_x, nodes_y, nodes_z)
-                NodeList[id] =  Node(str(id+1), nodes_x, nodes_y, nodes_z )
-
-            i=i+1
-            i=i+1
-			
-            #print ("")			
-            #print ("numMember: "+str(numMember))
-            for id in range(numMember): # Member
-                i=i+1
-                #print (tline[i])
-                dataNode = tline[i].split()
-                elem = int(dataNode[0])
-                nd1 = int(dataNode[1])
-                nd2 = int(dataNode[2])
-                MemberList[id] =  Member(str(id+1) ,nd1, nd2)  
-
-            #print ("")			
-            #print ("numFixedNode: "+str(numFixedNode))
-            #print ("numLC: "+str(numLC))
-		
-            femmesh = Fem.FemMesh()
-            # nodes
-            #print ("Add nodes")
-            for id in NodeList: # node
-                #femmesh.addNode(NodeList[id].x,NodeList[id].y,NodeList[id].z, int(id)+1 )
-                femmesh.addNode(NodeList[id].x,NodeList[id].y,NodeList[id].z, int(id)+1 )
-			
-            # elements
-            for id in MemberList:
-                n1 = MemberList[id].n1
-                n2 = MemberList[id].n2
-                femmesh.addEdge([int(n1), int(n2)], int(id)+1)
-				
-			
-			
-    # close Frame3DD file if loop over all lines is finished
-    Frame3DD_file.close()
-
-    if not nodes:
+    m, femmesh = data
+    if not m.node_count:
         Console.PrintError("FEM: No nodes found in Frame3DD file.\n")
-    else:	
-	
-        #Console.PrintError(tline[i])
-        result_mesh_object = None
-        #mesh = importToolsFem.make_femmesh(m)
+    else:
+        # last point to cancel, nothing is in the document yet
+        hfcProgress.current().check()
         result_mesh_object = ObjectsFem.makeMeshResult(
-            FreeCAD.ActiveDocument,
+            doc,
             "ResultMesh"
         )
         result_mesh_object.FemMesh = femmesh
-        res_mesh_is_compacted = False
-        nodenumbers_for_compacted_mesh = []
-		
-		
-		
-
-        #import result 
-        mm = read_Frame3DD_result(filename)
-		
-        number_of_increments = len(mm["Results"])
+
+        number_of_increments = len(m["Results"])
         Console.PrintLog(
             "Increments: " + str(number_of_increments) + "\n"
         )
-		
-        if len(mm["Results"]) > 0:
-		
-            res_obj=[]		
+
+        if len(m["Results"]) > 0:
+
+            from . import hfcResults
+            res_obj=[]
             iLC=0
-            iModal=0
-            results_name="Elastic"
-				
-            for result_set in mm["Results"]:
-                if (iLC<numLC):				
-                    results_name="Elastic"
-                    res_obj.append(ObjectsFem.makeResultMechanical(FreeCAD.ActiveDocument, results_name+str(iLC)))
+
+            for result_set in m["Results"]:
+                if "number" not in result_set:
+                    results_name="Elastic"+str(result_set["loadcase"]-1)
                 else:
-                    results_name="Modal"
-                    res_obj.append(ObjectsFem.makeResultMechanical(FreeCAD.ActiveDocument, results_name+str(iModal)))
-                    iModal+=1
-            				
-                res_obj[iLC].Mesh = result_mesh_object
-                res_obj[iLC] = importToolsFem.fill_femresult_mechanical(res_obj[iLC], result_set)
+                    results_name="Modal"+str(result_set["number"]-1)
+                with profile.phase("fill_femresult") as phase:
+                    res_obj.append(ObjectsFem.makeResultMechanical(doc, result_name_prefix+results_name))
+
+                    res_obj[iLC].Mesh = result_mesh_object
+                    res_obj[iLC] = importToolsFem.fill_femresult_mechanical(res_obj[iLC], result_set)
+                    phase.count(result_sets=1)
                 if analysis:
                     analysis.addObject(res_obj[iLC])
 
-                # complementary result object calculations
-                import femresult.resulttools as restools
-                import femtools.femutils as femutils
-                if not res_obj[iLC].MassFlowRate:
-                    if res_mesh_is_compacted is False:
-                        # first result set, compact FemMesh and NodeNumbers
-                        res_obj[iLC] = restools.compact_result(res_obj[iLC])
-                        res_mesh_is_compacted = True
-                        nodenumbers_for_compacted_mesh = res_obj[iLC].NodeNumbers
-                    else:
-                        # all other result sets, do not compact FemMesh, only set NodeNumbers
-                        res_obj[iLC].NodeNumbers = nodenumbers_for_compacted_mesh
-
-                # fill DisplacementLengths
-                res_obj[iLC] = restools.add_disp_apps(res_obj[iLC])
-                # fill StressValues
-                res_obj[iLC] = restools.add_von_mises(res_obj[iLC])
-                if res_obj[iLC].getParentGroup():
-                    has_reinforced_mat = False
-                    for obj in res_obj[iLC].getParentGroup().Group:
-                        if obj.isDerivedFrom("App::MaterialObjectPython") \
-                                and femutils.is_of_type(obj, "Fem::MaterialReinforced"):
-                            has_reinforced_mat = True
-                            restools.add_principal_stress_reinforced(res_obj[iLC])
-                            break
-                    if has_reinforced_mat is False:
-                        # fill PrincipalMax, PrincipalMed, PrincipalMin, MaxShear
-                        res_obj[iLC] = restools.add_principal_stress_std(res_obj[iLC])
-                else:
-                    # if a pure Frame3DD file was opened no analysis and thus no parent group
-                    # fill PrincipalMax, PrincipalMed, PrincipalMin, MaxShear
-                    res_obj[iLC] = restools.add_principal_stress_std(res_obj[iLC])
-                # fill Stats
-                res_obj[iLC] = restools.fill_femresult_stats(res_obj[iLC])
-				
+                # the reader compacted the mesh and the result sets,
+                # so there is no restools.compact_result
                 iLC+=1
 
+            # DisplacementLengths, vonMises, principal stresses and Stats
+            # of all load cases and modes in one pass
+            with profile.phase("postprocess") as phase:
+                hfcResults.postprocess(res_obj)
+                phase.count(result_sets=len(res_obj))
+
             return res_obj
 
 
@@ -260,231 +176,261 @@ def importFrame3DD(
             if analysis:
                 import FemGui
                 FemGui.setActiveAnalysis(analysis)
-            FreeCAD.ActiveDocument.recompute()
-
-
-
-# read a Frame3DD result file and extract
-# the displacement vectors and stress values.
+            with profile.phase("recompute"):
+                doc.recompute()
+
+
+# read a Frame3DD result file and extract the nodes, the members,
+# the displacement vectors of the load cases and the mode shapes
+# in one pass over the file, the text is not kept in memory
+# loadcases and modes select the result sets by their number (from 1),
+# None reads all of them. every table found goes to m.result_index with
+# its file offset, load_Frame3DD_result_set reads it later on demand
+# with compact the nodes no member uses are left out and the nodes are
+# numbered from 1 without gaps, see hfcMesh.compact
+# returns a hfcMesh.MeshData
 def read_Frame3DD_result(
-    Frame3DD_input
+    Frame3DD_input,
+    loadcases=None,
+    modes=None,
+    compact=False
 ):
     Console.PrintMessage(
         "Read Frame3DD results from Frame3DD file: {}\n"
         .format(Frame3DD_input)
     )
-    Frame3DD_file = pyopen(Frame3DD_input, "r")
-    nodes = {}
-    elements_hexa8 = {}
-    elements_penta6 = {}
-    elements_tetra4 = {}
-    elements_tetra10 = {}
-    elements_penta15 = {}
-    elements_hexa20 = {}
-    elements_tria3 = {}
-    elements_tria6 = {}
-    elements_quad4 = {}
-    elements_quad8 = {}
-    elements_seg2 = {}
-    elements_seg3 = {}
+    from . import hfcMesh
+    from . import hfcIO
+    from . import hfcProfile
+    from . import hfcProgress
+
+    mesh = hfcMesh.MeshBuilder()
     results = []
-    mode_results = {}
-    #mode_results["number"] = float("NaN")
-    #mode_results["time"] = float("NaN")
-    mode_disp = {}
-    mode_stress = {}
-    mode_strain = {}
-    mode_peeq = {}
-    mode_temp = {}
-    mode_massflow = {}
-    mode_networkpressure = {}
-
-    nodes_found = False
-    elements_found = False
-    mode_time_found = False
-    mode_disp_found = False
-    mode_stress_found = False
-    mode_strain_found = False
-    mode_peeq_found = False
-    mode_temp_found = False
-    mode_massflow_found = False
-    mode_networkpressure_found = False
-    end_of_section_found = False
-    end_of_Frame3DD_data_found = False
-    input_continues = False
-    mode_eigen_changed = False
-    mode_time_changed = False
-
-    eigenmode = 0
-    eigentemp = 0
-    elem = -1
-    elemType = 0
-    timestep = 0
-    timetemp = 0
-	
-    nDisp=0
-    mDisp=0
-	
+    result_index = []
+    progress = hfcProgress.current()
+    progress.start(os.path.getsize(Frame3DD_input), "Frame3DD results")
+
     numNode =  0
     numFixedNode =  0
     numMember =  0
     numLC =  0
-	
-    isDebug=0
-    iFilled=[]
-	
-    tline=[]
-    for line in Frame3DD_file:
-        tline.append(line.strip())
- 
+
+    nDisp=0
+    mDisp=0
+    frequency = float("NaN")
+
     isElastic=0
     isModal=0
-    for i in range(len(tline)):
-	
-        tStrNode="In 2D problems the Y-axis is vertical.  In 3D problems the Z-axis is vertical."	
-        if tline[i].strip() == tStrNode:
-            #Console.PrintError("FEM: nodes found.\n")
-			
-            i=i+1
-            i=i+1
-            data = tline[i].split()
-            #12 NODES             12 FIXED NODES       21 FRAME ELEMENTS   2 LOAD CASES   
+
+    # binary, the file offsets stay valid while iterating
+    Frame3DD_file = hfcIO.open_input(Frame3DD_input, "rb")
+    lines = (line.strip() for line in Frame3DD_file)
+    line = next(lines, None)
+    while line is not None:
+        # data rows fail on the first character, only headers get further
+        section = FRAME3DD_SECTIONS.match(line)
+        if section is None:
+            line = next(lines, None)
+            continue
+        section = section.lastgroup
+        header, line = line, None
+
+        if section == "counts":
+            next(lines)
+            data = next(lines).split()
+            #12 NODES             12 FIXED NODES       21 FRAME ELEMENTS   2 LOAD CASES
             numNode =  int(data[0])
             numFixedNode =  int(data[2])
             numMember =  int(data[5])
             numLC =  int(data[8])
-			
+
+        elif section == "nodes":
+            next(lines)
             for id in range(numNode): # node
-                iFilled.append(0)
-			
-        tStrDis="E L A S T I C   S T I F F N E S S   A N A L Y S I S   via  L D L'  decomposition"
-        if tline[i].strip() == tStrDis:
-            #Console.PrintError("FEM: displacement found.\n")
+                #1       0.000000       0.000000       0.000000    0.000   1  1  1  1  1  0
+                dataNode = next(lines).split()
+                mesh.add_node(
+                    int(dataNode[0]),
+                    float(dataNode[1]),
+                    float(dataNode[2]),
+                    float(dataNode[3])
+                )
+            progress.add(numNode, "nodes")
+
+        elif section == "members":
+            next(lines)
+            for id in range(numMember): # Member
+                #1     1     2   10.0   1.0   1.0   1.0    1.0    1.0  29000.0  11200.0   0 7.33e-07
+                dataNode = next(lines).split()
+                mesh.add_element(
+                    "Seg2Elem",
+                    int(dataNode[0]),
+                    (int(dataNode[1]), int(dataNode[2]))
+                )
+            progress.add(numMember, "members")
+
+        elif section == "elastic":
             isElastic=1
-			
-        if (isElastic==1 and isModal==0):
-            tStrDis="Node    X-dsp       Y-dsp       Z-dsp       X-rot       Y-rot       Z-rot"
-            if tline[i].strip() == tStrDis:
-                #Console.PrintError("FEM: displacement found.\n")
-			
-                print ("")			
-                print ("Displacement"+str(nDisp))	
-				
-                for id in range(numNode): # node
-                    iFilled[id]=0
-				
-                for id in range(numNode): # node
-                    #Node    X-dsp       Y-dsp       Z-dsp       X-rot       Y-rot       Z-rot
-                    #1    0.0         0.0         0.0         0.0         0.0        -0.001254
-                    i=i+1
-                    #print (tline[i])
-                    dataNode = tline[i].split()
-                    #print (dataNode[0]+" "+str(numNode))
-                    if (dataNode[0].isdigit()):
-                        elem = int(dataNode[0])
-                        iFilled[elem-1] = 1
-                        mode_disp_x = float(dataNode[1])
-                        mode_disp_y = float(dataNode[2])
-                        mode_disp_z = float(dataNode[3])
-                        mode_disp[elem] = FreeCAD.Vector(mode_disp_x, mode_disp_y, mode_disp_z)
-                    else:
-                        break
-				
-                for id in range(numNode): # node
-                    if (iFilled[id] == 0):
-                        mode_disp[id+1] = FreeCAD.Vector(0., 0., 0.)
-                    #print (str(id)+" "+str(iFilled[id]))	
-				
-                #mode_results["disp"+str(nDisp)] = mode_disp
-                mode_results["disp"] = mode_disp
-                mode_disp = {}
-
-                nDisp+=1	
-				
-                # append mode_results to results and reset mode_result
-                results.append(mode_results)
-                mode_results = {}
-
-				
-				
-				
-		#mode shapes	
-		
-        tStrDis="M O D A L   A N A L Y S I S   R E S U L T S"
-        if tline[i].strip() == tStrDis:
-            #Console.PrintError("FEM: displacement found.\n")
+
+        elif section == "modal":
             isModal=1
-			
-        if (isModal==1):
-            tStrDis="Node    X-dsp       Y-dsp       Z-dsp       X-rot       Y-rot       Z-rot"
-            if tline[i].strip() == tStrDis:
-                #Console.PrintError("FEM: displacement found.\n")
-			
-                print ("")			
-                print ("Modal Displacement"+str(mDisp))			
-			
-                for id in range(numNode): # node
-                    iFilled[id]=0
-				
-                for id in range(numNode): # node
-                    #Node    X-dsp       Y-dsp       Z-dsp       X-rot       Y-rot       Z-rot
-                    #1    0.0         0.0         0.0         0.0         0.0        -0.001254
-					#" %11.3e"
-                    #1 -1.#IOe+000 -1.#IOe+000 -1.#IOe+000 -1.#IOe+000 -1.#IOe+000 -1.#IOe+000
-                    i=i+1
-                    #print (tline[i])
-                    dataNode = tline[i].split()
-                    #print (dataNode[0]+" "+str(numNode))
-                    if (dataNode[0].isdigit()):
-                        elem = int(dataNode[0])
-                        iFilled[elem-1] = 1
-                        mode_disp_x = float(dataNode[1])
-                        mode_disp_y = float(dataNode[2])
-                        mode_disp_z = float(dataNode[3])
-                        mode_disp[elem] = FreeCAD.Vector(mode_disp_x, mode_disp_y, mode_disp_z)
-                    else:
-                        break
-		
-                for id in range(numNode): # node
-                    if (iFilled[id] == 0):
-                        mode_disp[id+1] = FreeCAD.Vector(0., 0., 0.)
-                    #print (str(id)+" "+str(iFilled[id]))	
-				
-                #mode_results["disp"+str(nDisp)] = mode_disp
-                mode_results["disp"] = mode_disp
-                mode_disp = {}
-
-                mDisp+=1	
-				
-                # append mode_results to results and reset mode_result
-                results.append(mode_results)
-                mode_results = {}
-			
-
-    # https://forum.freecadweb.org/viewtopic.php?f=18&t=32649&start=10#p274686
-    #mode_results["number"] = float("NaN")
-    #mode_results["time"] = float("NaN")
-
-    # here we are in the indent of loop for every line in Frame3DD file
-    # do not add a print here :-)
+
+        elif section == "mode":
+            #M O D E   1:   f= 12.345 Hz,  T= 0.081 sec
+            frequency = float(header.split(b"f=")[1].split()[0])
+
+        elif section == "disp" and (isElastic==1 or isModal==1):
+            if isModal==1:
+                mDisp+=1
+                entry = {"type": "Modal", "number": mDisp, "frequency": frequency}
+                wanted = modes is None or mDisp in modes
+            else:
+                nDisp+=1
+                entry = {"type": "Elastic", "number": nDisp}
+                wanted = loadcases is None or nDisp in loadcases
+            entry["offset"] = Frame3DD_file.tell()
+            result_index.append(entry)
+            # the table ends at the first line which is not a node row,
+            # that line is handed back to be dispatched
+            if wanted:
+                with hfcProfile.phase("displacements") as phase:
+                    mode_disp, line = frame3dd_displacements(lines, numNode)
+                    results.append(frame3dd_result_set(entry, mode_disp))
+                    phase.count(result_sets=1, nodes=len(mode_disp))
+                progress.add(len(mode_disp), "{} {}".format(entry["type"], entry["number"]))
+            else:
+                line = skip_node_rows(lines, numNode)
+
+        elif section == "forces":
+            # column header and two rows per member, not used
+            skip_lines(lines, 1 + 2 * numMember)
+
+        elif section == "reactions":
+            # column header and one row per fixed node, not used
+            skip_lines(lines, 1 + numFixedNode)
+
+        if line is None:
+            line = next(lines, None)
 
     # close Frame3DD file if loop over all lines is finished
     Frame3DD_file.close()
 
-    return {
-        "Nodes": nodes,
-        "Seg2Elem": elements_seg2,
-        "Seg3Elem": elements_seg3,
-        "Tria3Elem": elements_tria3,
-        "Tria6Elem": elements_tria6,
-        "Quad4Elem": elements_quad4,
-        "Quad8Elem": elements_quad8,
-        "Tetra4Elem": elements_tetra4,
-        "Tetra10Elem": elements_tetra10,
-        "Hexa8Elem": elements_hexa8,
-        "Hexa20Elem": elements_hexa20,
-        "Penta6Elem": elements_penta6,
-        "Penta15Elem": elements_penta15,
-        "Results": results
-    }
-	
+    progress.finish()
+
+    Console.PrintLog(
+        "numNode: {}, numFixedNode: {}, numMember: {}, numLC: {}\n"
+        .format(numNode, numFixedNode, numMember, numLC)
+    )
+    Console.PrintLog(
+        "load cases: {}, modes: {}, read: {}\n"
+        .format(nDisp, mDisp, len(results))
+    )
+
+    m = mesh.build(results)
+    m.result_index = result_index
+    if compact:
+        with hfcProfile.phase("compact") as phase:
+            m = hfcMesh.compact(m)
+            phase.count(nodes=m.node_count)
+    return m
+
+
+# list the load cases and modes of a Frame3DD result file
+# the mesh is read, the result tables are only indexed, not parsed
+# returns the hfcMesh.MeshData with its result_index filled
+def index_Frame3DD_result(
+    Frame3DD_input
+):
+    return read_Frame3DD_result(Frame3DD_input, loadcases=(), modes=())
+
+
+# read one result set of the index of read_Frame3DD_result on demand,
+# the file is not scanned again, the table is read at its offset
+# the result set of a compacted m gets the node numbers of m
+def load_Frame3DD_result_set(
+    Frame3DD_input,
+    m,
+    entry
+):
+    from . import hfcMesh
+    from . import hfcIO
+
+    # Frame3DD numbers the nodes from 1, nodes after the last one
+    # kept by the compaction are dropped anyway
+    numNode = m.node_count if m.file_ids is None else int(m.file_ids[-1])
+    # the offset counts the bytes of the text, also in a compressed file
+    Frame3DD_file = hfcIO.open_input(Frame3DD_input, "rb")
+    Frame3DD_file.seek(entry["offset"])
+    lines = (line.strip() for line in Frame3DD_file)
+    mode_disp, line = frame3dd_displacements(lines, numNode)
+    result_set = frame3dd_result_set(entry, mode_disp)
+    Frame3DD_file.close()
+    if m.file_ids is not None:
+        result_set = hfcMesh.compact_result_set(result_set, m.file_ids)
+    m.results.append(result_set)
+    return result_set
+
+
+def frame3dd_result_set(
+    entry,
+    mode_disp
+):
+    "the result set of an index entry, modes carry their number and frequency"
+    mode_results = {"disp": mode_disp}
+    if entry["type"] == "Modal":
+        mode_results["number"] = entry["number"]
+        mode_results["frequency"] = entry["frequency"]
+    else:
+        mode_results["loadcase"] = entry["number"]
+    return mode_results
+
+
+def skip_lines(lines, n):
+    "step over the next n lines without looking at them"
+    next(islice(lines, n, n), None)
+
+
+def skip_node_rows(lines, numNode):
+    """step over a table of at most numNode node rows
+
+    returns the first line after the table, None at the end of the file
+    """
+    for id in range(numNode):
+        line = next(lines, None)
+        if line is None or not line[:1].isdigit():
+            return line
+    return None
+
+
+def frame3dd_displacements(
+    lines,
+    numNode
+):
+    """read a displacement table, the rows up to the first non node line
+
+    Frame3DD leaves out the nodes which do not move, they get a zero
+    displacement. returns the displacements and the first line after
+    the table, None at the end of the file
+    """
+    mode_disp = {}
+    line = None
+    for id in range(numNode): # node
+        #Node    X-dsp       Y-dsp       Z-dsp       X-rot       Y-rot       Z-rot
+        #1    0.0         0.0         0.0         0.0         0.0        -0.001254
+        #1 -1.#IOe+000 -1.#IOe+000 -1.#IOe+000 -1.#IOe+000 -1.#IOe+000 -1.#IOe+000
+        line = next(lines, None)
+        if line and line[:1].isdigit():
+            dataNode = line.split()
+            mode_disp[int(dataNode[0])] = FreeCAD.Vector(
+                float(dataNode[1]),
+                float(dataNode[2]),
+                float(dataNode[3])
+            )
+            line = None
+        else:
+            break
+
+    for id in range(1, numNode + 1): # node
+        if id not in mode_disp:
+            mode_disp[id] = FreeCAD.Vector(0., 0., 0.)
+    return mode_disp, line
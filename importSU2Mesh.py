@@ -20,6 +20,145 @@ def moveon(fp):
 			return line
 
 
+# VTK element type of SU2 to the element lists of importToolsFem
+SU2_ELEMENTS = {
+    3: "Seg2Elem",     # line
+    5: "Tria3Elem",    # triangle
+    9: "Quad4Elem",    # quadrilateral
+    10: "Tetra4Elem",  # tetrahedral
+    12: "Hexa8Elem",   # hexahedral
+    13: "Penta6Elem",  # prism
+    14: "Pyra5Elem",   # pyramid
+}
+
+# binary SU2 restart files start with this int32, their field names
+# are stored in blocks of SU2_NAME_LENGTH bytes
+SU2_BINARY_MAGIC = 535532
+SU2_NAME_LENGTH = 33
+# the solution files of a mesh, looked for in the directory of the mesh
+SU2_SOLUTION_FILES = ("restart_flow*.dat", "restart_flow*.csv", "solution_flow*.dat", "solution_flow*.csv")
+# vector fields shown as DisplacementVectors, the first one found, and
+# the point coordinates which are not added as result fields
+SU2_VECTOR_FIELDS = ("Velocity", "Momentum")
+SU2_COORDINATES = ("x", "y", "z")
+
+
+def su2_lines(SU2_file):
+    "yield the stripped lines of a SU2 file, blank and % comment lines are skipped"
+    for line in SU2_file:
+        line = line.strip()
+        if len(line) == 0 or line[0] == '%':
+            continue
+        yield line
+
+
+def su2_value(line):
+    "value of a 'KEY= value' line, the blank after '=' is optional in SU2"
+    key, sep, value = line.partition("=")
+    value = value.split()
+    if not sep or not value:
+        raise ValueError("SU2 keyword {} has no value in line '{}'".format(key.strip(), line))
+    return value[0]
+
+
+def su2_element_block(mesh, text, memStart, nodeStart):
+    """add a block of NELEM rows to the MeshBuilder mesh
+
+    the rows are read in one numpy call and grouped by their VTK type,
+    SU2 node numbers start at 0, FemMesh numbers at 1.
+    returns the number of rows read
+    """
+    import numpy as np
+    from . import hfcMesh
+    from . import hfcIO
+
+    values, starts, lengths = hfcIO.parse_int_rows(text)
+    types = values[starts]
+    for elem in np.unique(types).tolist():
+        rows = np.flatnonzero(types == elem)
+        if elem not in SU2_ELEMENTS:
+            Console.PrintWarning(
+                "SU2 element type {} not supported yet, {} elements skipped.\n"
+                .format(elem, len(rows))
+            )
+            continue
+        name = SU2_ELEMENTS[elem]
+        k = hfcMesh.NUMBER_OF_NODES[name]
+        conn = hfcIO.take_columns(values, starts[rows], 1, k)
+        mesh.add_elements(name, memStart + rows + 1, conn + (nodeStart + 1))
+    return len(starts)
+
+
+def su2_marker_block(mesh, tag, text, n, nodeStart):
+    """add a block of n MARKER_ELEMS rows to the group tag of the MeshBuilder mesh
+
+    the rows are read in one numpy call like the NELEM rows, a marker of
+    one element type in a plain table. the boundary elements have no
+    element numbers
+    """
+    import numpy as np
+    from . import hfcMesh
+    from . import hfcIO
+
+    rows = hfcIO.parse_int_table(text, n)
+    if rows is not None and (rows[:, 0] == rows[0, 0]).all():
+        elem = int(rows[0, 0])
+        name = SU2_ELEMENTS.get(elem)
+        if name and rows.shape[1] == 1 + hfcMesh.NUMBER_OF_NODES[name]:
+            mesh.add_group(tag, name, rows[:, 1:] + (nodeStart + 1))
+            return
+    values, starts, lengths = hfcIO.parse_int_rows(text)
+    types = values[starts]
+    for elem in np.unique(types).tolist():
+        rows = np.flatnonzero(types == elem)
+        if elem not in SU2_ELEMENTS:
+            Console.PrintWarning(
+                "SU2 element type {} not supported yet, {} elements of marker {} skipped.\n"
+                .format(elem, len(rows), tag)
+            )
+            continue
+        name = SU2_ELEMENTS[elem]
+        k = hfcMesh.NUMBER_OF_NODES[name]
+        conn = hfcIO.take_columns(values, starts[rows], 1, k)
+        mesh.add_group(tag, name, conn + (nodeStart + 1))
+
+
+def su2_node_block(mesh, text, NDIME, nodeStart, ncols):
+    """add a block of NPOIN rows to the MeshBuilder mesh
+
+    the rows are read in one numpy call, rows with an uneven number
+    of columns are read line by line. returns the number of rows read
+    """
+    import numpy as np
+    from . import hfcIO
+
+    data = hfcIO.parse_float_rows(text, ncols)
+    if data is None:
+        data = [[float(x) for x in line.split()[:NDIME]] for line in text.splitlines() if line.strip()]
+        data = np.array(data, np.float64).reshape(-1, NDIME)
+    coords = np.zeros((len(data), 3))
+    coords[:, :NDIME] = data[:, :NDIME]
+    mesh.add_nodes(nodeStart + np.arange(1, len(data) + 1), coords)
+    return len(data)
+
+
+def su2_chunk(text, dName, NDIME=3):
+    """parse a chunk of NPOIN or NELEM rows, runs in the processes of hfcIO.parse_chunks
+
+    node and element numbers count from 1 in the chunk,
+    returns the MeshData and the number of rows read
+    """
+    from . import hfcMesh
+    from . import hfcIO
+
+    mesh = hfcMesh.MeshBuilder()
+    if dName == "NPOIN":
+        n = su2_node_block(mesh, text, NDIME, 0, hfcIO.first_columns(text))
+    else:
+        n = su2_element_block(mesh, text, 0, 0)
+    return mesh.build(), n
+
+
 # ********* generic FreeCAD import and export methods *********
 if open.__module__ == "__builtin__":
     # because we'll redefine open below (Python2)
@@ -45,34 +184,83 @@ def insert(
     except NameError:
         doc = FreeCAD.newDocument(docname)
     FreeCAD.ActiveDocument = doc
-    importSU2Mesh(filename)
-	
+    from . import hfcBackground
+    # with the GUI up the file is read in a worker thread
+    hfcBackground.run("importSU2Mesh", filename, doc, read_SU2_import, make_SU2_objects)
+
 # ********* module specific methods *********
 def importSU2Mesh(
     filename,
     analysis=None,
+    result_name_prefix="",
+    solutions=None
+):
+    """solutions are the SU2 restart files to import, None takes the ones next to the mesh
+
+    a solution is only imported if it has as many points as the mesh has nodes
+    """
+    from . import hfcProfile
+
+    profile = hfcProfile.start("importSU2Mesh", filename)
+    try:
+        data = read_SU2_import(filename, profile, solutions)
+        make_SU2_objects(FreeCAD.ActiveDocument, data, profile, analysis, result_name_prefix)
+    finally:
+        profile.finish()
+
+
+def read_SU2_import(
+    filename,
+    profile,
+    solutions=None
+):
+    """the part of importSU2Mesh without the document, may run in a worker thread
+
+    returns the MeshData and its FemMesh, which is None without nodes
+    """
+    from . import hfcMesh
+
+    if solutions is None:
+        solutions = su2_solution_files(filename)
+    with profile.phase("read") as phase:
+        m = read_SU2_mesh(filename, solutions=solutions, compact=True)
+        phase.count(nodes=m.node_count, elements=m.element_count, result_sets=len(m.results))
+    mesh = None
+    if m.node_count > 0:
+        with profile.phase("make_femmesh"):
+            mesh = hfcMesh.make_femmesh(m)
+    return m, mesh
+
+
+def make_SU2_objects(
+    doc,
+    data,
+    profile,
+    analysis=None,
     result_name_prefix=""
 ):
-    from . import importToolsFem
+    "the objects of importSU2Mesh in doc, data from read_SU2_import, runs in the main thread"
+    from . import hfcProgress
     import ObjectsFem
 
-    m = read_SU2_mesh(filename)
+    m, mesh = data
     result_mesh_object = None
-    if len(m["Nodes"]) > 0:
-        mesh = importToolsFem.make_femmesh(m)
+    if m.node_count > 0:
+        # last point to cancel, nothing is in the document yet
+        hfcProgress.current().check()
         result_mesh_object = ObjectsFem.makeMeshResult(
-            FreeCAD.ActiveDocument,
+            doc,
             "ResultMesh"
         )
         result_mesh_object.FemMesh = mesh
-        res_mesh_is_compacted = False
-        nodenumbers_for_compacted_mesh = []
 
         number_of_increments = len(m["Results"])
         Console.PrintLog(
             "Increments: " + str(number_of_increments) + "\n"
         )
         if len(m["Results"]) > 0:
+            from . import hfcResults
+            res_objs = []
             for result_set in m["Results"]:
                 if "number" in result_set:
                     eigenmode_number = result_set["number"]
@@ -96,47 +284,23 @@ def importSU2Mesh(
                         .format(result_name_prefix)
                     )
 
-                res_obj = ObjectsFem.makeResultMechanical(FreeCAD.ActiveDocument, results_name)
-                res_obj.Mesh = result_mesh_object
-                res_obj = importToolsFem.fill_femresult_mechanical(res_obj, result_set)
+                with profile.phase("fill_femresult") as phase:
+                    res_obj = ObjectsFem.makeResultMechanical(doc, results_name)
+                    res_obj.Mesh = result_mesh_object
+                    res_obj = fill_su2_result(res_obj, result_set)
+                    phase.count(result_sets=1)
                 if analysis:
                     analysis.addObject(res_obj)
 
-                # complementary result object calculations
-                import femresult.resulttools as restools
-                import femtools.femutils as femutils
-                if not res_obj.MassFlowRate:
-                    if res_mesh_is_compacted is False:
-                        # first result set, compact FemMesh and NodeNumbers
-                        res_obj = restools.compact_result(res_obj)
-                        res_mesh_is_compacted = True
-                        nodenumbers_for_compacted_mesh = res_obj.NodeNumbers
-                    else:
-                        # all other result sets, do not compact FemMesh, only set NodeNumbers
-                        res_obj.NodeNumbers = nodenumbers_for_compacted_mesh
-
-                # fill DisplacementLengths
-                res_obj = restools.add_disp_apps(res_obj)
-                # fill StressValues
-                res_obj = restools.add_von_mises(res_obj)
-                if res_obj.getParentGroup():
-                    has_reinforced_mat = False
-                    for obj in res_obj.getParentGroup().Group:
-                        if obj.isDerivedFrom("App::MaterialObjectPython") \
-                                and femutils.is_of_type(obj, "Fem::MaterialReinforced"):
-                            has_reinforced_mat = True
-                            restools.add_principal_stress_reinforced(res_obj)
-                            break
-                    if has_reinforced_mat is False:
-                        # fill PrincipalMax, PrincipalMed, PrincipalMin, MaxShear
-                        res_obj = restools.add_principal_stress_std(res_obj)
-                else:
-                    # if a pure SU2 file was opened no analysis and thus no parent group
-                    # fill PrincipalMax, PrincipalMed, PrincipalMin, MaxShear
-                    res_obj = restools.add_principal_stress_std(res_obj)
-                # fill Stats
-                res_obj = restools.fill_femresult_stats(res_obj)
-                return res_obj
+                # the mesh is compacted by the reader and the solution
+                # renumbered with it, so there is no compact_result
+                res_objs.append(res_obj)
+
+            # DisplacementLengths, vonMises, principal stresses and Stats
+            # of all result sets in one pass
+            with profile.phase("postprocess") as phase:
+                hfcResults.postprocess(res_objs)
+                phase.count(result_sets=len(res_objs))
 
 
         else:
@@ -151,7 +315,8 @@ def importSU2Mesh(
             if analysis:
                 import FemGui
                 FemGui.setActiveAnalysis(analysis)
-            FreeCAD.ActiveDocument.recompute()
+            with profile.phase("recompute"):
+                doc.recompute()
 
     else:
         Console.PrintError(
@@ -159,268 +324,552 @@ def importSU2Mesh(
         )
 
 
-# read a SU2 result file and extract the nodes
-# displacement vectors and stress values.
+# read a SU2 mesh file and extract the nodes and elements
+# the file is walked once as a stream of lines, only the nodes
+# and elements of the mesh are kept in memory, never the text
+# with processes the zones of a multi zone file are parsed in a process pool,
+# and a file of hfcIO.PARALLEL_BYTES and more is memory mapped and its big node
+# and element blocks are parsed in chunks in it. None takes hfcIO.PROCESSES,
+# which is no pool by default, 0 is one process per CPU, see hfcIO.pool_processes
+# with use_mmap the file is memory mapped and the blocks are parsed from the bytes
+# with cache the parsed mesh is kept on disk by hfcCache, None takes hfcCache.ENABLED
+# solutions are SU2 restart files of the mesh, each is read into one result set,
+# a file with another number of points than the mesh has nodes is left out
+# with merge_tolerance the nodes closer than it are merged, like the interface
+# nodes of the zones, None takes hfcMesh.MERGE_TOLERANCE
+# and the numbers of the merge are kept in merge_stats of the mesh
+# with compact the nodes no element uses are left out and the nodes are
+# numbered from 1 without gaps, see hfcMesh.compact
+# returns a hfcMesh.MeshData, m["Nodes"] and so on give the dicts of importToolsFem
 def read_SU2_mesh(
-    SU2_input
+    SU2_input,
+    processes=None,
+    use_mmap=False,
+    cache=None,
+    solutions=(),
+    merge_tolerance=None,
+    compact=False
 ):
     Console.PrintMessage(
         "Read SU2 mesh from SU2 file: {}\n"
         .format(SU2_input)
     )
 
-    nodes = {}
-    elements_hexa8 = {}
-    elements_penta6 = {}
-    elements_tetra4 = {}
-    elements_tetra10 = {}
-    elements_penta15 = {}
-    elements_hexa20 = {}
-    elements_tria3 = {}
-    elements_tria6 = {}
-    elements_quad4 = {}
-    elements_quad8 = {}
-    elements_seg2 = {}
-    elements_seg3 = {}
+    from . import hfcMesh
+    from . import hfcIO
+    from . import hfcCache
+    from . import hfcProfile
+    from . import hfcProgress
+
+    if cache is None:
+        cache = hfcCache.ENABLED
+    if merge_tolerance is None:
+        merge_tolerance = hfcMesh.MERGE_TOLERANCE
+    inputs = [SU2_input] + list(solutions)
+    options = (merge_tolerance, compact) if merge_tolerance or compact else ()
+    if cache:
+        m = hfcCache.load(inputs, "SU2", options)
+        if m is not None:
+            Console.PrintLog("SU2 mesh taken from the cache\n")
+            return m
+
+    mesh = hfcMesh.MeshBuilder()
     results = []
-    mode_results = {}
-    mode_results["number"] = float("NaN")
-    mode_results["time"] = float("NaN")
-    mode_disp = {}
-    mode_stress = {}
-    mode_strain = {}
-    mode_peeq = {}
-    mode_temp = {}
-    mode_massflow = {}
-    mode_networkpressure = {}
-
-    nodes_found = False
-    elements_found = False
-    mode_time_found = False
-    mode_disp_found = False
-    mode_stress_found = False
-    mode_strain_found = False
-    mode_peeq_found = False
-    mode_temp_found = False
-    mode_massflow_found = False
-    mode_networkpressure_found = False
-    end_of_section_found = False
-    end_of_SU2_data_found = False
-    input_continues = False
-    mode_eigen_changed = False
-    mode_time_changed = False
-
-    eigenmode = 0
-    eigentemp = 0
-    elem = -1
-    elemType = 0
-    timestep = 0
-    timetemp = 0
-	
-    SU2_file = pyopen(SU2_input, "r")
-	
-    #isOneZone=0
-
-    tline=[]
-    for line in SU2_file:
-        aline=line.strip()	
-        if len(aline)==0 or aline[0]=='%':
-            continue
-        else:		
-            tline.append(line.strip())
-		
-    print ("")			
-    i=0
-    data = tline[i].split()
-    dName=data[0]
-    if dName=='NZONE=':
-        NZONE= int(data[1])
-    elif dName=='NDIME=':
-        i=i+1
-        data = tline[i].split()
-        dName=data[0]
-        if dName=='NZONE=':
-           NZONE= int(data[1])
-        else:
-           NZONE=1
-           i=i-2
-    print ("NZONE: "+str(NZONE))
-		
-    memStart=0
-    nodeStart=0
-    for idZ in range(NZONE): # Member
-        if NZONE>1:	
-            i+=1
-            print ("")			
-            data = tline[i].split()
-            dName=data[0]
-            IZONE= int(data[1])
-            print ("IZONE: "+str(IZONE))
-		
-        i+=1
-        print ("")			
-        data = tline[i].split()
-        dName=data[0]
-        NDIME= int(data[1])
-        print ("NDIME: "+str(NDIME))
-			
-        i+=1
-        print ("")			
-        data = tline[i].split()
-        NELEM =  int(data[1])
-        numMember=NELEM
-        print ("NELEM: "+str(numMember))
-
-		
-        for idM in range(numMember): # Member
-            #5	5122	5109	5075	10215        
-            i+=1
-            #print (tline[i])
-            dataNode = tline[i].split()
-            elem = int(dataNode[0])
-            if (elem==3):  #line
-                # 3   109  110
-                nd1 = int(dataNode[1])
-                nd2 = int(dataNode[2])
-                elements_seg2[memStart+idM+1] = (nodeStart+nd1+1, nodeStart+nd2+1)
-                continue
-            elif (elem==5):  #triangle
-                nd1 = int(dataNode[1])
-                nd2 = int(dataNode[2])
-                nd3 = int(dataNode[3])
-                #elements_seg3[memStart+idM+1] = (nodeStart+nd1+1, nodeStart+nd2+1, nodeStart+nd3+1)
-                elements_tria3[memStart+idM+1] = (nodeStart+nd1+1, nodeStart+nd2+1, nodeStart+nd3+1)
-
-            elif (elem==9): #Quadrilateral
-                nd1 = int(dataNode[1])
-                nd2 = int(dataNode[2])
-                nd3 = int(dataNode[3])
-                nd4 = int(dataNode[4])
-                elements_quad4[memStart+idM+1] = (nodeStart+nd1+1, nodeStart+nd2+1, nodeStart+nd3+1, nodeStart+nd4+1)
-        		
-            elif (elem==10): #Tetrahedral
-                #10	17331	102263	102225	102187	36
-                nd1 = int(dataNode[1])
-                nd2 = int(dataNode[2])
-                nd3 = int(dataNode[3])
-                nd4 = int(dataNode[4])
-                elements_tetra4[memStart+idM+1] = (nodeStart+nd1+1, nodeStart+nd2+1, nodeStart+nd3+1, nodeStart+nd4+1)
-				
-            elif (elem==12): #Hexahedral
-                #12	0	1	21	20	800	801	821	820	0
-                nd1 = int(dataNode[1])
-                nd2 = int(dataNode[2])
-                nd3 = int(dataNode[3])
-                nd4 = int(dataNode[4])
-                nd5 = int(dataNode[5])
-                nd6 = int(dataNode[6])
-                nd7 = int(dataNode[7])
-                nd8 = int(dataNode[8])
-                elements_hexa8[memStart+idM+1] = (nodeStart+nd1+1, nodeStart+nd2+1, nodeStart+nd3+1, nodeStart+nd4+1, nodeStart+nd5+1, nodeStart+nd6+1, nodeStart+nd7+1, nodeStart+nd8+1)
-                continue
-            elif (elem==13): #Prism
-                nd1 = int(dataNode[1])
-                nd2 = int(dataNode[2])
-                nd3 = int(dataNode[3])
-                nd4 = int(dataNode[4])
-                nd5 = int(dataNode[5])
-                nd6 = int(dataNode[6])
-                elements_penta6[memStart+idM+1] = (nodeStart+nd1+1, nodeStart+nd2+1, nodeStart+nd3+1, nodeStart+nd4+1, nodeStart+nd5+1, nodeStart+nd6+1)
-                continue
-            elif (elem==14): #Pyramid
-                #10	17331	102263	102225	102187	36
-                nd1 = int(dataNode[1])
-                nd2 = int(dataNode[2])
-                nd3 = int(dataNode[3])
-                nd4 = int(dataNode[4])
-                nd5 = int(dataNode[5])
-                elements_tetra4[memStart+idM+1] = (nodeStart+nd1+1, nodeStart+nd2+1, nodeStart+nd3+1, nodeStart+nd4+1, nodeStart+nd5+1)
-            else:
-                print ("elem=")+str(elem)+" not supprot yet."			
-        memStart=memStart+numMember
-		
-		#node 22222222222222222222222222222222222222222222222222222222222222222222
-        #NPOIN= 5233
-        i+=1
-        data = tline[i].split()
-        NPOIN =  int(data[1])
-        numNode = NPOIN
-        print ("NPOIN: "+str(numNode))
-
-        for idN in range(numNode): # node
-            i+=1	
-	        #9.997500181200000e-01	-3.632896519016437e-05	0
-            #print (tline[i])
-            dataNode = tline[i].split()
-
-            nodes_x = float(dataNode[0])
-            nodes_y = float(dataNode[1])
-            if NDIME==2:		
-                nodes_z = 0.
-            else:
-                nodes_z = float(dataNode[2])	
-            nodes[nodeStart+idN+1] = FreeCAD.Vector(nodes_x, nodes_y, nodes_z)
-            #print (str(nodes_x))
-        nodeStart=nodeStart+numNode
-
-        #NMARK= 5
-        #MARKER_TAG= IN
-        #MARKER_ELEMS= 35    
-        i+=1
-        if i<len(tline):
-            print (tline[i])
-            data = tline[i].split()
-            dName =  data[0]
-            if dName=='NMARK=':
-                NMark =  int(data[1])
-                print ("NMark: "+str(NMark))
-			
-                for idMark in range(NMark): # node
-                    print (str(idMark))
-			 
-                    i+=1	
-                    data = tline[i].split()
-                    print (tline[i])
-			
-                    i+=1	
-                    data = tline[i].split()
-                    MARKER_ELEMS=int(data[1])
-                    print ("MARKER_ELEMS: "+str(MARKER_ELEMS))
-			
-                    for jd in range(MARKER_ELEMS): # node
-                        i+=1	
-                        #dataNode = tline[i].split()
-            else:
-                i=i-1	
-			
-            #NPERIODIC= 1
-            #break
-		
-    # close SU2 file if loop over all lines is finished
-    SU2_file.close()
-
-    if not inout_nodes:
-        if results:
-            if "mflow" in results[0] or "npressure" in results[0]:
-                Console.PrintError(
-                    "We have mflow or npressure, but no inout_nodes file.\n"
-                )
-    if not nodes:
+    progress = hfcProgress.current()
+    progress.start(os.path.getsize(SU2_input), "SU2 mesh")
+
+    # a compressed file is read as one stream, it has no byte offsets to
+    # hand to the zone processes and can not be memory mapped
+    compressed = hfcIO.compression(SU2_input) is not None
+    zones = []
+    zone_pool = None
+    if hfcIO.pool_processes(processes) > 1 and not compressed:
+        zones, NDIME = su2_zone_offsets(SU2_input)
+        if len(zones) > 1:
+            zone_pool = hfcIO.process_pool(processes)
+    # a one zone file can still have blocks worth a pool
+    pool = hfcIO.chunk_pool([SU2_input], processes) if len(zones) < 2 else None
+    if zone_pool is not None:
+        with zone_pool:
+            read_SU2_zones(SU2_input, zones, NDIME, mesh, zone_pool, use_mmap)
+    elif pool is not None:
+        # the chunks are cut out of the mapped bytes
+        with pool, hfcIO.MappedLines(SU2_input) as lines:
+            su2_sections(lines, mesh, pool=pool)
+    elif use_mmap and not compressed:
+        with hfcIO.MappedLines(SU2_input) as lines:
+            su2_sections(lines, mesh)
+    else:
+        SU2_file = hfcIO.open_input(SU2_input, "r")
+        su2_sections(hfcIO.FileLines(SU2_file), mesh)
+        # close SU2 file if loop over all lines is finished
+        SU2_file.close()
+
+    progress.finish()
+
+    m = mesh.build(results)
+    if not m.node_count:
         Console.PrintError("FEM: No nodes found in SU2 file.\n")
+        return m
+    for SU2_solution in solutions:
+        with hfcProfile.phase("solution") as phase:
+            result_set = read_SU2_solution(SU2_solution)
+            phase.count(points=len(result_set["values"]), fields=len(result_set["fields"]))
+        # SU2 numbers the points of the mesh and of the solution alike, a
+        # solution with another number of points is of another mesh
+        if len(result_set["values"]) != m.node_count:
+            Console.PrintWarning(
+                "SU2 solution {} has {} points, the mesh {} nodes, it is not imported.\n"
+                .format(SU2_solution, len(result_set["values"]), m.node_count)
+            )
+            continue
+        results.append(result_set)
+    if merge_tolerance:
+        with hfcProfile.phase("merge") as phase:
+            m, stats = hfcMesh.merge_coincident(m, merge_tolerance)
+            phase.count(merged_nodes=stats["merged"])
+    if compact:
+        with hfcProfile.phase("compact") as phase:
+            m = hfcMesh.compact(m)
+            phase.count(nodes=m.node_count)
+    if cache:
+        hfcCache.store(inputs, "SU2", m, options)
+
+    return m
+
+
+def su2_sections(
+    lines,
+    mesh,
+    NDIME=3,
+    one_zone=False,
+    pool=None
+):
+    """parse the SU2 sections of lines into the MeshBuilder mesh
+
+    with one_zone the parsing stops at the start of the next zone.
+    with a process pool the NELEM and NPOIN blocks of more than
+    hfcIO.BLOCK_LINES rows of a hfcIO.MappedLines are parsed in chunks.
+    returns the number of elements and nodes read
+    """
+    from . import hfcIO
+    from . import hfcProfile
+    from . import hfcProgress
+
+    progress = hfcProgress.current()
+    # offsets of the current zone in the global node and element numbering
+    memStart = 0
+    nodeStart = 0
+    numMember = 0
+    numNode = 0
+    numZone = 0
+    for line in lines:
+        dName = line.split("=", 1)[0].strip()
+        if dName == "NZONE":
+            NZONE = int(su2_value(line))
+            Console.PrintLog("NZONE: {}\n".format(NZONE))
+
+        elif dName == "IZONE":
+            if one_zone and numZone:
+                break
+            numZone += 1
+            memStart = numMember
+            nodeStart = numNode
+            Console.PrintLog("IZONE: {}\n".format(su2_value(line)))
+
+        elif dName == "NDIME":
+            NDIME = int(su2_value(line))
+            Console.PrintLog("NDIME: {}\n".format(NDIME))
+
+        elif dName == "NELEM":
+            NELEM = int(su2_value(line))
+            Console.PrintLog("NELEM: {}\n".format(NELEM))
+            first = 0
+            with hfcProfile.phase("elements") as phase:
+                # the chunks are left to blocks() if there are blank or comment lines
+                ranges = lines.ranges(NELEM) if pool is not None and NELEM > hfcIO.BLOCK_LINES else None
+                if ranges is not None:
+                    for part, n in hfcIO.parse_chunks(pool, lines.path, ranges, su2_chunk, (dName,)):
+                        mesh.add_mesh(part, nodeStart, memStart + first)
+                        first += n
+                        progress.add(n, "elements")
+                else:
+                    for text, n in hfcIO.text_blocks(lines, NELEM):
+                        #5	5122	5109	5075	10215
+                        first += su2_element_block(mesh, text, memStart + first, nodeStart)
+                        progress.add(n, "elements")
+                hfcIO.check_rows("NELEM", NELEM, first)
+                phase.count(elements=NELEM)
+            numMember = numMember + NELEM
+
+        elif dName == "NPOIN":
+            NPOIN = int(su2_value(line))
+            Console.PrintLog("NPOIN: {}\n".format(NPOIN))
+            first = 0
+            with hfcProfile.phase("nodes") as phase:
+                ranges = lines.ranges(NPOIN) if pool is not None and NPOIN > hfcIO.BLOCK_LINES else None
+                if ranges is not None:
+                    for part, n in hfcIO.parse_chunks(pool, lines.path, ranges, su2_chunk, (dName, NDIME)):
+                        mesh.add_mesh(part, nodeStart + first)
+                        first += n
+                        progress.add(n, "nodes")
+                else:
+                    for text, n in hfcIO.text_blocks(lines, NPOIN):
+                        #9.997500181200000e-01	-3.632896519016437e-05	0
+                        first += su2_node_block(mesh, text, NDIME, nodeStart + first, hfcIO.first_columns(text))
+                        progress.add(n, "nodes")
+                hfcIO.check_rows("NPOIN", NPOIN, first)
+                phase.count(nodes=NPOIN)
+            numNode = numNode + NPOIN
+
+        elif dName == "NMARK":
+            #NMARK= 5
+            #MARKER_TAG= IN
+            #MARKER_ELEMS= 35
+            NMark = int(su2_value(line))
+            Console.PrintLog("NMARK: {}\n".format(NMark))
+            with hfcProfile.phase("markers") as phase:
+                for idMark in range(NMark):
+                    tag = su2_value(next(lines))
+                    MARKER_ELEMS = int(su2_value(next(lines)))
+                    Console.PrintLog("MARKER_TAG: {}, {} elements\n".format(tag, MARKER_ELEMS))
+                    mesh.add_group(tag)
+                    for text, n in hfcIO.text_blocks(lines, MARKER_ELEMS):
+                        #5	108	109	2
+                        su2_marker_block(mesh, tag, text, n, nodeStart)
+                        progress.add(n, "markers")
+                    phase.count(markers=1, marker_elements=MARKER_ELEMS)
+
+        # other keywords like NPERIODIC are skipped, their data lines
+        # do not start with a keyword and fall through here as well
+
+    return numMember, numNode
+
+
+def su2_zone_offsets(SU2_input):
+    """quick scan for the zones of a SU2 file
+
+    returns the byte offsets of the IZONE lines and
+    the NDIME given in front of the first zone
+    """
+    import mmap
+
+    offsets = []
+    NDIME = 3
+    with pyopen(SU2_input, "rb") as SU2_file:
+        if os.fstat(SU2_file.fileno()).st_size == 0:
+            return offsets, NDIME
+        buf = mmap.mmap(SU2_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if buf[:5] == b"IZONE":
+                offsets.append(0)
+            pos = buf.find(b"\nIZONE")
+            while pos >= 0:
+                offsets.append(pos + 1)
+                pos = buf.find(b"\nIZONE", pos + 1)
+            if offsets:
+                header = buf[:offsets[0]].decode()
+                for line in su2_lines(header.splitlines()):
+                    if line.split("=", 1)[0].strip() == "NDIME":
+                        NDIME = int(su2_value(line))
+        finally:
+            buf.close()
+    return offsets, NDIME
+
+
+def read_SU2_zone(
+    SU2_input,
+    offset,
+    NDIME=3,
+    use_mmap=False
+):
+    """parse the zone starting at byte offset of a SU2 file
+
+    runs in the worker processes, node and element numbers are
+    local to the zone. returns the MeshData and the number of
+    elements and nodes of the zone
+    """
+    import io
+    from . import hfcMesh
+    from . import hfcIO
+
+    mesh = hfcMesh.MeshBuilder()
+    if use_mmap:
+        with hfcIO.MappedLines(SU2_input, offset) as lines:
+            numMember, numNode = su2_sections(lines, mesh, NDIME, one_zone=True)
+        return mesh.build(), numMember, numNode
+    with pyopen(SU2_input, "rb") as SU2_file:
+        SU2_file.seek(offset)
+        lines = hfcIO.FileLines(io.TextIOWrapper(SU2_file))
+        numMember, numNode = su2_sections(lines, mesh, NDIME, one_zone=True)
+    return mesh.build(), numMember, numNode
+
+
+def read_SU2_zones(
+    SU2_input,
+    zones,
+    NDIME,
+    mesh,
+    pool,
+    use_mmap=False
+):
+    """parse the zones of a SU2 file in the process pool of hfcIO.process_pool
+
+    the zones are added to the MeshBuilder mesh in file order, with
+    the same global node and element offsets as the serial parser
+    """
+    from . import hfcProgress
+
+    progress = hfcProgress.current()
+    ends = list(zones[1:]) + [os.path.getsize(SU2_input)]
+    memStart = 0
+    nodeStart = 0
+    futures = [
+        pool.submit(read_SU2_zone, SU2_input, offset, NDIME, use_mmap)
+        for offset in zones
+    ]
+    try:
+        for future, start, end in zip(futures, zones, ends):
+            zone, numMember, numNode = future.result()
+            progress.read(end - start)
+            progress.add(numMember + numNode, "zones")
+            mesh.add_mesh(zone, nodeStart, memStart)
+            memStart += numMember
+            nodeStart += numNode
+    finally:
+        # an error or a cancel leaves the rest undone
+        for future in futures:
+            future.cancel()
+
+
+def fill_su2_result(res_obj, result_set):
+    """fill the result object res_obj with the fields of a SU2 solution
+
+    the velocity, or the momentum, goes to DisplacementVectors and a
+    Temperature field to Temperature. every field but the coordinates
+    is added as a float list property of the group SU2, named after
+    the field
+    """
+    import re
+    import numpy as np
+
+    names = result_set["fields"]
+    values = result_set["values"]
+    res_obj.NodeNumbers = result_set["node_ids"].tolist()
+    for vector in SU2_VECTOR_FIELDS:
+        columns = [names.index(vector + "_" + axis) for axis in SU2_COORDINATES if vector + "_" + axis in names]
+        if columns:
+            vectors = np.zeros((len(values), 3))
+            vectors[:, :len(columns)] = values[:, columns]
+            res_obj.DisplacementVectors = [FreeCAD.Vector(x, y, z) for x, y, z in vectors.tolist()]
+            break
+    else:
+        res_obj.DisplacementVectors = [FreeCAD.Vector()] * len(values)
+    for column, name in enumerate(names):
+        if name in SU2_COORDINATES:
+            continue
+        if name == "Temperature":
+            res_obj.Temperature = values[:, column].tolist()
+        prop = re.sub(r"\W", "_", name)
+        if prop[:1].isdigit():
+            prop = "_" + prop
+        if prop not in res_obj.PropertiesList:
+            res_obj.addProperty("App::PropertyFloatList", prop, "SU2", "SU2 field {}".format(name))
+        setattr(res_obj, prop, values[:, column].tolist())
+    return res_obj
+
+
+def su2_solution_files(SU2_input):
+    """the SU2 solution files next to the mesh file SU2_input
+
+    one file per time step of an unsteady run, sorted by the iteration
+    in their names. the binary .dat is taken if both a .dat and a .csv
+    of the same step are there
+    """
+    import glob
+    import re
+    from . import hfcIO
+
+    directory = os.path.dirname(os.path.abspath(SU2_input))
+    found = set()
+    for pattern in SU2_SOLUTION_FILES:
+        for ext in ("",) + hfcIO.COMPRESSED:
+            found.update(glob.glob(os.path.join(directory, pattern + ext)))
+    stems = {os.path.splitext(hfcIO.plain_name(path))[0] for path in found if hfcIO.plain_name(path).endswith(".dat")}
+    found = [
+        path for path in found
+        if not (hfcIO.plain_name(path).endswith(".csv") and os.path.splitext(hfcIO.plain_name(path))[0] in stems)
+    ]
+
+    def step(path):
+        number = re.search(r"(\d+)\.\w+$", hfcIO.plain_name(path))
+        return (int(number.group(1)) if number else -1, path)
+
+    return sorted(found, key=step)
+
+
+# read a SU2 restart or solution file, binary or ASCII
+# node_offset is added to the point numbers, for the solution of a later zone
+# returns a result set: time, iteration, node_ids, the field names and the
+# (points, fields) array of the values, and the metadata lines of the file
+def read_SU2_solution(
+    SU2_solution,
+    node_offset=0
+):
+    Console.PrintMessage(
+        "Read SU2 solution from SU2 file: {}\n"
+        .format(SU2_solution)
+    )
+    import numpy as np
+    from . import hfcIO
+    from . import hfcProgress
+
+    progress = hfcProgress.current()
+    progress.start(os.path.getsize(SU2_solution), "SU2 solution")
+    head = hfcIO.read_head(SU2_solution, 4)
+    if len(head) == 4 and SU2_BINARY_MAGIC in (
+        int(np.frombuffer(head, "<i4")[0]), int(np.frombuffer(head, ">i4")[0])
+    ):
+        names, values, metadata = su2_solution_binary(SU2_solution)
+    else:
+        names, values, metadata = su2_solution_ascii(SU2_solution)
+    progress.finish()
+    Console.PrintLog(
+        "SU2 solution: {} points, {} fields\n".format(len(values), len(names))
+    )
+    return su2_result_set(SU2_solution, names, values, metadata, node_offset)
+
+
+def su2_solution_binary(SU2_solution):
+    """the field names, values and metadata of a binary SU2 restart file
+
+    5 int32 (magic number, fields, points, 2 unused), the field names of
+    SU2_NAME_LENGTH bytes each and the values as float64 point by point.
+    the external iteration and 8 doubles may follow. the values are read
+    straight into the array, in blocks for the progress
+    """
+    import numpy as np
+    from . import hfcIO
+    from . import hfcProgress
+
+    progress = hfcProgress.current()
+    with hfcIO.open_input(SU2_solution, "rb") as f:
+        head = f.read(20)
+        order = "<" if np.frombuffer(head[:4], "<i4")[0] == SU2_BINARY_MAGIC else ">"
+        magic, nFields, nPoints = np.frombuffer(head, order + "i4")[:3].tolist()
+        names = [
+            f.read(SU2_NAME_LENGTH).split(b"\0", 1)[0].decode().strip()
+            for i in range(nFields)
+        ]
+        values = np.empty((nPoints, nFields), order + "f8")
+        for start in range(0, nPoints, hfcIO.BLOCK_LINES):
+            block = values[start:start + hfcIO.BLOCK_LINES]
+            if f.readinto(memoryview(block).cast("B")) != block.nbytes:
+                raise EOFError("SU2 solution file ends inside the values")
+            progress.add(len(block), "solution")
+        metadata = {}
+        tail = f.read(4 + 8 * 8)
+        if len(tail) == 4 + 8 * 8:
+            metadata["ITER"] = int(np.frombuffer(tail[:4], order + "i4")[0])
+    return names, values.astype(np.float64, copy=False), metadata
+
+
+def su2_solution_ascii(SU2_solution):
+    """the field names, values and metadata of an ASCII SU2 restart file
+
+    a header line of quoted names, rows of values separated by commas
+    or blanks and at the end lines like EXT_ITER= 100. the rows are
+    parsed in pieces of whole lines as they are read
+    """
+    import re
+    import numpy as np
+    from . import hfcIO
+    from . import hfcProgress
+
+    progress = hfcProgress.current()
+    # the first KEY= line ends the rows
+    metadata_line = re.compile(rb"\n[ \t]*[A-Za-z_][\w ]*=")
+    with hfcIO.open_input(SU2_solution, "rb") as f:
+        names = su2_field_names(f.readline().decode())
+        if not names:
+            raise ValueError("SU2 solution file {} has no header".format(SU2_solution))
+        parts = []
+        tail = b""
+        for chunk in hfcIO.read_chunks(f):
+            found = metadata_line.search(b"\n" + chunk)
+            if found:
+                chunk, tail = chunk[:found.start()], chunk[found.start():] + f.read()
+            parts.append(np.fromstring(chunk.replace(b",", b" "), dtype=np.float64, sep=" "))
+            progress.add(len(parts[-1]) // len(names), "solution")
+            if found:
+                break
+    metadata = su2_solution_metadata(tail.decode())
+    values = np.concatenate(parts) if parts else np.empty(0)
+    if values.size % len(names):
+        raise ValueError(
+            "SU2 solution file {}: the rows do not have {} values"
+            .format(SU2_solution, len(names))
+        )
+    return names, values.reshape(-1, len(names)), metadata
+
 
+def su2_field_names(header):
+    "the field names of the header line of an ASCII SU2 restart file"
+    if "," in header:
+        names = header.split(",")
+    elif "\t" in header:
+        names = header.split("\t")
+    else:
+        names = header.split()
+    return [name.strip().strip('"').strip() for name in names if name.strip()]
+
+
+def su2_solution_metadata(text):
+    "the dict of the KEY= value lines at the end of an ASCII SU2 restart file"
+    metadata = {}
+    for line in text.splitlines():
+        key, sep, value = line.partition("=")
+        if sep and value.split():
+            value = value.split()[0]
+            try:
+                value = float(value)
+            except ValueError:
+                pass
+            metadata[key.strip()] = value
+    return metadata
+
+
+def su2_result_set(SU2_solution, names, values, metadata, node_offset=0):
+    """the result set of the fields names and (points, fields) values
+
+    the rows are mapped to the mesh nodes by their PointID column, files
+    without one hold the points in mesh order. the time of the set is
+    the iteration of the metadata or of the file name
+    """
+    import re
+    import numpy as np
+    from . import hfcMesh
+    from . import hfcIO
+
+    if names and names[0] == "PointID":
+        node_ids = values[:, 0].astype(hfcMesh.ID_TYPE) + (node_offset + 1)
+        names = names[1:]
+        values = values[:, 1:]
+    else:
+        node_ids = np.arange(node_offset + 1, node_offset + len(values) + 1, dtype=hfcMesh.ID_TYPE)
+    iteration = None
+    for key in ("TIME_ITER", "EXT_ITER", "ITER", "INNER_ITER"):
+        if isinstance(metadata.get(key), (int, float)):
+            iteration = int(metadata[key])
+            break
+    if iteration is None:
+        number = re.search(r"(\d+)\.\w+$", os.path.basename(hfcIO.plain_name(SU2_solution)))
+        iteration = int(number.group(1)) if number else 0
     return {
-        "Nodes": nodes,
-        "Seg2Elem": elements_seg2,
-        "Seg3Elem": elements_seg3,
-        "Tria3Elem": elements_tria3,
-        "Tria6Elem": elements_tria6,
-        "Quad4Elem": elements_quad4,
-        "Quad8Elem": elements_quad8,
-        "Tetra4Elem": elements_tetra4,
-        "Tetra10Elem": elements_tetra10,
-        "Hexa8Elem": elements_hexa8,
-        "Hexa20Elem": elements_hexa20,
-        "Penta6Elem": elements_penta6,
-        "Penta15Elem": elements_penta15,
-        "Results": results
+        "time": float(iteration),
+        "iteration": iteration,
+        "node_ids": node_ids,
+        "fields": names,
+        "values": values,
+        "metadata": metadata,
     }
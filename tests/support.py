@@ -0,0 +1,60 @@
+#
+
+# the modules of the directory above are the feminout package of FreeCAD,
+# their relative imports need a package around them. it is made here under
+# the name hfc, without a copy of the files and without FreeCAD
+# the readers and the node merge need FreeCAD, their tests are skipped
+# without it, run them with the FreeCAD lib directory in PYTHONPATH
+
+import importlib
+import os
+import sys
+import types
+import unittest
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+
+try:
+    import FreeCAD  # noqa: F401
+except ImportError:
+    FreeCAD = None
+
+needs_freecad = unittest.skipIf(FreeCAD is None, "needs FreeCAD in PYTHONPATH")
+
+
+def load(name):
+    "the module name of the package, like load('hfcMesh')"
+    if "hfc" not in sys.modules:
+        package = types.ModuleType("hfc")
+        package.__path__ = [ROOT]
+        sys.modules["hfc"] = package
+    return importlib.import_module("hfc." + name)
+
+
+def thread_pool(processes=None):
+    """a thread pool in place of hfcIO.process_pool
+
+    the chunk, zone and partition code paths run as with processes, the
+    pool processes could not import the package made by load()
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    return ThreadPoolExecutor(max_workers=2)
+
+
+class MeshTestCase(unittest.TestCase):
+
+    def assertSameMesh(self, a, b):
+        "the nodes, the elements and the boundary groups of the MeshData a and b are equal"
+        np.testing.assert_array_equal(a.node_ids, b.node_ids)
+        np.testing.assert_array_equal(a.coords, b.coords)
+        self.assertEqual(sorted(a.elements), sorted(b.elements))
+        for name, (ids, conn) in a.elements.items():
+            np.testing.assert_array_equal(ids, b.elements[name][0], err_msg=name)
+            np.testing.assert_array_equal(conn, b.elements[name][1], err_msg=name)
+        self.assertEqual(sorted(a.groups), sorted(b.groups))
+        for tag, group in a.groups.items():
+            self.assertEqual(sorted(group.elements), sorted(b.groups[tag].elements))
+            for name, conn in group.elements.items():
+                np.testing.assert_array_equal(conn, b.groups[tag].elements[name], err_msg=tag)
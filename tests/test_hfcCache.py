@@ -0,0 +1,121 @@
+#
+
+# python -m pytest tests
+# the parsed mesh cache, it needs numpy only but for vectors
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+import numpy as np
+
+import support
+
+hfcMesh = support.load("hfcMesh")
+hfcCache = support.load("hfcCache")
+
+
+def mesh():
+    m = hfcMesh.MeshData(np.array([1, 2, 3, 4]), np.arange(12.0).reshape(4, 3))
+    m.add_elements("Tria3Elem", np.array([1, 2]), np.array([[1, 2, 3], [1, 3, 4]]))
+    m.add_elements("Seg2Elem", np.array([3]), np.array([[2, 4]]))
+    m.groups["wall"] = hfcMesh.BoundaryGroup("wall", {"Seg2Elem": np.array([[1, 2], [2, 3]])})
+    m.file_ids = np.array([3, 5, 8, 9])
+    m.result_index = [{"type": "Elastic", "number": 1, "offset": 1234}]
+    m.merge_stats = {"nodes": 5, "merged": 1, "clusters": 1, "collapsed_elements": 0, "tolerance": 1e-6, "seconds": 0.5}
+    m.results = [
+        {"node_ids": np.array([1, 2, 3, 4]), "values": np.ones((4, 2)), "fields": ["a", "b"], "time": 1.0},
+        # values which look like the markers of the stored layout
+        {"temperature": {1: 20.0, 3: 21.5}, "type": "array", "kind": "dict", "number": 2},
+    ]
+    return m
+
+
+class TestCache(support.MeshTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache_dir = hfcCache.CACHE_DIR
+        hfcCache.CACHE_DIR = os.path.join(self.directory, "cache")
+        self.input = os.path.join(self.directory, "mesh.su2")
+        with open(self.input, "w") as f:
+            f.write("NDIME= 2\n")
+
+    def tearDown(self):
+        hfcCache.CACHE_DIR = self.cache_dir
+        shutil.rmtree(self.directory)
+
+    def assertSameResults(self, a, b):
+        self.assertEqual(len(a), len(b))
+        for x, y in zip(a, b):
+            self.assertEqual(sorted(x), sorted(y))
+            for key, value in x.items():
+                if isinstance(value, np.ndarray):
+                    np.testing.assert_array_equal(value, y[key])
+                else:
+                    self.assertEqual(value, y[key])
+
+    def test_round_trip(self):
+        m = mesh()
+        hfcCache.store([self.input], "SU2", m, (1e-6, True))
+        c = hfcCache.load([self.input], "SU2", (1e-6, True))
+        self.assertSameMesh(c, m)
+        np.testing.assert_array_equal(c.file_ids, m.file_ids)
+        self.assertEqual(c.result_index, m.result_index)
+        self.assertEqual(c.merge_stats, m.merge_stats)
+        self.assertSameResults(c.results, m.results)
+
+    def test_key(self):
+        hfcCache.store([self.input], "SU2", mesh())
+        self.assertIsNotNone(hfcCache.load([self.input], "SU2"))
+        self.assertIsNone(hfcCache.load([self.input], "Elmer"))
+        self.assertIsNone(hfcCache.load([self.input], "SU2", (1e-6,)))
+        with open(self.input, "a") as f:
+            f.write("NELEM= 0\n")
+        self.assertIsNone(hfcCache.load([self.input], "SU2"))
+
+    def test_concurrent_store(self):
+        threads = [threading.Thread(target=hfcCache.store, args=([self.input], "SU2", mesh())) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([name[-4:] for name in os.listdir(hfcCache.cache_dir())], [".npz"])
+        self.assertSameMesh(hfcCache.load([self.input], "SU2"), mesh())
+
+    def test_failed_store(self):
+        m = mesh()
+        m.results[1]["type"] = object()
+        with self.assertRaises(TypeError):
+            hfcCache.store([self.input], "SU2", m)
+        self.assertEqual(os.listdir(hfcCache.cache_dir()), [])
+
+    def test_broken_entry(self):
+        hfcCache.store([self.input], "SU2", mesh())
+        path = hfcCache.cache_file(hfcCache.cache_key([self.input], "SU2"))
+        with open(path, "r+b") as f:
+            f.truncate(100)
+        self.assertIsNone(hfcCache.load([self.input], "SU2"))
+
+    def test_evict(self):
+        for i in range(3):
+            hfcCache.store([self.input], "SU2", mesh(), (i,))
+        self.assertEqual(len(os.listdir(hfcCache.cache_dir())), 3)
+        hfcCache.evict(1)
+        self.assertEqual(os.listdir(hfcCache.cache_dir()), [])
+
+    @support.needs_freecad
+    def test_vectors(self):
+        import FreeCAD
+        m = mesh()
+        m.results = [{"disp": {1: FreeCAD.Vector(1, 2, 3), 4: FreeCAD.Vector(4, 5, 6)}, "loadcase": 1}]
+        hfcCache.store([self.input], "SU2", m)
+        disp = hfcCache.load([self.input], "SU2").results[0]["disp"]
+        self.assertEqual(list(disp), [1, 4])
+        self.assertEqual([tuple(v) for v in disp.values()], [(1, 2, 3), (4, 5, 6)])
+
+
+if __name__ == "__main__":
+    unittest.main()
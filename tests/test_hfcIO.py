@@ -0,0 +1,45 @@
+#
+
+# python -m pytest tests
+# hfcIO needs numpy only, it is loaded from the directory above
+
+import io
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+import hfcIO  # noqa: E402
+
+
+NODES = [[1, 0, 0, 0, 0], [2, 1, 0, 0, 0], [3, 2, 0, 0, 0]]
+
+
+class TestTokenStreamTable(unittest.TestCase):
+
+    def table(self, text, ncols=5):
+        tokens = hfcIO.TokenStream(io.StringIO(text))
+        return tokens.table(tokens.count(), ncols).tolist(), tokens
+
+    def test_blank_lines_between_rows(self):
+        rows, tokens = self.table("3\n1 0 0 0 0\n\n2 1 0 0 0\n\n3 2 0 0 0\n")
+        self.assertEqual(rows, NODES)
+        self.assertTrue(tokens.at_end())
+
+    def test_blank_line_between_comment_lines(self):
+        rows, tokens = self.table("3\n1 0 0 0 0\n# a\n\n# b\n2 1 0 0 0\n\n\n3 2 0 0 0 # c\n\n7\n")
+        self.assertEqual(rows, NODES)
+        self.assertEqual(tokens.token(), "7")
+
+    def test_blank_lines_inside_a_row(self):
+        rows, tokens = self.table("3\n1 0\n\n0 0 0\n2 1 0 0 0 3\n\n\n2 0 0 0\n")
+        self.assertEqual(rows, NODES)
+
+    def test_blank_text(self):
+        self.assertEqual(hfcIO.parse_floats(" \n\n").size, 0)
+        self.assertEqual(hfcIO.parse_float_rows("\n", 3).shape, (0, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
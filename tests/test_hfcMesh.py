@@ -0,0 +1,133 @@
+#
+
+# python -m pytest tests
+# the node merge and the compaction of hfcMesh
+
+import unittest
+
+import numpy as np
+
+import support
+
+hfcMesh = support.load("hfcMesh")
+
+
+def two_zones():
+    """two quads of two zones side by side, the nodes of their common edge are in both
+
+    zone 1 has the nodes 1 to 4, zone 2 the nodes 11 to 14, 12 and 13 lie
+    on 2 and 3. the edge 12 13 is the boundary group "interface"
+    """
+    node_ids = np.array([1, 2, 3, 4, 11, 12, 13, 14])
+    coords = np.array([
+        [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
+        [2, 0, 0], [1, 0, 1e-9], [1, 1, 0], [2, 1, 0],
+    ], float)
+    m = hfcMesh.MeshData(node_ids, coords)
+    m.add_elements("Quad4Elem", np.array([1, 2]), np.array([[1, 2, 3, 4], [12, 11, 14, 13]]))
+    m.groups["interface"] = hfcMesh.BoundaryGroup("interface", {"Seg2Elem": np.array([[12, 13]])})
+    m.results = [{
+        "node_ids": node_ids.copy(),
+        "values": np.arange(8.0).reshape(8, 1),
+        "time": 0.0,
+    }]
+    return m
+
+
+@support.needs_freecad
+class TestMergeCoincident(support.MeshTestCase):
+
+    def test_merge(self):
+        m, stats = hfcMesh.merge_coincident(two_zones(), 1e-6)
+        np.testing.assert_array_equal(m.node_ids, [1, 2, 3, 4, 11, 14])
+        np.testing.assert_array_equal(m.elements["Quad4Elem"][1], [[1, 2, 3, 4], [2, 11, 14, 3]])
+        np.testing.assert_array_equal(m.groups["interface"].elements["Seg2Elem"], [[2, 3]])
+        np.testing.assert_array_equal(m.results[0]["node_ids"], [1, 2, 3, 4, 11, 14])
+        np.testing.assert_array_equal(m.results[0]["values"][:, 0], [0, 1, 2, 3, 4, 7])
+        self.assertEqual(
+            {key: stats[key] for key in ("nodes", "merged", "clusters", "collapsed_elements")},
+            {"nodes": 8, "merged": 2, "clusters": 2, "collapsed_elements": 0},
+        )
+        self.assertIs(m.merge_stats, stats)
+
+    def test_tolerance(self):
+        # 12 is 1e-9 off its twin
+        m, stats = hfcMesh.merge_coincident(two_zones(), 1e-12)
+        self.assertEqual(stats["merged"], 1)
+        self.assertEqual(m.node_count, 7)
+
+    def test_nothing_to_merge(self):
+        before = two_zones()
+        before.coords[4:] += 10.0
+        m, stats = hfcMesh.merge_coincident(before, 1e-6)
+        self.assertSameMesh(m, before)
+        self.assertEqual(stats["merged"], 0)
+        self.assertIs(m.merge_stats, stats)
+
+    def test_collapsed_element(self):
+        m = two_zones()
+        m.add_elements("Tria3Elem", np.array([3]), np.array([[2, 12, 4]]))
+        m, stats = hfcMesh.merge_coincident(m, 1e-6)
+        np.testing.assert_array_equal(m.elements["Tria3Elem"][1], [[2, 2, 4]])
+        self.assertEqual(stats["collapsed_elements"], 1)
+
+    def test_dangling_node_number(self):
+        m = two_zones()
+        m.add_elements("Tria3Elem", np.array([3]), np.array([[12, 13, 99]]))
+        m, stats = hfcMesh.merge_coincident(m, 1e-6)
+        np.testing.assert_array_equal(m.elements["Tria3Elem"][1], [[2, 3, 99]])
+
+    def test_sparse_node_numbers(self):
+        # past the dense table, the binary search does the renumbering
+        m = two_zones()
+        m.node_ids[4:] *= 100000
+        m.elements["Quad4Elem"][1][1] *= 100000
+        m.results = []
+        m.groups = {}
+        m, stats = hfcMesh.merge_coincident(m, 1e-6)
+        np.testing.assert_array_equal(m.elements["Quad4Elem"][1], [[1, 2, 3, 4], [2, 1100000, 1400000, 3]])
+
+
+class TestCompact(support.MeshTestCase):
+
+    def mesh(self):
+        m = hfcMesh.MeshData(np.array([30, 10, 20, 40, 50]), np.arange(15.0).reshape(5, 3))
+        m.add_elements("Tria3Elem", np.array([7]), np.array([[50, 10, 30]]))
+        m.groups["wall"] = hfcMesh.BoundaryGroup("wall", {"Seg2Elem": np.array([[10, 50]])})
+        m.results = [
+            {"disp": {10: 1.0, 20: 2.0, 30: 3.0, 50: 5.0}, "number": 1},
+            {"node_ids": np.array([10, 20, 30, 40, 50]), "values": np.arange(5.0).reshape(5, 1)},
+        ]
+        return m
+
+    def test_compact(self):
+        c = hfcMesh.compact(self.mesh())
+        np.testing.assert_array_equal(c.node_ids, [1, 2, 3])
+        # sorted by their number in the file
+        np.testing.assert_array_equal(c.coords, [[3, 4, 5], [0, 1, 2], [12, 13, 14]])
+        np.testing.assert_array_equal(c.file_ids, [10, 30, 50])
+        np.testing.assert_array_equal(c.elements["Tria3Elem"][0], [7])
+        np.testing.assert_array_equal(c.elements["Tria3Elem"][1], [[3, 1, 2]])
+        np.testing.assert_array_equal(c.groups["wall"].elements["Seg2Elem"], [[1, 3]])
+        self.assertEqual(c.results[0], {"disp": {1: 1.0, 2: 3.0, 3: 5.0}, "number": 1})
+        np.testing.assert_array_equal(c.results[1]["node_ids"], [1, 2, 3])
+        np.testing.assert_array_equal(c.results[1]["values"][:, 0], [0, 2, 4])
+
+    def test_compact_twice(self):
+        c = hfcMesh.compact(self.mesh())
+        self.assertIs(hfcMesh.compact(c), c)
+
+    def test_no_elements(self):
+        m = hfcMesh.MeshData(np.array([5, 3]), np.zeros((2, 3)))
+        self.assertIs(hfcMesh.compact(m), m)
+
+    def test_compact_result_set(self):
+        result_set = {"disp": {10: "a", 40: "b", 50: "c"}, "time": 2.0}
+        self.assertEqual(
+            hfcMesh.compact_result_set(result_set, np.array([10, 30, 50])),
+            {"disp": {1: "a", 3: "c"}, "time": 2.0},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,248 @@
+#
+
+# python -m pytest tests
+# the readers on the files of the hfcBenchmark generators: every code
+# path of a reader has to give the mesh of the plain serial read
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import support
+
+hfcBenchmark = support.load("hfcBenchmark")
+
+
+def chunked(read, *args, **kwargs):
+    """read(*args, **kwargs) with the pool code paths on small files
+
+    every block is cut into chunks of a few rows and the pool is a
+    support.thread_pool
+    """
+    hfcIO = support.load("hfcIO")
+    with mock.patch.multiple(
+        hfcIO, PARALLEL_BYTES=0, BLOCK_LINES=50, CHUNK_BYTES=2048, process_pool=support.thread_pool
+    ):
+        return read(*args, processes=2, **kwargs)
+
+
+def insert_lines(path, keyword, lines, after=(3, 7)):
+    "a copy of the SU2 file path with lines put into the rows after every keyword line"
+    with open(path) as f:
+        text = f.read().splitlines(True)
+    dirty = []
+    row = None
+    for line in text:
+        dirty.append(line)
+        if line.startswith(keyword):
+            row = 0
+        elif row is not None:
+            row += 1
+            if row in after:
+                dirty.extend(lines)
+    path = path[:-len(".su2")] + "_dirty.su2"
+    with open(path, "w") as f:
+        f.writelines(dirty)
+    return path
+
+
+def split_elmer(directory, parts):
+    """write directory/partitioning.parts of the Elmer mesh in directory
+
+    the elements are split into parts runs, every part gets the nodes its
+    elements use, so the nodes between two parts are in both.
+    returns the path of part.1.header
+    """
+    with open(os.path.join(directory, "mesh.nodes")) as f:
+        nodes = {int(line.split()[0]): line for line in f}
+    with open(os.path.join(directory, "mesh.elements")) as f:
+        elements = f.readlines()
+    target = os.path.join(directory, "partitioning.{}".format(parts))
+    os.makedirs(target)
+    size = -(-len(elements) // parts)
+    for part in range(parts):
+        rows = elements[part * size:(part + 1) * size]
+        used = sorted({int(node) for row in rows for node in row.split()[3:]})
+        prefix = os.path.join(target, "part.{}.".format(part + 1))
+        with open(prefix + "header", "w") as f:
+            f.write("{} {} 0\n".format(len(used), len(rows)))
+        with open(prefix + "nodes", "w") as f:
+            f.writelines(nodes[node] for node in used)
+        with open(prefix + "elements", "w") as f:
+            f.writelines(rows)
+    return os.path.join(target, "part.1.header")
+
+
+@support.needs_freecad
+class TestSU2Mesh(support.MeshTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.importSU2Mesh = support.load("importSU2Mesh")
+        cls.directory = tempfile.mkdtemp()
+        cls.single = hfcBenchmark.write_su2(os.path.join(cls.directory, "single.su2"), 2000)
+        cls.plane = hfcBenchmark.write_su2(os.path.join(cls.directory, "plane.su2"), 2000, dim=2)
+        cls.zones = hfcBenchmark.write_su2(os.path.join(cls.directory, "zones.su2"), 700, zones=3)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+
+    def read(self, path, **kwargs):
+        return self.importSU2Mesh.read_SU2_mesh(path, cache=False, **kwargs)
+
+    def test_mmap(self):
+        for path in (self.single, self.plane, self.zones):
+            self.assertSameMesh(self.read(path), self.read(path, use_mmap=True))
+
+    def test_chunked(self):
+        for path in (self.single, self.plane, self.zones):
+            self.assertSameMesh(self.read(path), chunked(self.read, path))
+
+    def test_zones(self):
+        m = self.read(self.zones)
+        # three grids of 700 nodes or a bit more, numbered on through the zones
+        self.assertEqual(m.node_count % 3, 0)
+        np.testing.assert_array_equal(m.node_ids, np.arange(1, m.node_count + 1))
+        self.assertEqual(sorted(m.groups), ["wall"])
+
+    def test_blank_and_comment_lines(self):
+        m = self.read(self.single)
+        for lines in (["\n"], ["% a comment\n"], ["\n", "   \n", "% a comment\n"]):
+            path = insert_lines(insert_lines(self.single, "NPOIN", lines), "NELEM", lines)
+            self.assertSameMesh(m, self.read(path))
+            self.assertSameMesh(m, self.read(path, use_mmap=True))
+            self.assertSameMesh(m, chunked(self.read, path))
+
+    def test_keyword_without_value(self):
+        path = os.path.join(self.directory, "novalue.su2")
+        with open(path, "w") as f:
+            f.write("NDIME= 2\nNELEM=\n")
+        with self.assertRaises(ValueError):
+            self.read(path)
+
+
+@support.needs_freecad
+class TestSU2Solution(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.importSU2Mesh = support.load("importSU2Mesh")
+        cls.directory = tempfile.mkdtemp()
+        cls.path = hfcBenchmark.write_su2(os.path.join(cls.directory, "mesh.su2"), 500)
+        m = cls.importSU2Mesh.read_SU2_mesh(cls.path, cache=False)
+        cls.values = np.random.RandomState(0).uniform(size=(m.node_count, 2))
+        cls.write(5, cls.values)
+        # a solution of another mesh
+        cls.write(10, cls.values[:-7])
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+
+    @classmethod
+    def write(cls, step, values):
+        path = os.path.join(cls.directory, "restart_flow_{:05d}.csv".format(step))
+        with open(path, "w") as f:
+            f.write('"PointID","Pressure","Temperature"\n')
+            for point, row in enumerate(values.tolist()):
+                f.write("{},{!r},{!r}\n".format(point, *row))
+
+    def test_point_count(self):
+        files = self.importSU2Mesh.su2_solution_files(self.path)
+        self.assertEqual([os.path.basename(path) for path in files], ["restart_flow_00005.csv", "restart_flow_00010.csv"])
+        m = self.importSU2Mesh.read_SU2_mesh(self.path, cache=False, solutions=files)
+        self.assertEqual(len(m.results), 1)
+        result_set = m.results[0]
+        self.assertEqual(result_set["iteration"], 5)
+        self.assertEqual(result_set["fields"], ["Pressure", "Temperature"])
+        np.testing.assert_array_equal(result_set["node_ids"], m.node_ids)
+        np.testing.assert_array_equal(result_set["values"], self.values)
+
+
+@support.needs_freecad
+class TestElmerMesh(support.MeshTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.importElmerMesh = support.load("importElmerMesh")
+        cls.directory = tempfile.mkdtemp()
+        cls.header = hfcBenchmark.write_elmer(os.path.join(cls.directory, "mesh"), 2000)
+        cls.partitions = split_elmer(os.path.dirname(cls.header), 3)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+
+    def read(self, path, **kwargs):
+        return self.importElmerMesh.read_Elmer_mesh(path, 0, cache=False, **kwargs)
+
+    def test_mmap(self):
+        self.assertSameMesh(self.read(self.header), self.read(self.header, use_mmap=True))
+
+    def test_chunked(self):
+        self.assertSameMesh(self.read(self.header), chunked(self.read, self.header))
+
+    def test_partitions(self):
+        m = self.read(self.header)
+        self.assertSameMesh(m, self.read(self.partitions))
+        self.assertSameMesh(m, self.read(self.partitions, use_mmap=True))
+        self.assertSameMesh(m, chunked(self.read, self.partitions))
+
+
+@support.needs_freecad
+class TestFrame3DDResult(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.importFrame3DDResults = support.load("importFrame3DDResults")
+        cls.directory = tempfile.mkdtemp()
+        cls.path = hfcBenchmark.write_frame3dd_out(os.path.join(cls.directory, "frame.out"), 300, loadcases=3, modes=2)
+        cls.m = cls.importFrame3DDResults.read_Frame3DD_result(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.directory)
+
+    def assertSameResultSet(self, a, b):
+        self.assertEqual(sorted(a), sorted(b))
+        for key, value in a.items():
+            if key == "disp":
+                self.assertEqual(list(value), list(b[key]))
+                self.assertEqual([tuple(v) for v in value.values()], [tuple(v) for v in b[key].values()])
+            else:
+                self.assertEqual(value, b[key])
+
+    def test_all(self):
+        self.assertEqual(
+            [(entry["type"], entry["number"]) for entry in self.m.result_index],
+            [("Elastic", 1), ("Elastic", 2), ("Elastic", 3), ("Modal", 1), ("Modal", 2)],
+        )
+        self.assertEqual(len(self.m.results), 5)
+        self.assertEqual([result_set.get("loadcase") for result_set in self.m.results], [1, 2, 3, None, None])
+        self.assertEqual([result_set.get("frequency") for result_set in self.m.results[3:]], [10.0, 20.0])
+
+    def test_index_and_lazy_load(self):
+        index = self.importFrame3DDResults.index_Frame3DD_result(self.path)
+        self.assertEqual(index.results, [])
+        self.assertEqual(index.result_index, self.m.result_index)
+        for entry, result_set in zip(index.result_index[::-1], self.m.results[::-1]):
+            self.assertSameResultSet(
+                self.importFrame3DDResults.load_Frame3DD_result_set(self.path, index, entry), result_set
+            )
+        self.assertEqual(len(index.results), 5)
+
+    def test_selection(self):
+        m = self.importFrame3DDResults.read_Frame3DD_result(self.path, loadcases=(2,), modes=(2,))
+        self.assertEqual(m.result_index, self.m.result_index)
+        self.assertEqual(len(m.results), 2)
+        self.assertSameResultSet(m.results[0], self.m.results[1])
+        self.assertSameResultSet(m.results[1], self.m.results[4])
+
+
+if __name__ == "__main__":
+    unittest.main()